@@ -30,7 +30,12 @@ LEVEL_THRESHOLD = "threshold"
 LEVEL_PRICE = "price"
 ROUNDING_PRECISION = "precision"
 PEAK_HOUR = "peak_hour"
+PEAK_COUNT = "peak_count"
+PEAK_GRANULARITY = "peak_granularity"
+PEAK_GRANULARITY_DAY = "day"
+PEAK_GRANULARITY_HOUR = "hour"
 TARGET_ENERGY = "target_energy"
+UPDATE_INTERVAL = "update_interval"
 
 RESET_TOP_THREE = "energytariff_reset_top_three_hours"
 
@@ -1,12 +1,23 @@
 import datetime
-from rx.subject.behaviorsubject import BehaviorSubject
+import heapq
+from collections.abc import Callable
+from logging import getLogger
+from typing import Any
 from homeassistant.core import (
     HomeAssistant,
+    callback,
 )
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt
+
+from .const import RESET_TOP_THREE
+from .utils import start_of_next_month
+
+_LOGGER = getLogger(__name__)
 
 
 class EnergyData:
-    """Class used to transmit sensor nofication via rx"""
+    """Class used to transmit sensor nofication via the coordinator"""
 
     def __init__(self, energy: float, effect: float, timestamp: datetime):
         self.energy_consumed = energy
@@ -17,11 +28,103 @@ class EnergyData:
 class TopHour:
     """Holds data for an hour of consumption"""
 
+    __slots__ = ("day", "hour", "energy")
+
     def __init__(self, day: int, hour: int, energy: float):
         self.day = day
         self.hour = hour
         self.energy = energy
 
+    def __lt__(self, other: "TopHour") -> bool:
+        return self.energy < other.energy
+
+    def as_dict(self) -> dict[str, Any]:
+        """Returns the hour in the format stored in sensor attributes"""
+        return {"day": self.day, "hour": self.hour, "energy": self.energy}
+
+
+class PeakTracker:
+    """Keeps the N highest consumption peaks of the month.
+
+    With day granularity a peak is the max hour of a day, so at most one hour
+    per day is counted. With hour granularity every hour competes on its own.
+    Peaks are held in a min-heap of fixed size, so the lowest one is always
+    the one to beat.
+    """
+
+    def __init__(self, size: int = 3, per_hour: bool = False):
+        self.size = size
+        self.per_hour = per_hour
+        self._heap: list[TopHour] = []
+        self._peaks: dict[Any, TopHour] = {}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def add(self, day: int, hour: int, energy: float) -> bool:
+        """Adds a reading, returns True if the top peaks changed"""
+
+        # Solar or wind production can cause the energy meter to have negative values
+        # Set this to 0, as tariffs are only for consumption and we don't have negative
+        # tariff values in the tariff config section.
+        if energy < 0:
+            energy = 0
+
+        key = (day, hour) if self.per_hour else day
+        peak = self._peaks.get(key)
+        if peak is not None:
+            if peak.energy >= energy:
+                return False
+            peak.energy = energy
+            peak.hour = hour
+            # Energy only grows, so the peak can only move down the heap
+            heapq.heapify(self._heap)
+            return True
+
+        if len(self._heap) < self.size:
+            peak = TopHour(day, hour, energy)
+            heapq.heappush(self._heap, peak)
+            self._peaks[key] = peak
+            return True
+
+        if self._heap[0].energy >= energy:
+            return False
+
+        peak = TopHour(day, hour, energy)
+        lowest = heapq.heapreplace(self._heap, peak)
+        del self._peaks[(lowest.day, lowest.hour) if self.per_hour else lowest.day]
+        self._peaks[key] = peak
+        return True
+
+    def update(self, state: EnergyData) -> bool:
+        """Adds the hour of an energy notification, returns True if the top peaks changed"""
+
+        if state is None or state.energy_consumed is None:
+            return False
+
+        localtime = dt.as_local(state.timestamp)
+        return self.add(localtime.day, localtime.hour, state.energy_consumed)
+
+    def restore(self, top_hours: list[dict[str, Any]]) -> None:
+        """Restores peaks saved in sensor attributes"""
+        for item in top_hours:
+            self.add(int(item["day"]), int(item["hour"]), float(item["energy"]))
+
+    def clear(self) -> None:
+        """Forgets all peaks"""
+        self._heap.clear()
+        self._peaks.clear()
+
+    def average(self) -> float | None:
+        """Average energy of the top peaks"""
+        if not self._heap:
+            return None
+        return sum(peak.energy for peak in self._heap) / len(self._heap)
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Returns the top peaks, highest first, in the format stored in sensor attributes"""
+        return [peak.as_dict() for peak in sorted(self._heap, reverse=True)]
+
 
 class GridThresholdData:
     """Class used to transmit changes of level threshold changes"""
@@ -33,10 +136,122 @@ class GridThresholdData:
         self.top_three = top_three
 
 
+class _Subscription:
+    """A listener of a Signal and its publish rate"""
+
+    __slots__ = ("listener", "min_interval", "last_call", "timer")
+
+    def __init__(self, listener: Callable[[Any], None], min_interval: float):
+        self.listener = listener
+        self.min_interval = min_interval
+        self.last_call = None
+        self.timer = None
+
+
+class Signal:
+    """Holds the latest value published and notifies subscribers of it.
+
+    Listeners are called from the event loop. Values published in the same
+    loop iteration are coalesced, so listeners only see the last one.
+    A subscriber can also ask for a minimum interval between calls; values
+    published in between are dropped, except the latest one, which is
+    delivered when the interval has passed.
+    """
+
+    def __init__(self, hass: HomeAssistant, value: Any = None):
+        self._hass = hass
+        self.value = value
+        self._subscriptions: list[_Subscription] = []
+        self._scheduled = False
+
+    def subscribe(
+        self, listener: Callable[[Any], None], min_interval: float = 0
+    ) -> Callable[[], None]:
+        """Subscribes to the signal, listener is called with the current value
+        right away. Returns a function that removes the subscription."""
+
+        subscription = _Subscription(listener, min_interval)
+        self._subscriptions.append(subscription)
+        listener(self.value)
+
+        def unsubscribe() -> None:
+            if subscription.timer is not None:
+                subscription.timer.cancel()
+                subscription.timer = None
+            self._subscriptions.remove(subscription)
+
+        return unsubscribe
+
+    def publish(self, value: Any) -> None:
+        """Publishes a value, subscribers are notified on the next loop iteration"""
+        self.value = value
+        if not self._scheduled:
+            self._scheduled = True
+            self._hass.loop.call_soon(self._dispatch)
+
+    def _dispatch(self) -> None:
+        self._scheduled = False
+        now = self._hass.loop.time()
+        for subscription in self._subscriptions.copy():
+            if subscription.timer is not None:
+                # A delayed call is pending and will pick up the latest value
+                continue
+            if (
+                subscription.last_call is not None
+                and now - subscription.last_call < subscription.min_interval
+            ):
+                subscription.timer = self._hass.loop.call_at(
+                    subscription.last_call + subscription.min_interval,
+                    self._deliver,
+                    subscription,
+                )
+                continue
+            subscription.last_call = now
+            subscription.listener(self.value)
+
+    def _deliver(self, subscription: _Subscription) -> None:
+        subscription.timer = None
+        subscription.last_call = self._hass.loop.time()
+        subscription.listener(self.value)
+
+
 class GridCapacityCoordinator:
     """Coordinator entity that signals notifications for sensors"""
 
-    def __init__(self, hass: HomeAssistant):
+    def __init__(self, hass: HomeAssistant, peak_count: int = 3, peak_per_hour: bool = False):
         self._hass = hass
-        self.effectstate = BehaviorSubject(None)
-        self.thresholddata = BehaviorSubject(None)
+        self.peaks = PeakTracker(peak_count, peak_per_hour)
+        self.effectstate = Signal(hass)
+        self.thresholddata = Signal(hass)
+        # Publishes the peak tracker, only when the top peaks changed
+        self.peakdata = Signal(hass)
+
+        hass.bus.async_listen(RESET_TOP_THREE, self.handle_reset_event)
+
+        async_track_point_in_time(
+            hass, self._async_reset_peaks, start_of_next_month(dt.as_local(dt.now()))
+        )
+
+    def publish_energy(self, state: EnergyData) -> None:
+        """Publishes a meter reading. Peaks are tracked on every reading,
+        before readings are coalesced for the sensors."""
+        if self.peaks.update(state):
+            self.peakdata.publish(self.peaks)
+        self.effectstate.publish(state)
+
+    @callback
+    def _async_reset_peaks(self, _):
+        """Resets the peaks so that we don't carry over old values to new month"""
+        self.peaks.clear()
+        self.peakdata.publish(self.peaks)
+        _LOGGER.debug("Monthly reset")
+        async_track_point_in_time(
+            self._hass,
+            self._async_reset_peaks,
+            start_of_next_month(dt.as_local(dt.now())),
+        )
+
+    @callback
+    def handle_reset_event(self, event):
+        """Handle reset event to reset top three attributes"""
+        self._async_reset_peaks(event)
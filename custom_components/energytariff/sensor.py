@@ -38,18 +38,25 @@ from .const import (
     MAX_EFFECT_ALLOWED,
     ROUNDING_PRECISION,
     TARGET_ENERGY,
-    RESET_TOP_THREE,
+    PEAK_COUNT,
+    PEAK_GRANULARITY,
+    PEAK_GRANULARITY_DAY,
+    PEAK_GRANULARITY_HOUR,
+    UPDATE_INTERVAL,
 )
 
-from .coordinator import GridCapacityCoordinator, EnergyData, GridThresholdData
+from .coordinator import (
+    GridCapacityCoordinator,
+    EnergyData,
+    GridThresholdData,
+    PeakTracker,
+)
 
 from .utils import (
     start_of_next_hour,
-    start_of_next_month,
     seconds_between,
     convert_to_watt,
     get_rounding_precision,
-    calculate_top_three,
 )
 
 _LOGGER = getLogger(__name__)
@@ -69,6 +76,11 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
         vol.Optional(MAX_EFFECT_ALLOWED): cv.positive_float,
         vol.Optional(ROUNDING_PRECISION): cv.positive_int,
         vol.Optional(GRID_LEVELS): vol.All(cv.ensure_list, [LEVEL_SCHEMA]),
+        vol.Optional(PEAK_COUNT, default=3): cv.positive_int,
+        vol.Optional(PEAK_GRANULARITY, default=PEAK_GRANULARITY_DAY): vol.In(
+            [PEAK_GRANULARITY_DAY, PEAK_GRANULARITY_HOUR]
+        ),
+        vol.Optional(UPDATE_INTERVAL, default=0): cv.positive_float,
     }
 )
 
@@ -76,7 +88,11 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
 async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
     """Setup sensor platform."""
 
-    rx_coord = GridCapacityCoordinator(hass)
+    rx_coord = GridCapacityCoordinator(
+        hass,
+        config.get(PEAK_COUNT),
+        config.get(PEAK_GRANULARITY) == PEAK_GRANULARITY_HOUR,
+    )
 
     async_add_entities(
         [
@@ -138,7 +154,7 @@ class GridCapWatcherEnergySensor(RestoreSensor):
 
         _LOGGER.debug("Hourly reset")
         self._state = 0
-        self.async_schedule_update_ha_state(True)
+        self.async_write_ha_state()
         #self.fire_event(0, time)   <-- Commented as this somehow causes problems for some installations.
         async_track_point_in_time(
             self._hass, self.hourly_reset, start_of_next_hour(time)
@@ -169,12 +185,12 @@ class GridCapWatcherEnergySensor(RestoreSensor):
 
         self._state += (diff * watt) / (3600 * 1000)
         self.fire_event(watt, old_state.last_updated)
-        self.async_schedule_update_ha_state(True)
+        self.async_write_ha_state()
 
     def fire_event(self, power: float, timestamp: datetime) -> bool:
         """Fire HA event so that dependent sensors can update their respective values"""
 
-        self._coordinator.effectstate.on_next(EnergyData(self._state, power, timestamp))
+        self._coordinator.publish_energy(EnergyData(self._state, power, timestamp))
         return True
 
     @property
@@ -222,8 +238,14 @@ class GridCapWatcherEstimatedEnergySensor(SensorEntity):
             )
         )
 
-        self._coordinator.effectstate.subscribe(self._state_change)
+        # Refreshed on every meter reading, so the rate can be limited
+        self.async_on_remove(
+            self._coordinator.effectstate.subscribe(
+                self._state_change, config.get(UPDATE_INTERVAL, 0)
+            )
+        )
 
+    @callback
     def _state_change(self, state: EnergyData):
         if state is None:
             return
@@ -244,7 +266,7 @@ class GridCapWatcherEstimatedEnergySensor(SensorEntity):
             remaining_seconds = 1
 
         self._state = energy + power * remaining_seconds / 3600 / 1000
-        self.schedule_update_ha_state()
+        self.async_write_ha_state()
 
     @property
     def name(self):
@@ -294,13 +316,10 @@ class GridCapWatcherCurrentEffectLevelThreshold(RestoreSensor, RestoreEntity):
         self.attr = {"top_three": []}
 
         self._levels = config.get(GRID_LEVELS)
+        self._level = None
 
-        self._coordinator.effectstate.subscribe(self._state_change)
-
-        hass.bus.async_listen(RESET_TOP_THREE, self.handle_reset_event)
-
-        async_track_point_in_time(
-            hass, self._async_reset_meter, start_of_next_month(dt.as_local(dt.now()))
+        self.async_on_remove(
+            self._coordinator.peakdata.subscribe(self._peaks_change)
         )
 
     async def async_added_to_hass(self) -> None:
@@ -311,57 +330,35 @@ class GridCapWatcherCurrentEffectLevelThreshold(RestoreSensor, RestoreEntity):
             if savedstate.state not in (STATE_UNKNOWN, STATE_UNAVAILABLE):
                 self._state = float(savedstate.state)
             if "top_three" in savedstate.attributes:
-                for item in savedstate.attributes["top_three"]:
-                    self.attr["top_three"].append(
-                        {
-                            "day": item["day"],
-                            "hour": item["hour"],
-                            "energy": item["energy"],
-                        }
-                    )
+                self._coordinator.peaks.restore(savedstate.attributes["top_three"])
+                self.attr["top_three"] = self._coordinator.peaks.as_list()
 
     @callback
-    def _async_reset_meter(self, _):
-        """Resets the attributes so that we don't carry over old values to new month"""
-        self.attr["top_three"] = []
-        self.schedule_update_ha_state(True)
-        _LOGGER.debug("Monthly reset")
-        async_track_point_in_time(
-            self._hass,
-            self._async_reset_meter,
-            start_of_next_month(dt.as_local(dt.now())),
-        )
-
-    @callback
-    def handle_reset_event(self, event):
-        """Handle reset event to reset top three attributes"""
-        self._async_reset_meter(event)
-
-    def _state_change(self, state: EnergyData) -> None:
-        if state is None:
+    def _peaks_change(self, peaks: PeakTracker) -> None:
+        if peaks is None:
             return
 
         self.attr["month"] = dt.as_local(dt.now()).month
-        self.attr["top_three"] = calculate_top_three(state, self.attr["top_three"])
-        self.calculate_level()
+        self.attr["top_three"] = peaks.as_list()
+        if len(peaks) == 0:
+            self.async_write_ha_state()
+            return
+        self.calculate_level(peaks.average())
 
-    def calculate_level(self) -> bool:
+    def calculate_level(self, average_value: float) -> bool:
         """Calculate the grid threshold level based on average of the highest hours"""
 
-        average_value = 0.0
-        for hour in self.attr["top_three"]:
-            average_value += hour["energy"]
-
-        average_value = average_value / len(self.attr["top_three"])
-
         found_threshold = self.get_level(average_value)
 
         if found_threshold is not None:
             self._state = found_threshold["threshold"]
-            self.schedule_update_ha_state(True)
+        self.async_write_ha_state()
+
+        if found_threshold is not None and found_threshold is not self._level:
+            self._level = found_threshold
 
             # Notify other sensors that threshold level has been updated
-            self._coordinator.thresholddata.on_next(
+            self._coordinator.thresholddata.publish(
                 GridThresholdData(
                     found_threshold["name"],
                     float(found_threshold["threshold"]),
@@ -435,12 +432,8 @@ class GridCapWatcherAverageThreePeakHours(RestoreSensor, RestoreEntity):
 
         self._levels = config.get(GRID_LEVELS)
 
-        self._coordinator.effectstate.subscribe(self._state_change)
-
-        hass.bus.async_listen(RESET_TOP_THREE, self.handle_reset_event)
-
-        async_track_point_in_time(
-            hass, self._async_reset_meter, start_of_next_month(dt.as_local(dt.now()))
+        self.async_on_remove(
+            self._coordinator.peakdata.subscribe(self._peaks_change)
         )
 
     async def async_added_to_hass(self) -> None:
@@ -451,48 +444,18 @@ class GridCapWatcherAverageThreePeakHours(RestoreSensor, RestoreEntity):
             if savedstate.state not in (STATE_UNKNOWN, STATE_UNAVAILABLE):
                 self._state = float(savedstate.state)
             if "top_three" in savedstate.attributes:
-                for item in savedstate.attributes["top_three"]:
-                    self.attr["top_three"].append(
-                        {
-                            "day": item["day"],
-                            "hour": item["hour"],
-                            "energy": item["energy"],
-                        }
-                    )
+                self._coordinator.peaks.restore(savedstate.attributes["top_three"])
+                self.attr["top_three"] = self._coordinator.peaks.as_list()
 
     @callback
-    def _async_reset_meter(self, _):
-        """Resets the attributes so that we don't carry over old values to new month"""
-        self.attr["top_three"] = []
-        self.schedule_update_ha_state(True)
-        _LOGGER.debug("Monthly reset")
-        async_track_point_in_time(
-            self._hass,
-            self._async_reset_meter,
-            start_of_next_month(dt.as_local(dt.now())),
-        )
-
-    @callback
-    def handle_reset_event(self, event):
-        """Handle reset event to reset top three attributes"""
-        self._async_reset_meter(event)
-
-    def _state_change(self, state: EnergyData) -> None:
-        if state is None:
-            return
-
-        self.attr["top_three"] = calculate_top_three(state, self.attr["top_three"])
-
-        totalSum = float(0)
-        for hour in self.attr["top_three"]:
-            totalSum += float(hour["energy"])
-
-        if len(self.attr["top_three"]) == 0:
+    def _peaks_change(self, peaks: PeakTracker) -> None:
+        if peaks is None:
             return
 
-        self._state = totalSum / len(self.attr["top_three"])
-        self.schedule_update_ha_state(True)
-        return True
+        self.attr["top_three"] = peaks.as_list()
+        if len(peaks) > 0:
+            self._state = peaks.average()
+        self.async_write_ha_state()
 
     @property
     def name(self):
@@ -551,8 +514,14 @@ class GridCapWatcherAvailableEffectRemainingHour(RestoreSensor, RestoreEntity):
             )
         )
 
-        self._coordinator.thresholddata.subscribe(self._threshold_state_change)
-        self._coordinator.effectstate.subscribe(self._effect_state_change)
+        self.async_on_remove(
+            self._coordinator.thresholddata.subscribe(self._threshold_state_change)
+        )
+        self.async_on_remove(
+            self._coordinator.effectstate.subscribe(
+                self._effect_state_change, config.get(UPDATE_INTERVAL, 0)
+            )
+        )
 
     async def async_added_to_hass(self) -> None:
         """Call when entity about to be added to hass."""
@@ -567,20 +536,22 @@ class GridCapWatcherAvailableEffectRemainingHour(RestoreSensor, RestoreEntity):
                 ]
             self.__calculate()
 
+    @callback
     def _threshold_state_change(self, state: GridThresholdData):
         if state is None:
             return
         self.attr["grid_threshold_level"] = state.level
         self.__calculate()
-        self.schedule_update_ha_state(True)
+        self.async_write_ha_state()
 
+    @callback
     def _effect_state_change(self, state: EnergyData):
         if state is None:
             return
         self._energy = state.energy_consumed
         self._effect = state.current_effect
         self.__calculate()
-        self.schedule_update_ha_state(True)
+        self.async_write_ha_state()
 
     def __calculate(self):
         if (
@@ -671,13 +642,16 @@ class GridCapacityWatcherCurrentLevelName(RestoreSensor):
         self._state = None
         self._levels = config.get(GRID_LEVELS)
         self._attr_unique_id = f"{DOMAIN}_effect_level_name".replace("sensor.", "")
-        self._coordinator.thresholddata.subscribe(self._threshold_state_change)
+        self.async_on_remove(
+            self._coordinator.thresholddata.subscribe(self._threshold_state_change)
+        )
 
+    @callback
     def _threshold_state_change(self, state: GridThresholdData):
         if state is None:
             return
         self._state = state.name
-        self.schedule_update_ha_state(True)
+        self.async_write_ha_state()
 
     async def async_added_to_hass(self) -> None:
         """Call when entity about to be added to hass."""
@@ -728,13 +702,16 @@ class GridCapacityWatcherCurrentLevelPrice(RestoreSensor):
         self._state = None
         self._levels = config.get(GRID_LEVELS)
         self._attr_unique_id = f"{DOMAIN}_effect_level_price".replace("sensor.", "")
-        self._coordinator.thresholddata.subscribe(self._threshold_state_change)
+        self.async_on_remove(
+            self._coordinator.thresholddata.subscribe(self._threshold_state_change)
+        )
 
+    @callback
     def _threshold_state_change(self, state: GridThresholdData):
         if state is None:
             return
         self._state = state.price
-        self.schedule_update_ha_state(True)
+        self.async_write_ha_state()
 
     async def async_added_to_hass(self) -> None:
         """Call when entity about to be added to hass."""
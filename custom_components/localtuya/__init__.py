@@ -29,7 +29,7 @@ from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.service import async_register_admin_service
 
 from .cloud_api import TuyaCloudApi
-from .common import TuyaDevice, async_config_entry_by_device_id
+from .common import TuyaDevice, async_device_index, async_invalidate_device_index
 from .config_flow import ENTRIES_VERSION, config_schema
 from .const import (
     ATTR_UPDATED_AT,
@@ -38,16 +38,18 @@ from .const import (
     CONF_USER_ID,
     DATA_CLOUD,
     DATA_DISCOVERY,
+    DATA_RECONNECT,
     DOMAIN,
     TUYA_DEVICES,
 )
 from .discovery import TuyaDiscovery
+from .reconnect import ReconnectScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
 UNSUB_LISTENER = "unsub_listener"
 
-RECONNECT_INTERVAL = timedelta(seconds=60)
+RECONNECT_INTERVAL = timedelta(seconds=10)
 
 CONFIG_SCHEMA = config_schema()
 
@@ -68,8 +70,7 @@ async def async_setup(hass: HomeAssistant, config: dict):
     """Set up the LocalTuya integration component."""
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][TUYA_DEVICES] = {}
-
-    device_cache = {}
+    hass.data[DOMAIN][DATA_RECONNECT] = scheduler = ReconnectScheduler(hass)
 
     async def _handle_reload(service):
         """Handle reload service call."""
@@ -102,42 +103,23 @@ async def async_setup(hass: HomeAssistant, config: dict):
         device_id = device["gwId"]
         product_key = device["productKey"]
 
-        # If device is not in cache, check if a config entry exists
-        entry = async_config_entry_by_device_id(hass, device_id)
-        if entry is None:
-            return
-
-        if device_id not in device_cache:
-            if entry and device_id in entry.data[CONF_DEVICES]:
-                # Save address from config entry in cache to trigger
-                # potential update below
-                host_ip = entry.data[CONF_DEVICES][device_id][CONF_HOST]
-                device_cache[device_id] = host_ip
-
-        if device_id not in device_cache:
+        index = async_device_index(hass)
+        if device_id not in index:
             return
 
-        dev_entry = entry.data[CONF_DEVICES][device_id]
-
-        new_data = entry.data.copy()
-        updated = False
-
-        if device_cache[device_id] != device_ip:
-            updated = True
-            new_data[CONF_DEVICES][device_id][CONF_HOST] = device_ip
-            device_cache[device_id] = device_ip
-
-        if dev_entry.get(CONF_PRODUCT_KEY) != product_key:
-            updated = True
-            new_data[CONF_DEVICES][device_id][CONF_PRODUCT_KEY] = product_key
+        entry, host_ip, dev_product_key = index[device_id]
 
         # Update settings if something changed, otherwise try to connect. Updating
         # settings triggers a reload of the config entry, which tears down the device
         # so no need to connect in that case.
-        if updated:
+        if host_ip != device_ip or dev_product_key != product_key:
             _LOGGER.debug(
                 "Updating keys for device %s: %s %s", device_id, device_ip, product_key
             )
+            index[device_id] = (entry, device_ip, product_key)
+            new_data = entry.data.copy()
+            new_data[CONF_DEVICES][device_id][CONF_HOST] = device_ip
+            new_data[CONF_DEVICES][device_id][CONF_PRODUCT_KEY] = product_key
             new_data[ATTR_UPDATED_AT] = str(int(time.time() * 1000))
             hass.config_entries.async_update_entry(entry, data=new_data)
 
@@ -148,8 +130,7 @@ async def async_setup(hass: HomeAssistant, config: dict):
         if not device:
             _LOGGER.warning(f"Could not find device for device_id {device_id}")
         elif not device.connected:
-            device.async_connect()
-
+            scheduler.async_request(device_id, discovered=True)
 
     def _shutdown(event):
         """Clean up resources when shutting down."""
@@ -159,7 +140,7 @@ async def async_setup(hass: HomeAssistant, config: dict):
         """Try connecting to devices not already connected to."""
         for device_id, device in hass.data[DOMAIN][TUYA_DEVICES].items():
             if not device.connected:
-                device.async_connect()
+                scheduler.async_request(device_id)
 
     async_track_time_interval(hass, _async_reconnect, RECONNECT_INTERVAL)
 
@@ -262,6 +243,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
             _LOGGER.info("Cloud API connection succeeded.")
             res = await tuya_api.async_get_devices_list()
     hass.data[DOMAIN][DATA_CLOUD] = tuya_api
+    async_invalidate_device_index(hass)
 
     platforms = set()
     for dev_id in entry.data[CONF_DEVICES].keys():
@@ -277,7 +259,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
 
     async def setup_entities(device_ids):
         for dev_id in device_ids:
-            hass.data[DOMAIN][TUYA_DEVICES][dev_id].async_connect()
+            hass.data[DOMAIN][DATA_RECONNECT].async_request(dev_id)
 
         await async_remove_orphan_entities(hass, entry)
 
@@ -313,12 +295,14 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
 
     if unload_ok:
         hass.data[DOMAIN][TUYA_DEVICES] = {}
+    async_invalidate_device_index(hass)
 
     return True
 
 
 async def update_listener(hass, config_entry):
     """Update listener."""
+    async_invalidate_device_index(hass)
     await hass.config_entries.async_reload(config_entry.entry_id)
 
 
@@ -348,6 +332,7 @@ async def async_remove_config_entry_device(
     new_data = config_entry.data.copy()
     new_data[CONF_DEVICES].pop(dev_id)
     new_data[ATTR_UPDATED_AT] = str(int(time.time() * 1000))
+    async_invalidate_device_index(hass)
 
     hass.config_entries.async_update_entry(
         config_entry,
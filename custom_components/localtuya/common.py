@@ -33,16 +33,25 @@ from .const import (
     CONF_LOCAL_KEY,
     CONF_MODEL,
     CONF_PASSIVE_ENTITY,
+    CONF_PRODUCT_KEY,
     CONF_PROTOCOL_VERSION,
     CONF_RESET_DPIDS,
     CONF_RESTORE_ON_RECONNECT,
+    CONF_SESSION_RESUME,
+    CONF_WRITE_WINDOW,
     DATA_CLOUD,
+    DATA_DEVICE_INDEX,
+    DEFAULT_WRITE_WINDOW,
     DOMAIN,
     TUYA_DEVICES,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+ATTR_WRITES_REQUESTED = "writes_requested"
+ATTR_WRITES_MERGED = "writes_merged"
+ATTR_FRAMES_SENT = "frames_sent"
+
 
 def prepare_setup_entities(hass, config_entry, platform):
     """Prepare ro setup entities for a platform."""
@@ -120,15 +129,30 @@ def get_entity_config(config_entry, dp_id):
 
 
 @callback
-def async_config_entry_by_device_id(hass, device_id):
-    """Look up config entry by device id."""
-    current_entries = hass.config_entries.async_entries(DOMAIN)
-    for entry in current_entries:
-        if device_id in entry.data.get(CONF_DEVICES, []):
-            return entry
-        else:
-            _LOGGER.debug(f"Missing device configuration for device_id {device_id}")
-    return None
+def async_device_index(hass):
+    """Return index of device id to (config entry, host, product key).
+
+    The index is built on first use and must be invalidated whenever config
+    entries change.
+    """
+    index = hass.data[DOMAIN].get(DATA_DEVICE_INDEX)
+    if index is None:
+        index = {}
+        for entry in hass.config_entries.async_entries(DOMAIN):
+            for dev_id, dev_entry in entry.data.get(CONF_DEVICES, {}).items():
+                index[dev_id] = (
+                    entry,
+                    dev_entry.get(CONF_HOST),
+                    dev_entry.get(CONF_PRODUCT_KEY),
+                )
+        hass.data[DOMAIN][DATA_DEVICE_INDEX] = index
+    return index
+
+
+@callback
+def async_invalidate_device_index(hass):
+    """Drop the device index so it is rebuilt on next use."""
+    hass.data[DOMAIN].pop(DATA_DEVICE_INDEX, None)
 
 
 class TuyaDevice(pytuya.TuyaListener, pytuya.ContextualLogger):
@@ -149,6 +173,19 @@ class TuyaDevice(pytuya.TuyaListener, pytuya.ContextualLogger):
         self._unsub_interval = None
         self._entities = []
         self._local_key = self._dev_config_entry[CONF_LOCAL_KEY]
+        self._write_window = (
+            int(self._dev_config_entry.get(CONF_WRITE_WINDOW, DEFAULT_WRITE_WINDOW))
+            / 1000
+        )
+        self._write_lock = asyncio.Lock()
+        self._flush_handle = None
+        self._pending_dps = {}
+        self._pending_writes = []
+        self._write_stats = {
+            ATTR_WRITES_REQUESTED: 0,
+            ATTR_WRITES_MERGED: 0,
+            ATTR_FRAMES_SENT: 0,
+        }
         self._default_reset_dpids = None
         if CONF_RESET_DPIDS in self._dev_config_entry:
             reset_ids_str = self._dev_config_entry[CONF_RESET_DPIDS].split(",")
@@ -177,11 +214,20 @@ class TuyaDevice(pytuya.TuyaListener, pytuya.ContextualLogger):
         """Return if connected to device."""
         return self._interface is not None
 
+    @property
+    def write_stats(self):
+        """Return counters of requested, merged and sent DP writes."""
+        return dict(self._write_stats)
+
     def async_connect(self):
-        """Connect to device if not already connected."""
+        """Connect to device if not already connected.
+
+        Returns the connection task, or None if no connection is attempted.
+        """
         # self.info("async_connect: %d %r %r", self._is_closing, self._connect_task, self._interface)
         if not self._is_closing and self._connect_task is None and not self._interface:
             self._connect_task = asyncio.create_task(self._make_connection())
+        return self._connect_task
 
     async def _make_connection(self):
         """Subscribe localtuya entity events."""
@@ -195,6 +241,7 @@ class TuyaDevice(pytuya.TuyaListener, pytuya.ContextualLogger):
                 float(self._dev_config_entry[CONF_PROTOCOL_VERSION]),
                 self._dev_config_entry.get(CONF_ENABLE_DEBUG, False),
                 self,
+                session_resume=self._dev_config_entry.get(CONF_SESSION_RESUME, False),
             )
             self._interface.add_dps_to_request(self.dps_to_request)
         except Exception as ex:  # pylint: disable=broad-except
@@ -250,9 +297,11 @@ class TuyaDevice(pytuya.TuyaListener, pytuya.ContextualLogger):
 
         if self._interface is not None:
             # Attempt to restore status for all entities that need to first set
-            # the DPS value before the device will respond with status.
-            for entity in self._entities:
-                await entity.restore_state_when_connected()
+            # the DPS value before the device will respond with status. Restoring
+            # concurrently lets the values be merged into a single command.
+            await asyncio.gather(
+                *[entity.restore_state_when_connected() for entity in self._entities]
+            )
 
             def _new_entity_handler(entity_id):
                 self.debug(
@@ -304,6 +353,13 @@ class TuyaDevice(pytuya.TuyaListener, pytuya.ContextualLogger):
     async def close(self):
         """Close connection and stop re-connect loop."""
         self._is_closing = True
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        for waiter in self._pending_writes:
+            if not waiter.done():
+                waiter.set_exception(Exception("connection closed"))
+        self._pending_dps, self._pending_writes = {}, []
         if self._connect_task is not None:
             self._connect_task.cancel()
             await self._connect_task
@@ -320,7 +376,7 @@ class TuyaDevice(pytuya.TuyaListener, pytuya.ContextualLogger):
         """Change value of a DP of the Tuya device."""
         if self._interface is not None:
             try:
-                await self._interface.set_dp(state, dp_index)
+                await self._queue_dps({str(dp_index): state})
             except Exception:  # pylint: disable=broad-except
                 self.exception("Failed to set DP %d to %s", dp_index, str(state))
         else:
@@ -332,7 +388,7 @@ class TuyaDevice(pytuya.TuyaListener, pytuya.ContextualLogger):
         """Change value of a DPs of the Tuya device."""
         if self._interface is not None:
             try:
-                await self._interface.set_dps(states)
+                await self._queue_dps(states)
             except Exception:  # pylint: disable=broad-except
                 self.exception("Failed to set DPs %r", states)
         else:
@@ -340,6 +396,52 @@ class TuyaDevice(pytuya.TuyaListener, pytuya.ContextualLogger):
                 "Not connected to device %s", self._dev_config_entry[CONF_FRIENDLY_NAME]
             )
 
+    def _queue_dps(self, states):
+        """Queue DPs to be sent together with writes arriving within the window.
+
+        Returns a future that is resolved once the merged command was sent.
+        """
+        waiter = asyncio.get_running_loop().create_future()
+        # Later writes to the same DP replace earlier ones (last write wins)
+        self._pending_dps.update({str(dp): value for dp, value in states.items()})
+        self._pending_writes.append(waiter)
+        self._write_stats[ATTR_WRITES_REQUESTED] += 1
+
+        if self._flush_handle is None:
+            self._flush_handle = self._hass.loop.call_later(
+                self._write_window, self._flush_writes
+            )
+        return waiter
+
+    @callback
+    def _flush_writes(self):
+        """Send all queued DPs as a single command."""
+        self._flush_handle = None
+        states, self._pending_dps = self._pending_dps, {}
+        waiters, self._pending_writes = self._pending_writes, []
+        if waiters:
+            self._write_stats[ATTR_WRITES_MERGED] += len(waiters) - 1
+            self._hass.async_create_task(self._async_send_dps(states, waiters))
+
+    async def _async_send_dps(self, states, waiters):
+        """Send merged DPs and report the outcome to every caller."""
+        # The lock keeps merged commands in the order they were flushed
+        async with self._write_lock:
+            try:
+                if self._interface is None:
+                    raise Exception("not connected to device")
+                self._write_stats[ATTR_FRAMES_SENT] += 1
+                self.debug("Sending %d merged DP writes: %r", len(waiters), states)
+                await self._interface.set_dps(states)
+            except Exception as ex:  # pylint: disable=broad-except
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(ex)
+            else:
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_result(None)
+
     @callback
     def status_updated(self, status):
         """Device updated status."""
@@ -41,8 +41,10 @@ from .const import (
     CONF_PRODUCT_NAME,
     CONF_PROTOCOL_VERSION,
     CONF_RESET_DPIDS,
+    CONF_SESSION_RESUME,
     CONF_SETUP_CLOUD,
     CONF_USER_ID,
+    CONF_WRITE_WINDOW,
     CONF_ENABLE_ADD_ENTITIES,
     DATA_CLOUD,
     DATA_DISCOVERY,
@@ -98,6 +100,8 @@ DEVICE_SCHEMA = vol.Schema(
         vol.Optional(CONF_SCAN_INTERVAL): int,
         vol.Optional(CONF_MANUAL_DPS): cv.string,
         vol.Optional(CONF_RESET_DPIDS): str,
+        vol.Optional(CONF_WRITE_WINDOW): int,
+        vol.Required(CONF_SESSION_RESUME, default=False): bool,
     }
 )
 
@@ -144,6 +148,8 @@ def options_schema(entities):
             vol.Optional(CONF_SCAN_INTERVAL): int,
             vol.Optional(CONF_MANUAL_DPS): cv.string,
             vol.Optional(CONF_RESET_DPIDS): cv.string,
+            vol.Optional(CONF_WRITE_WINDOW): int,
+            vol.Required(CONF_SESSION_RESUME, default=False): bool,
             vol.Required(
                 CONF_ENTITIES, description={"suggested_value": entity_names}
             ): cv.multi_select(entity_names),
@@ -4,6 +4,8 @@ DOMAIN = "localtuya"
 
 DATA_DISCOVERY = "discovery"
 DATA_CLOUD = "cloud_data"
+DATA_RECONNECT = "reconnect"
+DATA_DEVICE_INDEX = "device_index"
 
 # Platforms in this list must support config flows
 PLATFORMS = [
@@ -47,6 +49,11 @@ CONF_MANUAL_DPS = "manual_dps_strings"
 CONF_DEFAULT_VALUE = "dps_default_value"
 CONF_RESET_DPIDS = "reset_dpids"
 CONF_PASSIVE_ENTITY = "is_passive_entity"
+CONF_WRITE_WINDOW = "write_window"
+CONF_SESSION_RESUME = "session_resume"
+
+# DP writes arriving within this many milliseconds are sent in one frame
+DEFAULT_WRITE_WINDOW = 50
 
 # light
 CONF_BRIGHTNESS_LOWER = "brightness_lower"
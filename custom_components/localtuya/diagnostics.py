@@ -10,11 +10,20 @@ from homeassistant.const import CONF_CLIENT_ID, CONF_CLIENT_SECRET, CONF_DEVICES
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceEntry
 
-from .const import CONF_LOCAL_KEY, CONF_USER_ID, DATA_CLOUD, DOMAIN
+from .const import (
+    CONF_LOCAL_KEY,
+    CONF_USER_ID,
+    DATA_CLOUD,
+    DATA_RECONNECT,
+    DOMAIN,
+    TUYA_DEVICES,
+)
 
 CLOUD_DEVICES = "cloud_devices"
 DEVICE_CONFIG = "device_config"
 DEVICE_CLOUD_INFO = "device_cloud_info"
+DEVICE_WRITE_STATS = "device_write_stats"
+DEVICE_RECONNECT_STATS = "device_reconnect_stats"
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -61,5 +70,10 @@ async def async_get_device_diagnostics(
         # local_key_obfuscated = "{local_key[0:3]}...{local_key[-3:]}"
         # data[DEVICE_CLOUD_INFO][CONF_LOCAL_KEY] = local_key_obfuscated
 
+    device = hass.data[DOMAIN][TUYA_DEVICES].get(dev_id)
+    if device is not None:
+        data[DEVICE_WRITE_STATS] = device.write_stats
+    data[DEVICE_RECONNECT_STATS] = hass.data[DOMAIN][DATA_RECONNECT].stats(dev_id)
+
     # data["log"] = hass.data[DOMAIN][CONF_DEVICES][dev_id].logger.retrieve_log()
     return data
@@ -7,6 +7,7 @@ https://github.com/ct-Open-Source/tuya-convert/blob/master/scripts/tuya-discover
 import asyncio
 import json
 import logging
+import time
 from hashlib import md5
 
 from cryptography.hazmat.backends import default_backend
@@ -18,6 +19,9 @@ UDP_KEY = md5(b"yGAdlopoPVldABfn").digest()
 
 DEFAULT_TIMEOUT = 6.0
 
+# Identical broadcasts from the same address within this many seconds are dropped
+DUPLICATE_TTL = 30.0
+
 
 def decrypt_udp(message):
     """Decrypt encrypted UDP broadcasts."""
@@ -36,6 +40,7 @@ class TuyaDiscovery(asyncio.DatagramProtocol):
     def __init__(self, callback=None):
         """Initialize a new BaseDiscovery."""
         self.devices = {}
+        self._last_broadcast = {}
         self._listeners = []
         self._callback = callback
 
@@ -60,6 +65,12 @@ class TuyaDiscovery(asyncio.DatagramProtocol):
 
     def datagram_received(self, data, addr):
         """Handle received broadcast message."""
+        now = time.monotonic()
+        last = self._last_broadcast.get(addr[0])
+        if last is not None and last[0] == data and now - last[1] < DUPLICATE_TTL:
+            return
+        self._last_broadcast[addr[0]] = (data, now)
+
         data = data[20:-8]
         try:
             data = decrypt_udp(data)
@@ -45,7 +45,8 @@ import struct
 import time
 import weakref
 from abc import ABC, abstractmethod
-from collections import namedtuple
+from collections import deque, namedtuple
+from functools import lru_cache
 from hashlib import md5, sha256
 
 from cryptography.hazmat.backends import default_backend
@@ -163,6 +164,15 @@ NO_PROTOCOL_HEADER_CMDS = [
 
 HEARTBEAT_INTERVAL = 10
 
+# Maximum number of requests that may wait for a response on one connection
+MAX_PENDING_REQUESTS = 16
+
+# Seconds a negotiated 3.4 session key may be reused after a reconnect
+SESSION_RESUME_TIMEOUT = 60
+
+# Negotiated session keys by device id: (local_key, session_key, timestamp)
+session_keys = {}
+
 # DPS that are known to be safe to use with update_dps (0x12) command
 UPDATE_DPS_WHITELIST = [18, 19, 20]  # Socket (Wi-Fi)
 
@@ -263,6 +273,19 @@ class ContextualLogger:
         return self._logger.exception(msg, *args)
 
 
+@lru_cache(maxsize=128)
+def _hmac_context(key):
+    """Return a keyed HMAC-SHA256 context to copy from."""
+    return hmac.new(key, digestmod=sha256)
+
+
+def hmac_digest(key, data):
+    """Return HMAC-SHA256 of data, reusing the keyed context for key."""
+    context = _hmac_context(key).copy()
+    context.update(data)
+    return context.digest()
+
+
 def pack_message(msg, hmac_key=None):
     """Pack a TuyaMessage into bytes."""
     end_fmt = MESSAGE_END_FMT_HMAC if hmac_key else MESSAGE_END_FMT
@@ -278,7 +301,7 @@ def pack_message(msg, hmac_key=None):
         + msg.payload
     )
     if hmac_key:
-        crc = hmac.new(hmac_key, buffer, sha256).digest()
+        crc = hmac_digest(hmac_key, buffer)
     else:
         crc = binascii.crc32(buffer) & 0xFFFFFFFF
     # Calculate CRC, add it together with suffix
@@ -324,9 +347,9 @@ def unpack_message(data, hmac_key=None, header=None, no_retcode=False, logger=No
     crc, suffix = struct.unpack(end_fmt, payload[-end_len:])
 
     if hmac_key:
-        have_crc = hmac.new(
-            hmac_key, data[: (header_len + header.length) - end_len], sha256
-        ).digest()
+        have_crc = hmac_digest(
+            hmac_key, data[: (header_len + header.length) - end_len]
+        )
     else:
         have_crc = (
             binascii.crc32(data[: (header_len + header.length) - end_len]) & 0xFFFFFFFF
@@ -350,15 +373,15 @@ def unpack_message(data, hmac_key=None, header=None, no_retcode=False, logger=No
     )
 
 
-def parse_header(data):
-    """Unpack bytes into a TuyaHeader."""
+def parse_header(data, offset=0):
+    """Unpack bytes (starting at offset) into a TuyaHeader."""
     header_len = struct.calcsize(MESSAGE_HEADER_FMT)
 
-    if len(data) < header_len:
+    if len(data) - offset < header_len:
         raise DecodeError("Not enough data to unpack header")
 
-    prefix, seqno, cmd, payload_len = struct.unpack(
-        MESSAGE_HEADER_FMT, data[:header_len]
+    prefix, seqno, cmd, payload_len = struct.unpack_from(
+        MESSAGE_HEADER_FMT, data, offset
     )
 
     if prefix != PREFIX_VALUE:
@@ -375,6 +398,18 @@ def parse_header(data):
     return TuyaHeader(prefix, seqno, cmd, payload_len)
 
 
+def command_class(cmd):
+    """Return the class used to correlate a response with its request."""
+    if cmd == HEART_BEAT:
+        return HEART_BEAT
+    if cmd == UPDATEDPS:
+        return UPDATEDPS
+    if cmd in [SESS_KEY_NEG_START, SESS_KEY_NEG_RESP, SESS_KEY_NEG_FINISH]:
+        return SESS_KEY_NEG_START
+    # Queries and controls are answered using the sequence number of the request
+    return CONTROL
+
+
 class AESCipher:
     """Cipher module for Tuya communication."""
 
@@ -382,13 +417,20 @@ class AESCipher:
         """Initialize a new AESCipher."""
         self.block_size = 16
         self.cipher = Cipher(algorithms.AES(key), modes.ECB(), default_backend())
+        # ECB keeps no state between blocks, so block aligned data can go through
+        # the same contexts instead of setting up new ones for every message
+        self._encryptor = self.cipher.encryptor()
+        self._decryptor = self.cipher.decryptor()
 
     def encrypt(self, raw, use_base64=True, pad=True):
         """Encrypt data to be sent to device."""
-        encryptor = self.cipher.encryptor()
         if pad:
             raw = self._pad(raw)
-        crypted_text = encryptor.update(raw) + encryptor.finalize()
+        if len(raw) % self.block_size == 0:
+            crypted_text = self._encryptor.update(raw)
+        else:
+            encryptor = self.cipher.encryptor()
+            crypted_text = encryptor.update(raw) + encryptor.finalize()
         return base64.b64encode(crypted_text) if use_base64 else crypted_text
 
     def decrypt(self, enc, use_base64=True, decode_text=True):
@@ -396,8 +438,12 @@ class AESCipher:
         if use_base64:
             enc = base64.b64decode(enc)
 
-        decryptor = self.cipher.decryptor()
-        raw = self._unpad(decryptor.update(enc) + decryptor.finalize())
+        if enc and len(enc) % self.block_size == 0:
+            raw = self._unpad(self._decryptor.update(enc))
+        else:
+            # Let a fresh context raise on incomplete data
+            decryptor = self.cipher.decryptor()
+            raw = self._unpad(decryptor.update(enc) + decryptor.finalize())
         return raw.decode("utf-8") if decode_text else raw
 
     def _pad(self, data):
@@ -422,7 +468,7 @@ class MessageDispatcher(ContextualLogger):
     def __init__(self, dev_id, listener, protocol_version, local_key, enable_debug):
         """Initialize a new MessageBuffer."""
         super().__init__()
-        self.buffer = b""
+        self.buffer = bytearray()
         self.listeners = {}
         self.listener = listener
         self.version = protocol_version
@@ -431,85 +477,101 @@ class MessageDispatcher(ContextualLogger):
 
     def abort(self):
         """Abort all waiting clients."""
-        for key in self.listeners:
-            sem = self.listeners[key]
-            self.listeners[key] = None
+        listeners, self.listeners = self.listeners, {}
+        for waiters in listeners.values():
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
 
-            # TODO: Received data and semahore should be stored separately
-            if isinstance(sem, asyncio.Semaphore):
-                sem.release()
+    @property
+    def pending(self):
+        """Return number of clients waiting for a response."""
+        return sum(len(waiters) for waiters in self.listeners.values())
 
     async def wait_for(self, seqno, cmd, timeout=5):
         """Wait for response to a sequence number to be received and return it."""
-        if seqno in self.listeners:
-            raise Exception(f"listener exists for {seqno}")
+        if self.pending >= MAX_PENDING_REQUESTS:
+            raise Exception(f"too many pending requests, dropping {seqno}")
 
         self.debug("Command %d waiting for seq. number %d", cmd, seqno)
-        self.listeners[seqno] = asyncio.Semaphore(0)
+        key = (seqno, command_class(cmd))
+        waiter = asyncio.get_running_loop().create_future()
+        waiters = self.listeners.setdefault(key, deque())
+        waiters.append(waiter)
         try:
-            await asyncio.wait_for(self.listeners[seqno].acquire(), timeout=timeout)
+            return await asyncio.wait_for(waiter, timeout=timeout)
         except asyncio.TimeoutError:
             self.debug(
                 "Command %d timed out waiting for sequence number %d", cmd, seqno
             )
-            del self.listeners[seqno]
             raise
-
-        return self.listeners.pop(seqno)
+        finally:
+            if waiter in waiters:
+                waiters.remove(waiter)
+            if not waiters and self.listeners.get(key) is waiters:
+                del self.listeners[key]
 
     def add_data(self, data):
         """Add new data to the buffer and try to parse messages."""
         self.buffer += data
         header_len = struct.calcsize(MESSAGE_RECV_HEADER_FMT)
+        prefix_len = struct.calcsize(MESSAGE_HEADER_FMT)
+        hmac_key = self.local_key if self.version == 3.4 else None
+        buffer_len = len(self.buffer)
+        offset = 0
 
-        while self.buffer:
-            # Check if enough data for measage header
-            if len(self.buffer) < header_len:
-                break
-
-            header = parse_header(self.buffer)
-            hmac_key = self.local_key if self.version == 3.4 else None
-            msg = unpack_message(
-                self.buffer, header=header, hmac_key=hmac_key, logger=self
-            )
-            self.buffer = self.buffer[header_len - 4 + header.length :]
-            self._dispatch(msg)
+        try:
+            # Walk the frames in place and only copy out complete ones, the
+            # consumed part of the buffer is dropped once when done
+            with memoryview(self.buffer) as view:
+                while buffer_len - offset >= header_len:
+                    header = parse_header(view, offset)
+                    frame_end = offset + prefix_len + header.length
+                    if frame_end > buffer_len:
+                        # Partial frame, wait for more data
+                        break
+
+                    msg = unpack_message(
+                        bytes(view[offset:frame_end]),
+                        header=header,
+                        hmac_key=hmac_key,
+                        logger=self,
+                    )
+                    offset = frame_end
+                    self._dispatch(msg)
+        finally:
+            if offset:
+                del self.buffer[:offset]
+
+    def _resolve(self, key, msg):
+        """Hand a message to the oldest client waiting for it, if any."""
+        waiters = self.listeners.get(key)
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(msg)
+                return True
+        return False
 
     def _dispatch(self, msg):
         """Dispatch a message to someone that is listening."""
         self.debug("Dispatching message CMD %r %s", msg.cmd, msg)
-        if msg.seqno in self.listeners:
-            # self.debug("Dispatching sequence number %d", msg.seqno)
-            sem = self.listeners[msg.seqno]
-            if isinstance(sem, asyncio.Semaphore):
-                self.listeners[msg.seqno] = msg
-                sem.release()
-            else:
-                self.debug("Got additional message without request - skipping: %s", sem)
-        elif msg.cmd == HEART_BEAT:
+        if self._resolve((msg.seqno, command_class(msg.cmd)), msg):
+            # self.debug("Dispatched sequence number %d", msg.seqno)
+            return
+
+        if msg.cmd == HEART_BEAT:
             self.debug("Got heartbeat response")
-            if self.HEARTBEAT_SEQNO in self.listeners:
-                sem = self.listeners[self.HEARTBEAT_SEQNO]
-                self.listeners[self.HEARTBEAT_SEQNO] = msg
-                sem.release()
+            self._resolve((self.HEARTBEAT_SEQNO, HEART_BEAT), msg)
         elif msg.cmd == UPDATEDPS:
             self.debug("Got normal updatedps response")
-            if self.RESET_SEQNO in self.listeners:
-                sem = self.listeners[self.RESET_SEQNO]
-                self.listeners[self.RESET_SEQNO] = msg
-                sem.release()
+            self._resolve((self.RESET_SEQNO, UPDATEDPS), msg)
         elif msg.cmd == SESS_KEY_NEG_RESP:
             self.debug("Got key negotiation response")
-            if self.SESS_KEY_SEQNO in self.listeners:
-                sem = self.listeners[self.SESS_KEY_SEQNO]
-                self.listeners[self.SESS_KEY_SEQNO] = msg
-                sem.release()
+            self._resolve((self.SESS_KEY_SEQNO, SESS_KEY_NEG_START), msg)
         elif msg.cmd == STATUS:
-            if self.RESET_SEQNO in self.listeners:
+            if self._resolve((self.RESET_SEQNO, UPDATEDPS), msg):
                 self.debug("Got reset status update")
-                sem = self.listeners[self.RESET_SEQNO]
-                self.listeners[self.RESET_SEQNO] = msg
-                sem.release()
             else:
                 self.debug("Got status update")
                 self.listener(msg)
@@ -551,7 +613,14 @@ class TuyaProtocol(asyncio.Protocol, ContextualLogger):
     """Implementation of the Tuya protocol."""
 
     def __init__(
-        self, dev_id, local_key, protocol_version, enable_debug, on_connected, listener
+        self,
+        dev_id,
+        local_key,
+        protocol_version,
+        enable_debug,
+        on_connected,
+        listener,
+        session_resume=False,
     ):
         """
         Initialize a new TuyaInterface.
@@ -580,7 +649,7 @@ class TuyaProtocol(asyncio.Protocol, ContextualLogger):
             # them (such as BulbDevice) make connections when called
             TuyaProtocol.set_version(self, 3.1)
 
-        self.cipher = AESCipher(self.local_key)
+        self.ciphers = {}
         self.seqno = 1
         self.transport = None
         self.listener = weakref.ref(listener)
@@ -590,6 +659,9 @@ class TuyaProtocol(asyncio.Protocol, ContextualLogger):
         self.dps_cache = {}
         self.local_nonce = b"0123456789abcdef"  # not-so-random random key
         self.remote_nonce = b""
+        self.session_resume = session_resume
+        self.session_resumed = False
+        self.session_lock = asyncio.Lock()
 
     def set_version(self, protocol_version):
         """Set the device version and eventually start available DPs detection."""
@@ -602,6 +674,13 @@ class TuyaProtocol(asyncio.Protocol, ContextualLogger):
         elif protocol_version == 3.4:
             self.dev_type = "v3.4"
 
+    def _cipher(self, key):
+        """Return a cached cipher for key."""
+        cipher = self.ciphers.get(key)
+        if cipher is None:
+            cipher = self.ciphers[key] = AESCipher(key)
+        return cipher
+
     def error_json(self, number=None, payload=None):
         """Return error details in JSON."""
         try:
@@ -670,7 +749,13 @@ class TuyaProtocol(asyncio.Protocol, ContextualLogger):
     def connection_lost(self, exc):
         """Disconnected from device."""
         self.debug("Connection lost: %s", exc)
+        if self.session_resumed:
+            # Resumed session key was never confirmed by the device
+            self._forget_session()
         self.real_local_key = self.local_key
+        if self.dispatcher is not None:
+            # Nothing will be answered anymore, release waiting clients right away
+            self.dispatcher.abort()
         try:
             listener = self.listener and self.listener()
             if listener is not None:
@@ -742,10 +827,23 @@ class TuyaProtocol(asyncio.Protocol, ContextualLogger):
 
     async def exchange(self, command, dps=None):
         """Send and receive a message, returning response from device."""
-        if self.version == 3.4 and self.real_local_key == self.local_key:
-            self.debug("3.4 device: negotiating a new session key")
-            await self._negotiate_session_key()
-
+        if self.version == 3.4 and (
+            self.real_local_key == self.local_key or self.session_resumed
+        ):
+            async with self.session_lock:
+                # Another exchange may have set up the session key while we waited
+                if self.real_local_key == self.local_key:
+                    if self._resume_session():
+                        self.debug("3.4 device: resuming previous session key")
+                        # Resumed key must be confirmed before others use it
+                        return await self._exchange(command, dps, resumed=True)
+                    self.debug("3.4 device: negotiating a new session key")
+                    await self._negotiate_session_key()
+
+        return await self._exchange(command, dps)
+
+    async def _exchange(self, command, dps=None, resumed=False):
+        """Send a message with the current key and wait for the response."""
         self.debug(
             "Sending command %s (device type: %s)",
             command,
@@ -766,7 +864,24 @@ class TuyaProtocol(asyncio.Protocol, ContextualLogger):
 
         enc_payload = self._encode_message(payload)
         self.transport.write(enc_payload)
-        msg = await self.dispatcher.wait_for(seqno, payload.cmd)
+        try:
+            msg = await self.dispatcher.wait_for(seqno, payload.cmd)
+        except asyncio.TimeoutError:
+            # Only a live connection tells if the resumed key was rejected
+            if not resumed or self.transport is None or self.transport.is_closing():
+                raise
+            msg = None
+            rejected = True
+        else:
+            # None means the wait was aborted, connection_lost forgets the session
+            rejected = msg is not None and not msg.crc_good
+        if resumed:
+            if rejected:
+                self.debug("Resumed session key rejected, negotiating a new one")
+                self._forget_session()
+                await self._negotiate_session_key()
+                return await self._exchange(command, dps)
+            self.session_resumed = False
         if msg is None:
             self.debug("Wait was aborted for seqno %d", seqno)
             return None
@@ -787,7 +902,7 @@ class TuyaProtocol(asyncio.Protocol, ContextualLogger):
                 dev_type,
                 self.dev_type,
             )
-            return await self.exchange(command, dps)
+            return await self._exchange(command, dps)
         return payload
 
     async def status(self):
@@ -880,7 +995,7 @@ class TuyaProtocol(asyncio.Protocol, ContextualLogger):
             self.dps_to_request.update({str(index): None for index in dp_indicies})
 
     def _decode_payload(self, payload):
-        cipher = AESCipher(self.local_key)
+        cipher = self._cipher(self.local_key)
 
         if self.version == 3.4:
             # 3.4 devices encrypt the version header in addition to the payload
@@ -967,6 +1082,31 @@ class TuyaProtocol(asyncio.Protocol, ContextualLogger):
 
         return json_payload
 
+    def _resume_session(self):
+        """Reuse a recently negotiated session key, if allowed and available."""
+        if not self.session_resume or self.id not in session_keys:
+            return False
+
+        local_key, session_key, timestamp = session_keys[self.id]
+        if (
+            local_key != self.real_local_key
+            or time.monotonic() - timestamp > SESSION_RESUME_TIMEOUT
+        ):
+            del session_keys[self.id]
+            return False
+
+        self.local_key = self.dispatcher.local_key = session_key
+        self.session_resumed = True
+        return True
+
+    def _forget_session(self):
+        """Drop the stored session key and go back to the real local key."""
+        session_keys.pop(self.id, None)
+        self.session_resumed = False
+        self.local_key = self.real_local_key
+        if self.dispatcher is not None:
+            self.dispatcher.local_key = self.real_local_key
+
     async def _negotiate_session_key(self):
         self.local_key = self.real_local_key
 
@@ -987,7 +1127,7 @@ class TuyaProtocol(asyncio.Protocol, ContextualLogger):
         payload = rkey.payload
         try:
             # self.debug("decrypting %r using %r", payload, self.real_local_key)
-            cipher = AESCipher(self.real_local_key)
+            cipher = self._cipher(self.real_local_key)
             payload = cipher.decrypt(payload, False, decode_text=False)
         except Exception as ex:
             self.debug(
@@ -1005,7 +1145,7 @@ class TuyaProtocol(asyncio.Protocol, ContextualLogger):
             return False
 
         self.remote_nonce = payload[:16]
-        hmac_check = hmac.new(self.local_key, self.local_nonce, sha256).digest()
+        hmac_check = hmac_digest(self.local_key, self.local_nonce)
 
         if hmac_check != payload[16:48]:
             self.debug(
@@ -1015,7 +1155,7 @@ class TuyaProtocol(asyncio.Protocol, ContextualLogger):
             )
 
         # self.debug("session local nonce: %r remote nonce: %r", self.local_nonce, self.remote_nonce)
-        rkey_hmac = hmac.new(self.local_key, self.remote_nonce, sha256).digest()
+        rkey_hmac = hmac_digest(self.local_key, self.remote_nonce)
         await self.exchange_quick(MessagePayload(SESS_KEY_NEG_FINISH, rkey_hmac), None)
 
         self.local_key = bytes(
@@ -1023,34 +1163,40 @@ class TuyaProtocol(asyncio.Protocol, ContextualLogger):
         )
         # self.debug("Session nonce XOR'd: %r" % self.local_key)
 
-        cipher = AESCipher(self.real_local_key)
+        cipher = self._cipher(self.real_local_key)
         self.local_key = self.dispatcher.local_key = cipher.encrypt(
             self.local_key, False, pad=False
         )
         self.debug("Session key negotiate success! session key: %r", self.local_key)
+        if self.session_resume:
+            session_keys[self.id] = (
+                self.real_local_key,
+                self.local_key,
+                time.monotonic(),
+            )
         return True
 
     # adds protocol header (if needed) and encrypts
     def _encode_message(self, msg):
         hmac_key = None
         payload = msg.payload
-        self.cipher = AESCipher(self.local_key)
+        cipher = self._cipher(self.local_key)
         if self.version == 3.4:
             hmac_key = self.local_key
             if msg.cmd not in NO_PROTOCOL_HEADER_CMDS:
                 # add the 3.x header
                 payload = self.version_header + payload
             self.debug("final payload for cmd %r: %r", msg.cmd, payload)
-            payload = self.cipher.encrypt(payload, False)
+            payload = cipher.encrypt(payload, False)
         elif self.version >= 3.2:
             # expect to connect and then disconnect to set new
-            payload = self.cipher.encrypt(payload, False)
+            payload = cipher.encrypt(payload, False)
             if msg.cmd not in NO_PROTOCOL_HEADER_CMDS:
                 # add the 3.x header
                 payload = self.version_header + payload
         elif msg.cmd == CONTROL:
             # need to encrypt
-            payload = self.cipher.encrypt(payload)
+            payload = cipher.encrypt(payload)
             preMd5String = (
                 b"data="
                 + payload
@@ -1069,7 +1215,6 @@ class TuyaProtocol(asyncio.Protocol, ContextualLogger):
                 + payload
             )
 
-        self.cipher = None
         msg = TuyaMessage(self.seqno, msg.cmd, 0, payload, 0, True)
         self.seqno += 1  # increase message sequence number
         buffer = pack_message(msg, hmac_key=hmac_key)
@@ -1175,6 +1320,7 @@ async def connect(
     listener=None,
     port=6668,
     timeout=5,
+    session_resume=False,
 ):
     """Connect to a device."""
     loop = asyncio.get_running_loop()
@@ -1187,6 +1333,7 @@ async def connect(
             enable_debug,
             on_connected,
             listener or EmptyListener(),
+            session_resume,
         ),
         address,
         port,
@@ -0,0 +1,157 @@
+"""Rate limited reconnect scheduling for Tuya devices."""
+import asyncio
+import bisect
+import logging
+import random
+import time
+
+from homeassistant.core import callback
+
+from .const import DOMAIN, TUYA_DEVICES
+
+_LOGGER = logging.getLogger(__name__)
+
+# Maximum number of devices connecting at the same time
+MAX_CONCURRENT_CONNECTS = 4
+
+# Delay before retrying a failed device, doubled on every failure
+BACKOFF_BASE = 30
+BACKOFF_MAX = 600
+BACKOFF_JITTER = 0.2
+
+# Upper bounds of the histogram buckets, anything above goes in the last one
+LATENCY_BUCKETS = [0.5, 1, 2, 5, 10, 30]
+ATTEMPT_BUCKETS = [1, 2, 3, 5, 10]
+
+ATTR_ATTEMPTS = "attempts"
+ATTR_FAILURES = "failures"
+ATTR_LAST_LATENCY = "last_latency"
+ATTR_LATENCY_HISTOGRAM = "latency_histogram"
+ATTR_ATTEMPT_HISTOGRAM = "attempt_histogram"
+ATTR_NEXT_ATTEMPT_IN = "next_attempt_in"
+
+
+def _histogram_labels(buckets):
+    """Return labels for histogram buckets."""
+    return [f"<={bound}" for bound in buckets] + [f">{buckets[-1]}"]
+
+
+class _DeviceState:
+    """Reconnect bookkeeping for a single device."""
+
+    def __init__(self):
+        """Initialize a new _DeviceState."""
+        self.attempts = 0
+        self.failures = 0
+        self.next_attempt = 0.0
+        self.last_latency = None
+        self.latency_histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.attempt_histogram = [0] * (len(ATTEMPT_BUCKETS) + 1)
+
+
+class ReconnectScheduler:
+    """Reconnect devices with backoff and a cap on concurrent connections.
+
+    Devices are queued in order of request, except for devices seen in a
+    discovery broadcast, which skip their backoff and go to the front.
+    """
+
+    def __init__(self, hass, max_concurrent=MAX_CONCURRENT_CONNECTS):
+        """Initialize a new ReconnectScheduler."""
+        self._hass = hass
+        self._max_concurrent = max_concurrent
+        self._active = 0
+        self._queue = []
+        self._connecting = set()
+        self._states = {}
+
+    def _state(self, dev_id):
+        if dev_id not in self._states:
+            self._states[dev_id] = _DeviceState()
+        return self._states[dev_id]
+
+    @callback
+    def async_request(self, dev_id, discovered=False):
+        """Queue a device for (re)connection."""
+        state = self._state(dev_id)
+        if dev_id in self._connecting:
+            return
+
+        if discovered:
+            # Device is known to be reachable, connect as soon as possible
+            if dev_id in self._queue:
+                self._queue.remove(dev_id)
+            self._queue.insert(0, dev_id)
+        elif dev_id not in self._queue and time.monotonic() >= state.next_attempt:
+            self._queue.append(dev_id)
+        self._start_connections()
+
+    @callback
+    def _start_connections(self):
+        while self._queue and self._active < self._max_concurrent:
+            dev_id = self._queue.pop(0)
+            self._active += 1
+            self._connecting.add(dev_id)
+            self._hass.async_create_task(self._async_connect(dev_id))
+
+    async def _async_connect(self, dev_id):
+        """Connect a device and update its backoff and statistics."""
+        try:
+            device = self._hass.data[DOMAIN][TUYA_DEVICES].get(dev_id)
+            if device is None or device.connected:
+                return
+
+            task = device.async_connect()
+            if task is None:
+                return
+
+            state = self._state(dev_id)
+            state.attempts += 1
+            start = time.monotonic()
+            # Don't propagate cancellation of the connect task itself
+            await asyncio.wait([task])
+            latency = time.monotonic() - start
+
+            if device.connected:
+                state.last_latency = round(latency, 3)
+                bucket = bisect.bisect_left(LATENCY_BUCKETS, latency)
+                state.latency_histogram[bucket] += 1
+                state.attempt_histogram[
+                    bisect.bisect_left(ATTEMPT_BUCKETS, state.failures + 1)
+                ] += 1
+                state.failures = 0
+                state.next_attempt = 0.0
+            else:
+                state.failures += 1
+                delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (state.failures - 1))
+                delay *= random.uniform(1 - BACKOFF_JITTER, 1 + BACKOFF_JITTER)
+                state.next_attempt = time.monotonic() + delay
+                _LOGGER.debug(
+                    "Connecting to %s failed %d time(s), next attempt in %.0fs",
+                    dev_id,
+                    state.failures,
+                    delay,
+                )
+        finally:
+            self._active -= 1
+            self._connecting.discard(dev_id)
+            self._start_connections()
+
+    def stats(self, dev_id):
+        """Return reconnect statistics for a device."""
+        state = self._states.get(dev_id)
+        if state is None:
+            return {}
+
+        return {
+            ATTR_ATTEMPTS: state.attempts,
+            ATTR_FAILURES: state.failures,
+            ATTR_LAST_LATENCY: state.last_latency,
+            ATTR_NEXT_ATTEMPT_IN: max(0, round(state.next_attempt - time.monotonic())),
+            ATTR_LATENCY_HISTOGRAM: dict(
+                zip(_histogram_labels(LATENCY_BUCKETS), state.latency_histogram)
+            ),
+            ATTR_ATTEMPT_HISTOGRAM: dict(
+                zip(_histogram_labels(ATTEMPT_BUCKETS), state.attempt_histogram)
+            ),
+        }
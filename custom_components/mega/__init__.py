@@ -189,19 +189,27 @@ async def get_hub(hass, entry):
     data.update(entry.options or {})
     data.update(id=id)
     hub = MegaD(hass, config=entry, **data, lg=_LOGGER, loop=asyncio.get_event_loop())
-    hub.mqtt_id = await hub.get_mqtt_id()
+    try:
+        hub.mqtt_id = await hub.get_mqtt_id()
+    except BaseException:
+        await hub.stop()
+        raise
     return hub
 
 
 async def _add_mega(hass: HomeAssistant, entry: ConfigEntry):
     id = entry.data.get('id', entry.entry_id)
     hub = await get_hub(hass, entry)
-    hub.fw = await hub.get_fw()
-    hass.data[DOMAIN][id] = hub
-    hass.data[DOMAIN][CONF_ALL][id] = hub
-    if not await hub.authenticate():
-        raise Exception("not authentificated")
-    mid = await hub.get_mqtt_id()
+    try:
+        hub.fw = await hub.get_fw()
+        hass.data[DOMAIN][id] = hub
+        hass.data[DOMAIN][CONF_ALL][id] = hub
+        if not await hub.authenticate():
+            raise Exception("not authentificated")
+        mid = await hub.get_mqtt_id()
+    except BaseException:
+        await hub.stop()
+        raise
     hub.mqtt_id = mid
     return hub
 
@@ -263,9 +271,11 @@ async def async_migrate_entry(hass, config_entry: ConfigEntry):
     _LOGGER.debug("Migrating from version %s to version %s", config_entry.version, ConfigFlow.VERSION)
     hub = await get_hub(hass, config_entry)
     new = dict(config_entry.data)
-    await hub.start()
-    cfg = await hub.get_config()
-    await hub.stop()
+    try:
+        await hub.start()
+        cfg = await hub.get_config()
+    finally:
+        await hub.stop()
     new.update(cfg)
     _LOGGER.debug(f'new config: %s', new)
     config_entry.data = new
@@ -10,7 +10,7 @@ from homeassistant.const import CONF_HOST, CONF_ID, CONF_PASSWORD, CONF_SCAN_INT
 from homeassistant.core import callback, HomeAssistant
 from .const import DOMAIN, CONF_RELOAD, \
     CONF_NPORTS, CONF_UPDATE_ALL, CONF_POLL_OUTS, CONF_FAKE_RESPONSE, CONF_FORCE_D, \
-    CONF_ALLOW_HOSTS, CONF_PROTECTED, CONF_RESTORE_ON_RESTART, CONF_UPDATE_TIME
+    CONF_ALLOW_HOSTS, CONF_PROTECTED, CONF_RESTORE_ON_RESTART, CONF_UPDATE_TIME, CONF_I2C_INTERVAL, CONF_EXT_INTERVAL
 from .hub import MegaD
 from . import exceptions
 
@@ -42,9 +42,14 @@ async def get_hub(hass: HomeAssistant, data):
     # if not isinstance(_mqtt, mqtt.MQTT):
     #     raise exceptions.MqttNotConfigured("mqtt must be configured first")
     hub = MegaD(hass, **data, lg=_LOGGER, loop=asyncio.get_event_loop()) #mqtt=_mqtt,
-    hub.mqtt_id = await hub.get_mqtt_id()
-    if not await hub.authenticate():
-        raise exceptions.InvalidAuth
+    try:
+        hub.mqtt_id = await hub.get_mqtt_id()
+        if not await hub.authenticate():
+            raise exceptions.InvalidAuth
+    except BaseException:
+        # hub won't be used, close its http session
+        await hub.stop()
+        raise
     return hub
 
 
@@ -77,10 +82,12 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         try:
             hub = await validate_input(self.hass, user_input)
-            await hub.start()
-            hub.new_naming=True
-            config = await hub.get_config(nports=user_input.get(CONF_NPORTS, 37))
-            await hub.stop()
+            try:
+                await hub.start()
+                hub.new_naming=True
+                config = await hub.get_config(nports=user_input.get(CONF_NPORTS, 37))
+            finally:
+                await hub.stop()
             hub.lg.debug(f'config loaded: %s', config)
             config.update(user_input)
             config['new_naming'] = True
@@ -122,7 +129,8 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             cfg.update(user_input)
             cfg['new_naming'] = new_naming
             self.config_entry.data = cfg
-            await get_hub(self.hass, cfg)
+            hub = await get_hub(self.hass, cfg)
+            await hub.stop()
 
             if reload:
                 id = self.config_entry.data.get('id', self.config_entry.entry_id)
@@ -150,6 +158,8 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 vol.Optional(CONF_PROTECTED, default=e.get(CONF_PROTECTED, True)): bool,
                 vol.Optional(CONF_ALLOW_HOSTS, default='::1;127.0.0.1'): str,
                 vol.Optional(CONF_UPDATE_TIME, default=e.get(CONF_UPDATE_TIME, False)): bool,
+                vol.Optional(CONF_I2C_INTERVAL, default=e.get(CONF_I2C_INTERVAL, 0)): int,
+                vol.Optional(CONF_EXT_INTERVAL, default=e.get(CONF_EXT_INTERVAL, 0)): int,
                 # vol.Optional(CONF_INVERT, default=''): str,
             }),
         )
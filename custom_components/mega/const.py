@@ -37,6 +37,8 @@ CONF_CLICK_TIME = 'click_time'
 CONF_LONG_TIME = 'long_time'
 CONF_FORCE_I2C_SCAN = 'force_i2c_scan'
 CONF_UPDATE_TIME = 'update_time'
+CONF_I2C_INTERVAL = 'i2c_interval'
+CONF_EXT_INTERVAL = 'ext_interval'
 CONF_HEX_TO_FLOAT = 'hex_to_float'
 CONF_LED = 'led'
 CONF_WS28XX = 'ws28xx'
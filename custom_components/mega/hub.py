@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import time
 from collections import defaultdict
 from datetime import datetime, timedelta
 
@@ -35,7 +36,7 @@ from .const import (
 from .entities import set_events_off, BaseMegaEntity, MegaOutPort, safe_int
 from .exceptions import CannotConnect, NoPort
 from .i2c import parse_scan_page
-from .tools import make_ints, int_ignore, PriorityLock
+from .tools import make_ints, int_ignore, PrioritySemaphore, gather_all
 
 TEMP_PATT = re.compile(r"temp:([01234567890\.]+)")
 HUM_PATT = re.compile(r"hum:([01234567890\.]+)")
@@ -49,6 +50,13 @@ CLASSES = {
     PRESS: SensorDeviceClass.PRESSURE,
     LUX: SensorDeviceClass.ILLUMINANCE,
 }
+# mega serves http from a single-threaded loop with a few sockets, so keep only a couple of
+# connections open to it
+HTTP_CONNECTIONS = 2
+HTTP_KEEPALIVE = 10
+# i2c sensors and extenders are read after ports in the poll queue, commands from entities (priority=-1)
+# still go first
+POLL_SLOW_PRIORITY = 1
 I2C_DEVICE_TYPES = {
     "2": LUX,  # BH1750
     "3": LUX,  # TSL2591
@@ -87,6 +95,8 @@ class MegaD:
         new_naming=False,
         update_time=False,
         smooth: list = None,
+        i2c_interval=None,
+        ext_interval=None,
         **kwargs,
     ):
         """Initialize."""
@@ -120,13 +130,18 @@ class MegaD:
         self.id = id
         self.lck = asyncio.Lock()
         self.last_long = {}
-        self._http_lck = PriorityLock()
+        self._http_lck = PrioritySemaphore(HTTP_CONNECTIONS)
+        self._session: aiohttp.ClientSession = None
         self._notif_lck = asyncio.Lock()
         self.cnd = asyncio.Condition()
         self.online = True
         self.entities: typing.List[BaseMegaEntity] = []
         self.ds2413_ports = set()
         self.poll_interval = scan_interval
+        # i2c sensors and extenders are slow to read, they can be polled less often than ports
+        self.i2c_interval = i2c_interval
+        self.ext_interval = ext_interval
+        self._next_poll = {}
         self.subs = None
         self.lg: logging.Logger = lg.getChild(self.id)
         self._scanned = {}
@@ -177,6 +192,22 @@ class MegaD:
             self.subs()
         for x in self._callbacks.values():
             x.clear()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """
+        Общая сессия хаба, соединения с мегой переиспользуются между запросами
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=HTTP_CONNECTIONS, keepalive_timeout=HTTP_KEEPALIVE
+                )
+            )
+        return self._session
 
     async def add_entity(self, ent):
         async with self.lck:
@@ -184,17 +215,22 @@ class MegaD:
 
     async def get_sensors(self, only_list=False):
         self.lg.debug(self.sensors)
-        ports = []
+        ports = {}
         for x in self.sensors:
             if only_list and x.http_cmd != "list":
                 continue
-            if x.port in ports:
-                continue
-            try:
-                await self.get_port(x.port, force_http=True, http_cmd=x.http_cmd)
-            except asyncio.TimeoutError:
-                continue
-            ports.append(x.port)
+            ports.setdefault(x.port, x.http_cmd)
+        await gather_all(
+            *[self._poll_port(port, http_cmd) for port, http_cmd in ports.items()]
+        )
+
+    async def _poll_port(self, port, http_cmd, conv=True):
+        try:
+            await self.get_port(
+                port=port, force_http=True, http_cmd=http_cmd, conv=conv
+            )
+        except asyncio.TimeoutError:
+            pass
 
     @property
     def customize(self):
@@ -240,45 +276,68 @@ class MegaD:
         обновление ds2413 устройств
         :return:
         """
-        for x in self.ds2413_ports:
-            self.lg.debug(f"poll ds2413 for %s", x)
-            try:
-                await self.get_port(
-                    port=x, force_http=True, http_cmd="list", conv=False
-                )
-            except asyncio.TimeoutError:
-                continue
+        self.lg.debug(f"poll ds2413 for %s", self.ds2413_ports)
+        await gather_all(
+            *[self._poll_port(x, "list", conv=False) for x in self.ds2413_ports]
+        )
 
-    async def poll(self):
+    def _poll_due(self, kind, interval):
         """
-        Polling ports
+        Проверяет, пора ли опрашивать группу kind, interval=None или 0 - опрашивать при каждом poll
         """
-        self.lg.debug("poll")
-        if self._update_time:
-            await self.update_time()
-        for x in self.i2c_sensors:
-            if not isinstance(x, dict):
-                continue
-            ret = await self._update_i2c(x)
+        if not interval:
+            return True
+        now = time.monotonic()
+        if now < self._next_poll.get(kind, 0):
+            return False
+        self._next_poll[kind] = now + interval
+        return True
+
+    async def _poll_i2c(self, sensors):
+        # sensors on one bus are read in order: some of them need a measure request and a delay before the read
+        for x in sensors:
+            ret = await self._update_i2c(x, priority=POLL_SLOW_PRIORITY)
             if isinstance(ret, dict):
                 self.values.update(ret)
 
-        for x in self.extenders:
-            ret = await self._update_extender(x)
-            if not isinstance(ret, dict):
-                self.lg.warning(f"wrong updater result: {ret} from extender {x}")
-                continue
-            self.values.update(ret)
+    async def _poll_extender(self, port):
+        ret = await self._update_extender(port, priority=POLL_SLOW_PRIORITY)
+        if not isinstance(ret, dict):
+            self.lg.warning(f"wrong updater result: {ret} from extender {port}")
+            return
+        self.values.update(ret)
 
+    async def _poll_ports(self):
+        # list-sensors must overwrite values from cmd=all, so they are read after it
         await self.get_all_ports()
         await self.get_sensors(only_list=True)
-        await self._get_ds2413()
+
+    async def poll(self):
+        """
+        Polling ports
+
+        Independent reads run concurrently, the number of simultaneous requests is limited by
+        HTTP_CONNECTIONS in request
+        """
+        self.lg.debug("poll")
+        # 1-wire conversion waits a second before the read, so this chain goes first and slow
+        # i2c/extender reads fill that pause
+        jobs = [self._poll_ports(), self._get_ds2413()]
+        if self._update_time:
+            jobs.append(self.update_time())
+        if self._poll_due("i2c", self.i2c_interval):
+            buses = defaultdict(list)
+            for x in self.i2c_sensors:
+                if isinstance(x, dict):
+                    buses[x.get("pt")].append(x)
+            jobs.extend(self._poll_i2c(x) for x in buses.values())
+        if self._poll_due("ext", self.ext_interval):
+            jobs.extend(self._poll_extender(x) for x in self.extenders)
+        await gather_all(*jobs)
         return self.values
 
     async def get_mqtt_id(self):
-        async with aiohttp.request(
-            "get", f"http://{self.host}/{self.sec}/?cf=2"
-        ) as req:
+        async with self.session.get(f"http://{self.host}/{self.sec}/?cf=2") as req:
             data = await req.text(encoding="iso-8859-5")
             data = BeautifulSoup(data, features="lxml")
             _id = data.find(attrs={"name": "mdid"})
@@ -302,8 +361,8 @@ class MegaD:
         async with self._http_lck(priority):
             for _ntry in range(3):
                 try:
-                    async with aiohttp.request(
-                        "get", url=url, timeout=aiohttp.ClientTimeout(total=5)
+                    async with self.session.get(
+                        url, timeout=aiohttp.ClientTimeout(total=5)
                     ) as req:
                         if req.status != 200:
                             self.lg.warning(
@@ -321,6 +380,12 @@ class MegaD:
                     self.lg.warning(f"timeout while requesting {url}")
                     # raise
                     await asyncio.sleep(1)
+                except aiohttp.ClientConnectorError:
+                    # mega is unreachable, not a dropped keep-alive connection
+                    raise
+                except (aiohttp.ServerDisconnectedError, aiohttp.ClientOSError):
+                    # mega closed the keep-alive connection, retry with a new one
+                    self.lg.debug("connection closed while requesting %s", url)
             raise asyncio.TimeoutError("after 3 tries")
 
     async def save(self):
@@ -440,7 +505,7 @@ class MegaD:
 
     async def authenticate(self) -> bool:
         """Test if we can authenticate with the host."""
-        async with aiohttp.request("get", url=f"http://{self.host}/{self.sec}") as req:
+        async with self.session.get(f"http://{self.host}/{self.sec}") as req:
             if "Unauthorized" in await req.text(encoding="iso-8859-5"):
                 return False
             else:
@@ -451,7 +516,7 @@ class MegaD:
     async def get_port_page(self, port):
         url = f"http://{self.host}/{self.sec}/?pt={port}"
         self.lg.debug(f"get page for port {port} {url}")
-        async with aiohttp.request("get", url) as req:
+        async with self.session.get(url) as req:
             return await req.text(encoding="iso-8859-5")
 
     async def scan_port(self, port):
@@ -465,14 +530,15 @@ class MegaD:
                 yield x, ret
         self.nports = nports + 1
 
-    async def _update_extender(self, port):
+    async def _update_extender(self, port, priority=0):
         """
         Обновление mcp230, так же подходит для PCA9685
         :param port:
+        :param priority: приоритет http-запроса
         :return:
         """
         try:
-            values = await self.request(pt=port, cmd="get")
+            values = await self.request(pt=port, cmd="get", priority=priority)
         except asyncio.TimeoutError:
             return
         ret = {}
@@ -480,10 +546,11 @@ class MegaD:
             ret[f"{port}e{i}"] = x
         return ret
 
-    async def _update_i2c(self, params):
+    async def _update_i2c(self, params, priority=0):
         """
         Обновление портов i2c
         :param params: параметры url
+        :param priority: приоритет http-запроса
         :return:
         """
         pt = params.get("pt")
@@ -496,7 +563,7 @@ class MegaD:
         if "delay" in params:
             delay = params.pop("delay")
         try:
-            ret = {_params: await self.request(**params)}
+            ret = {_params: await self.request(**params, priority=priority)}
         except asyncio.TimeoutError:
             return
         self.lg.debug("i2c response: %s", ret)
@@ -1,6 +1,6 @@
 import asyncio
 import itertools
-from heapq import heappush
+from heapq import heapify, heappop, heappush
 from contextlib import asynccontextmanager
 
 
@@ -121,6 +121,76 @@ class PriorityLock(asyncio.Lock):
             fut.set_result(True)
 
 
+class PrioritySemaphore:
+    """
+    Same as PriorityLock, but allows up to `value` holders at the same time, so several requests can run concurrently
+    while requests with higher priority (lower number) are still served first
+    >>> sem = PrioritySemaphore(2)
+    ... async with sem(-1):
+    ...     # do something
+    """
+    def __init__(self, value=1):
+        self._value = value
+        self._waiters = []
+        self._cnt = itertools.count()
+
+    def __call__(self, priority=0):
+        return self._with_priority(priority)
+
+    @asynccontextmanager
+    async def _with_priority(self, p):
+        await self.acquire(p)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def locked(self) -> bool:
+        return self._value == 0
+
+    async def acquire(self, priority=0) -> bool:
+        if self._value > 0 and not self._waiters:
+            self._value -= 1
+            return True
+
+        fut = asyncio.get_running_loop().create_future()
+        item = (priority, next(self._cnt), fut)
+        heappush(self._waiters, item)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.cancelled():
+                if item in self._waiters:
+                    self._waiters.remove(item)
+                    heapify(self._waiters)
+            else:
+                # slot was already handed to us, pass it to the next waiter
+                self.release()
+            raise
+        return True
+
+    def release(self):
+        """Hand the slot to the first waiter or return it to the semaphore."""
+        while self._waiters:
+            _, _, fut = heappop(self._waiters)
+            if not fut.done():
+                fut.set_result(True)
+                return
+        self._value += 1
+
+
+async def gather_all(*aws):
+    """
+    Same as asyncio.gather, but waits until all awaitables are done before raising the first error, so none of them
+    keeps running unobserved after the caller has failed
+    """
+    ret = await asyncio.gather(*aws, return_exceptions=True)
+    for x in ret:
+        if isinstance(x, BaseException):
+            raise x
+    return ret
+
+
 def map_reorder_rgb(rgb: list, from_: str, to_: str):
     if from_ == to_:
         return rgb
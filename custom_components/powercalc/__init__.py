@@ -48,6 +48,7 @@ from .const import (
     CONF_ENERGY_SENSOR_UNIT_PREFIX,
     CONF_FIXED,
     CONF_FORCE_UPDATE_FREQUENCY,
+    CONF_GROUP_POWER_UPDATE_INTERVAL,
     CONF_GROUP_UPDATE_INTERVAL,
     CONF_IGNORE_UNAVAILABLE_STATE,
     CONF_INCLUDE,
@@ -72,6 +73,8 @@ from .const import (
     DATA_DOMAIN_ENTITIES,
     DATA_ENTITIES,
     DATA_GROUP_ENTITIES,
+    DATA_GROUP_GRAPH,
+    DATA_POWER_COORDINATOR,
     DATA_STANDBY_POWER_SENSORS,
     DATA_USED_UNIQUE_IDS,
     DEFAULT_ENERGY_INTEGRATION_METHOD,
@@ -79,6 +82,7 @@ from .const import (
     DEFAULT_ENERGY_SENSOR_PRECISION,
     DEFAULT_ENERGY_UNIT_PREFIX,
     DEFAULT_ENTITY_CATEGORY,
+    DEFAULT_GROUP_POWER_UPDATE_INTERVAL,
     DEFAULT_GROUP_UPDATE_INTERVAL,
     DEFAULT_POWER_NAME_PATTERN,
     DEFAULT_POWER_SENSOR_PRECISION,
@@ -106,6 +110,8 @@ from .sensors.group.config_entry_utils import (
     remove_group_from_power_sensor_entry,
     remove_power_sensor_from_associated_groups,
 )
+from .sensors.group.graph import GroupGraph
+from .sensors.power_coordinator import PowerCalculationCoordinator
 from .service.gui_configuration import SERVICE_SCHEMA, change_gui_configuration
 
 PLATFORMS = [Platform.SENSOR]
@@ -129,6 +135,10 @@ CONFIG_SCHEMA = vol.Schema(
                         CONF_GROUP_UPDATE_INTERVAL,
                         default=DEFAULT_GROUP_UPDATE_INTERVAL,
                     ): cv.positive_int,
+                    vol.Optional(
+                        CONF_GROUP_POWER_UPDATE_INTERVAL,
+                        default=DEFAULT_GROUP_POWER_UPDATE_INTERVAL,
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0)),
                     vol.Optional(
                         CONF_POWER_SENSOR_NAMING,
                         default=DEFAULT_POWER_NAME_PATTERN,
@@ -235,9 +245,11 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         DATA_CONFIGURED_ENTITIES: {},
         DATA_DOMAIN_ENTITIES: {},
         DATA_GROUP_ENTITIES: {},
+        DATA_GROUP_GRAPH: GroupGraph(hass),
         DATA_ENTITIES: {},
         DATA_USED_UNIQUE_IDS: [],
         DATA_STANDBY_POWER_SENSORS: {},
+        DATA_POWER_COORDINATOR: PowerCalculationCoordinator(hass),
     }
 
     await register_services(hass)
@@ -279,6 +291,7 @@ def get_global_configuration(hass: HomeAssistant, config: ConfigType) -> ConfigT
         CONF_ENERGY_SENSOR_UNIT_PREFIX: DEFAULT_ENERGY_UNIT_PREFIX,
         CONF_FORCE_UPDATE_FREQUENCY: DEFAULT_UPDATE_FREQUENCY,
         CONF_GROUP_UPDATE_INTERVAL: DEFAULT_GROUP_UPDATE_INTERVAL,
+        CONF_GROUP_POWER_UPDATE_INTERVAL: DEFAULT_GROUP_POWER_UPDATE_INTERVAL,
         CONF_DISABLE_EXTENDED_ATTRIBUTES: False,
         CONF_IGNORE_UNAVAILABLE_STATE: False,
         CONF_CREATE_DOMAIN_GROUPS: [],
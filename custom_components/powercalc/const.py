@@ -26,6 +26,8 @@ DATA_DISCOVERY_MANAGER = "discovery_manager"
 DATA_DOMAIN_ENTITIES = "domain_entities"
 DATA_ENTITIES = "entities"
 DATA_GROUP_ENTITIES = "group_entities"
+DATA_GROUP_GRAPH = "group_graph"
+DATA_POWER_COORDINATOR = "power_coordinator"
 DATA_USED_UNIQUE_IDS = "used_unique_ids"
 DATA_STANDBY_POWER_SENSORS = "standby_power_sensors"
 
@@ -80,6 +82,7 @@ CONF_GROUP_TRACKED_AUTO = "group_tracked_auto"
 CONF_GROUP_TRACKED_POWER_ENTITIES = "group_tracked_entities"
 CONF_GROUP_TYPE = "group_type"
 CONF_GROUP_UPDATE_INTERVAL = "group_update_interval"
+CONF_GROUP_POWER_UPDATE_INTERVAL = "group_power_update_interval"
 CONF_HIDE_MEMBERS = "hide_members"
 CONF_IGNORE_UNAVAILABLE_STATE = "ignore_unavailable_state"
 CONF_INCLUDE = "include"
@@ -166,6 +169,7 @@ ENTITY_CATEGORIES = [
 ]
 
 DEFAULT_GROUP_UPDATE_INTERVAL = 60
+DEFAULT_GROUP_POWER_UPDATE_INTERVAL = 0
 DEFAULT_UPDATE_FREQUENCY = timedelta(minutes=10)
 DEFAULT_POWER_NAME_PATTERN = "{} power"
 DEFAULT_POWER_SENSOR_PRECISION = 2
@@ -3,6 +3,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
 from custom_components.powercalc import CONF_SENSOR_TYPE, SensorType
+from custom_components.powercalc.const import DATA_GROUP_GRAPH, DOMAIN
 from custom_components.powercalc.sensors.group.custom import resolve_entity_ids_recursively
 
 
@@ -17,5 +18,6 @@ async def async_get_config_entry_diagnostics(
     if entry.data.get(CONF_SENSOR_TYPE) == SensorType.GROUP:
         data["power_entities"] = await resolve_entity_ids_recursively(hass, entry, SensorDeviceClass.POWER)
         data["energy_entities"] = await resolve_entity_ids_recursively(hass, entry, SensorDeviceClass.ENERGY)
+        data["group_graph"] = hass.data[DOMAIN][DATA_GROUP_GRAPH].as_dict()
 
     return data
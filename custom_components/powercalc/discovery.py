@@ -12,10 +12,10 @@ from homeassistant.components.light import DOMAIN as LIGHT_DOMAIN
 from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
 from homeassistant.config_entries import SOURCE_INTEGRATION_DISCOVERY, SOURCE_USER, ConfigEntry
 from homeassistant.const import CONF_ENTITY_ID, CONF_PLATFORM, CONF_UNIQUE_ID
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
 from homeassistant.helpers import discovery_flow
 from homeassistant.helpers.entity import EntityCategory
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
 from homeassistant.helpers.typing import ConfigType
 
 from .common import SourceEntity, create_source_entity
@@ -40,6 +40,12 @@ from .power_profile.power_profile import SUPPORTED_DOMAINS, DeviceType, Discover
 
 _LOGGER = logging.getLogger(__name__)
 
+# Registry changes arrive in bursts (e.g. an integration adding all its entities), wait a bit so they are handled in one pass
+REDISCOVERY_DELAY = 10
+
+# Device registry changes which can alter the outcome of discovery
+DEVICE_DISCOVERY_FIELDS = {"manufacturer", "model", "model_id", "disabled_by"}
+
 
 async def get_power_profile_by_source_entity(hass: HomeAssistant, source_entity: SourceEntity) -> PowerProfile | None:
     """Given a certain entity, lookup the manufacturer and model and return the power profile."""
@@ -69,10 +75,16 @@ class DiscoveryManager:
         self.hass = hass
         self.ha_config = ha_config
         self.power_profiles: dict[str, PowerProfile | None] = {}
-        self.manually_configured_entities: list[str] | None = None
+        self.manually_configured_entities: set[str] | None = None
         self.initialized_flows: set[str] = set()
         self.library: ProfileLibrary | None = None
         self._exclude_device_types = exclude_device_types or []
+        self._entity_filter = self._create_entity_filter()
+        self._gui_configured_entities: set[str] = set()
+        self._power_profile_cache: dict[tuple[ModelInfo, DiscoveryBy], list[PowerProfile] | None] = {}
+        self._pending_sources: dict[DiscoveryBy, set[str]] = {DiscoveryBy.ENTITY: set(), DiscoveryBy.DEVICE: set()}
+        self._unmatched_sources: dict[DiscoveryBy, set[str]] = {DiscoveryBy.ENTITY: set(), DiscoveryBy.DEVICE: set()}
+        self._rediscovery_timer: CALLBACK_TYPE | None = None
 
     async def setup(self) -> None:
         """Setup the discovery manager. Start initial discovery and setup interval based rediscovery."""
@@ -88,15 +100,27 @@ class DiscoveryManager:
             timedelta(hours=2),
         )
 
+        self.hass.bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, self._handle_entity_registry_updated)
+        self.hass.bus.async_listen(dr.EVENT_DEVICE_REGISTRY_UPDATED, self._handle_device_registry_updated)
+
     async def update_library_and_rediscover(self) -> None:
-        """Update the library and rediscover entities."""
+        """Update the library and rediscover entities.
+        Only sources for which no power profile could be found previously are checked again, as an updated library can now contain their model.
+        """
         library = await self._get_library()
         await library.initialize()
-        await self.start_discovery()
+        self._power_profile_cache.clear()
+        for discovery_type, unmatched in self._unmatched_sources.items():
+            self._pending_sources[discovery_type].update(unmatched)
+            unmatched.clear()
+        await self.initialize_existing_entries()
+        await self.discover_pending()
 
     async def start_discovery(self) -> None:
-        """Start the discovery procedure."""
+        """Start the discovery procedure, checking all entities and devices in the registries."""
         await self.initialize_existing_entries()
+        for pending in self._pending_sources.values():
+            pending.clear()
 
         _LOGGER.debug("Start auto discovery")
 
@@ -108,6 +132,59 @@ class DiscoveryManager:
 
         _LOGGER.debug("Done auto discovery")
 
+    async def discover_pending(self) -> None:
+        """Run discovery only for the entities and devices which have been added or changed since the last run."""
+        if not any(self._pending_sources.values()):
+            return
+
+        _LOGGER.debug("Start incremental auto discovery")
+        await self.perform_discovery(self.get_pending_entities, self.create_entity_source, DiscoveryBy.ENTITY)  # type: ignore[arg-type]
+        await self.perform_discovery(self.get_pending_devices, self.create_device_source, DiscoveryBy.DEVICE)  # type: ignore[arg-type]
+        _LOGGER.debug("Done incremental auto discovery")
+
+    @callback
+    def _handle_entity_registry_updated(self, event: Event[er.EventEntityRegistryUpdatedData]) -> None:
+        """Queue created and updated entities for discovery."""
+        entity_id = event.data["entity_id"]
+        if event.data["action"] == "remove":
+            self._pending_sources[DiscoveryBy.ENTITY].discard(entity_id)
+            self._unmatched_sources[DiscoveryBy.ENTITY].discard(entity_id)
+            return
+
+        self._pending_sources[DiscoveryBy.ENTITY].add(entity_id)
+        self._schedule_rediscovery()
+
+    @callback
+    def _handle_device_registry_updated(self, event: Event[dr.EventDeviceRegistryUpdatedData]) -> None:
+        """Queue created and updated devices, and the entities belonging to them, for discovery."""
+        device_id = event.data["device_id"]
+        action = event.data["action"]
+        if action == "remove":
+            self._pending_sources[DiscoveryBy.DEVICE].discard(device_id)
+            self._unmatched_sources[DiscoveryBy.DEVICE].discard(device_id)
+            return
+
+        if action == "update" and not DEVICE_DISCOVERY_FIELDS.intersection(event.data.get("changes", {})):  # type: ignore[arg-type]
+            return
+
+        self._pending_sources[DiscoveryBy.DEVICE].add(device_id)
+        entity_registry = er.async_get(self.hass)
+        self._pending_sources[DiscoveryBy.ENTITY].update(entry.entity_id for entry in er.async_entries_for_device(entity_registry, device_id))
+        self._schedule_rediscovery()
+
+    @callback
+    def _schedule_rediscovery(self) -> None:
+        """Schedule a discovery run for the pending sources, unless one is scheduled already."""
+        if self._rediscovery_timer:
+            return
+
+        @callback
+        def _rediscover_pending(_: Any) -> None:  # noqa: ANN401
+            self._rediscovery_timer = None
+            self.hass.async_create_task(self.discover_pending())
+
+        self._rediscovery_timer = async_call_later(self.hass, REDISCOVERY_DELAY, _rediscover_pending)
+
     async def initialize_existing_entries(self) -> None:
         """Build a list of config entries which are already setup, to prevent duplicate discovery flows"""
         for entry in self.hass.config_entries.async_entries(DOMAIN):
@@ -125,12 +202,16 @@ class DiscoveryManager:
             self.initialized_flows.add(entity_id)
 
     def remove_initialized_flow(self, entry: ConfigEntry) -> None:
-        """Remove a flow from the initialized flows."""
+        """Remove a flow from the initialized flows, so the source can be discovered again."""
         if entry.unique_id:
             self.initialized_flows.discard(entry.unique_id)
+            if entry.unique_id.startswith("pc_"):
+                self._pending_sources[DiscoveryBy.DEVICE].add(entry.unique_id[3:])
         entity_id = entry.data.get(CONF_ENTITY_ID)
         if entity_id:
             self.initialized_flows.discard(entity_id)
+            if entity_id != DUMMY_ENTITY_ID:
+                self._pending_sources[DiscoveryBy.ENTITY].add(entity_id)
 
     async def perform_discovery(
         self,
@@ -139,8 +220,11 @@ class DiscoveryManager:
         discovery_type: DiscoveryBy,
     ) -> None:
         """Generalized discovery procedure for entities and devices."""
+        self._gui_configured_entities = self._load_gui_configured_entities()
+        unmatched_sources = self._unmatched_sources[discovery_type]
         for source in await source_provider():
             log_identifier = source.entity_id if discovery_type == DiscoveryBy.ENTITY else source.id
+            unmatched_sources.discard(log_identifier)
             try:
                 model_info = await self.extract_model_info_from_device_info(source)
                 if not model_info:
@@ -151,6 +235,7 @@ class DiscoveryManager:
                 power_profiles = await self.discover_entity(source_entity, model_info, discovery_type)
                 if not power_profiles:
                     _LOGGER.debug("%s: Model not found in library, skipping discovery", log_identifier)
+                    unmatched_sources.add(log_identifier)
                     continue
 
                 unique_id = self.create_unique_id(
@@ -220,21 +305,38 @@ class DiscoveryManager:
         source_entity: SourceEntity,
         discovery_type: DiscoveryBy,
     ) -> list[PowerProfile] | None:
-        """Find power profiles for a given entity."""
+        """Find power profiles for a given entity.
+        The library lookup is cached per model, so identical devices are only resolved once.
+        """
+        cache_key = (model_info, discovery_type)
+        if cache_key not in self._power_profile_cache:
+            self._power_profile_cache[cache_key] = await self._load_power_profiles(model_info, discovery_type)
+
+        profiles = self._power_profile_cache[cache_key]
+        if profiles is None:
+            return None
+
+        return [
+            profile.clone()
+            for profile in profiles
+            if discovery_type != DiscoveryBy.ENTITY
+            or profile.is_entity_domain_supported(
+                source_entity.entity_entry,  # type: ignore[arg-type]
+            )
+        ]
+
+    async def _load_power_profiles(self, model_info: ModelInfo, discovery_type: DiscoveryBy) -> list[PowerProfile] | None:
+        """Load all power profiles from the library matching the model."""
         library = await self._get_library()
         models = await library.find_models(model_info)
         if not models:
             return None
 
         power_profiles = []
-        for model_info in models:
-            profile = await get_power_profile(self.hass, {}, model_info=model_info, process_variables=False)
+        for model in models:
+            profile = await get_power_profile(self.hass, {}, model_info=model, process_variables=False)
             if not profile or profile.discovery_by != discovery_type:  # pragma: no cover
                 continue
-            if discovery_type == DiscoveryBy.ENTITY and not profile.is_entity_domain_supported(
-                source_entity.entity_entry,  # type: ignore[arg-type]
-            ):
-                continue
             if profile.device_type in self._exclude_device_types:
                 continue
             power_profiles.append(profile)
@@ -275,6 +377,19 @@ class DiscoveryManager:
 
     async def get_entities(self) -> list[er.RegistryEntry]:
         """Get all entities from entity registry which qualifies for discovery."""
+        return await get_filtered_entity_list(self.hass, self._entity_filter)
+
+    async def get_pending_entities(self) -> list[er.RegistryEntry]:
+        """Get the entities added or changed since the last discovery run, which qualify for discovery."""
+        entity_ids = self._pending_sources[DiscoveryBy.ENTITY]
+        self._pending_sources[DiscoveryBy.ENTITY] = set()
+
+        entity_registry = er.async_get(self.hass)
+        entries = [entity_registry.async_get(entity_id) for entity_id in entity_ids]
+        return [entry for entry in entries if entry and not entry.disabled and self._entity_filter.is_valid(entry)]
+
+    def _create_entity_filter(self) -> NotFilter:
+        """Create the filter deciding which entities qualify for discovery."""
 
         def _check_already_configured(entity: er.RegistryEntry) -> bool:
             has_user_config = self._is_user_configured(entity.entity_id)
@@ -301,12 +416,20 @@ class DiscoveryManager:
             ],
             FilterOperator.OR,
         )
-        return await get_filtered_entity_list(self.hass, NotFilter(entity_filter))
+        return NotFilter(entity_filter)
 
     async def get_devices(self) -> list:
         """Fetch device entries."""
         return list(dr.async_get(self.hass).devices.values())
 
+    async def get_pending_devices(self) -> list:
+        """Fetch the device entries added or changed since the last discovery run."""
+        device_ids = self._pending_sources[DiscoveryBy.DEVICE]
+        self._pending_sources[DiscoveryBy.DEVICE] = set()
+
+        device_registry = dr.async_get(self.hass)
+        return [device for device_id in device_ids if (device := device_registry.async_get(device_id))]
+
     async def extract_model_info_from_device_info(
         self,
         entry: er.RegistryEntry | dr.DeviceEntry | None,
@@ -423,14 +546,16 @@ class DiscoveryManager:
         """Check if user have setup powercalc sensors for a given entity_id.
         Either with the YAML or GUI method.
         """
-        if not self.manually_configured_entities:
+        if self.manually_configured_entities is None:
             self.manually_configured_entities = self._load_manually_configured_entities()
 
-        return entity_id in self.manually_configured_entities
+        return entity_id in self.manually_configured_entities or entity_id in self._gui_configured_entities
 
-    def _load_manually_configured_entities(self) -> list[str]:
-        """Looks at the YAML and GUI config entries for all the configured entity_id's."""
-        entities = []
+    def _load_manually_configured_entities(self) -> set[str]:
+        """Looks at the YAML config for all the configured entity_id's.
+        YAML config can only change with a restart of HA, so this only needs to be done once.
+        """
+        entities: list[str] = []
 
         # Find entity ids in yaml config (Legacy)
         if SENSOR_DOMAIN in self.ha_config:  # pragma: no cover
@@ -446,12 +571,11 @@ class DiscoveryManager:
             for sensor_config in sensors:
                 entities.extend(self._find_entity_ids_in_yaml_config(sensor_config))
 
-        # Add entities from existing config entries
-        entities.extend(
-            [str(entry.data.get(CONF_ENTITY_ID)) for entry in self.hass.config_entries.async_entries(DOMAIN) if entry.source == SOURCE_USER],
-        )
+        return set(entities)
 
-        return entities
+    def _load_gui_configured_entities(self) -> set[str]:
+        """Looks at the GUI config entries for all the configured entity_id's."""
+        return {str(entry.data.get(CONF_ENTITY_ID)) for entry in self.hass.config_entries.async_entries(DOMAIN) if entry.source == SOURCE_USER}
 
     def _find_entity_ids_in_yaml_config(self, search_dict: dict) -> list[str]:
         """Takes a dict with nested lists and dicts,
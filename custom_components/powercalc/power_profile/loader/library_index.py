@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import marshal
+import mmap
+import os
+import struct
+import sys
+from dataclasses import dataclass, fields
+from typing import TYPE_CHECKING, Any
+
+from custom_components.powercalc.power_profile.power_profile import DeviceType
+
+if TYPE_CHECKING:
+    from .remote import LibraryModel
+
+_LOGGER = logging.getLogger(__name__)
+
+INDEX_FILE = "library.idx"
+INDEX_MAGIC = b"PCLI"
+# Bump whenever the layout of LibraryIndex changes
+INDEX_VERSION = 1
+# magic, index version, python major/minor (marshal format is python version specific), sha256 of library.json
+HEADER = struct.Struct("<4sHBB32s")
+
+DEVICE_TYPE_BITS: dict[str, int] = {device_type.value: 1 << bit for bit, device_type in enumerate(DeviceType)}
+
+
+def device_type_mask(device_types: Any) -> int:  # noqa: ANN401
+    """Return bitset of one or more device types, unknown types are ignored."""
+    if device_types is None:
+        return 0
+    if isinstance(device_types, str):
+        device_types = [device_types]
+    mask = 0
+    for device_type in device_types:
+        mask |= DEVICE_TYPE_BITS.get(str(device_type), 0)
+    return mask
+
+
+def library_hash(library_json: bytes) -> bytes:
+    return hashlib.sha256(library_json).digest()
+
+
+@dataclass
+class LibraryIndex:
+    """Precompiled lookup structures of library.json.
+
+    Stored as a single file with a fixed size header, so a stale index is detected by only reading the header.
+    """
+
+    library_hash: bytes
+    # (dir_name, full_name, device type bitset)
+    manufacturers: list[tuple[str, str, int]]
+    # manufacturer name or alias (lower case) -> manufacturer dir names
+    manufacturer_lookup: dict[str, set[str]]
+    # manufacturer/model -> model info
+    model_infos: dict[str, LibraryModel]
+    manufacturer_models: dict[str, list[LibraryModel]]
+    # manufacturer -> model id or alias (lower case) -> model infos
+    model_lookup: dict[str, dict[str, list[LibraryModel]]]
+    # manufacturer -> model id -> device type bitset
+    model_device_types: dict[str, dict[str, int]]
+
+    @classmethod
+    def build(cls, library: dict[str, Any], library_hash: bytes) -> LibraryIndex:
+        """Build the index from the contents of library.json."""
+        index = cls(library_hash, [], {}, {}, {}, {}, {})
+        for manufacturer in library.get("manufacturers", []):
+            manufacturer_name = str(manufacturer.get("dir_name"))
+            models: list[LibraryModel] = manufacturer.get("models", [])
+
+            index.manufacturers.append(
+                (manufacturer_name, str(manufacturer.get("full_name")), device_type_mask(manufacturer.get("device_types", []))),
+            )
+            index.model_infos.update({f"{manufacturer_name}/{model.get('id')!s}": model for model in models})
+            index.manufacturer_models[manufacturer_name] = models
+
+            model_lookup: dict[str, list[LibraryModel]] = {}
+            model_device_types: dict[str, int] = {}
+            for model in models:
+                model_id = str(model.get("id"))
+                model_lookup.setdefault(model_id.lower(), []).append(model)
+                for alias in model.get("aliases", []):
+                    model_lookup.setdefault(alias.lower(), []).append(model)
+                model_device_types[model_id] = device_type_mask(model.get("device_type", DeviceType.LIGHT))
+            index.model_lookup[manufacturer_name] = model_lookup
+            index.model_device_types[manufacturer_name] = model_device_types
+
+            index.manufacturer_lookup[manufacturer_name.lower()] = {manufacturer_name}
+            for alias in manufacturer.get("aliases", []):
+                index.manufacturer_lookup.setdefault(alias.lower(), set()).add(manufacturer_name)
+        return index
+
+    @classmethod
+    def load(cls, path: str, library_hash: bytes) -> LibraryIndex | None:
+        """Load the index from disk, returns None when it is missing, outdated or corrupt."""
+        try:
+            with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if len(data) < HEADER.size:
+                    return None
+                magic, version, major, minor, stored_hash = HEADER.unpack_from(data)
+                if (magic, version, major, minor, stored_hash) != (INDEX_MAGIC, INDEX_VERSION, *sys.version_info[:2], library_hash):
+                    return None
+                index_data = marshal.loads(data[HEADER.size :])
+        except (OSError, ValueError, EOFError, TypeError) as err:
+            _LOGGER.debug("Could not load library index %s: %s", path, err)
+            return None
+
+        try:
+            return cls(library_hash=library_hash, **index_data)
+        except TypeError:
+            return None
+
+    def save(self, path: str) -> None:
+        """Write the index to disk, failures are not fatal as the index can always be rebuilt."""
+        # Not dataclasses.asdict, which copies the model infos shared between the lookups
+        data = {field.name: getattr(self, field.name) for field in fields(self) if field.name != "library_hash"}
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "wb") as file:
+                file.write(HEADER.pack(INDEX_MAGIC, INDEX_VERSION, *sys.version_info[:2], self.library_hash))
+                file.write(marshal.dumps(data))
+            os.replace(tmp_path, path)
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Could not save library index %s: %s", path, err)
@@ -15,6 +15,7 @@ from homeassistant.helpers.storage import STORAGE_DIR
 
 from custom_components.powercalc.helpers import async_cache
 from custom_components.powercalc.power_profile.error import LibraryLoadingError, ProfileDownloadError
+from custom_components.powercalc.power_profile.loader.library_index import INDEX_FILE, LibraryIndex, device_type_mask, library_hash
 from custom_components.powercalc.power_profile.loader.protocol import Loader
 from custom_components.powercalc.power_profile.power_profile import DeviceType
 
@@ -45,61 +46,57 @@ class RemoteLoader(Loader):
 
     def __init__(self, hass: HomeAssistant) -> None:
         self.hass = hass
-        self.library_contents: dict = {}
+        self.manufacturers: list[tuple[str, str, int]] = []
         self.model_infos: dict[str, LibraryModel] = {}
         self.manufacturer_models: dict[str, list[LibraryModel]] = {}
         self.model_lookup: dict[str, dict[str, list[LibraryModel]]] = {}
         self.manufacturer_lookup: dict[str, set[str]] = {}
+        self.model_device_types: dict[str, dict[str, int]] = {}
         self.profile_hashes: dict[str, str] = {}
 
     async def initialize(self) -> None:
         """Initialize the loader."""
-        self.library_contents = await self.load_library_json()
+        library_json = await self.load_library_json()
         self.profile_hashes = await self.hass.async_add_executor_job(self.load_profile_hashes)
+        index = await self.hass.async_add_executor_job(self.load_library_index, library_json)
+
+        self.manufacturers = index.manufacturers
+        self.model_infos = index.model_infos
+        self.manufacturer_models = index.manufacturer_models
+        self.model_lookup = index.model_lookup
+        self.manufacturer_lookup = index.manufacturer_lookup
+        self.model_device_types = index.model_device_types
+
+    def load_library_index(self, library_json: bytes) -> LibraryIndex:
+        """Load the precompiled library index, only parsing library.json and rebuilding the index when the library changed."""
+        index_path = self.hass.config.path(STORAGE_DIR, "powercalc_profiles", INDEX_FILE)
+        json_hash = library_hash(library_json)
+        index = LibraryIndex.load(index_path, json_hash)
+        if index is not None:
+            return index
+
+        _LOGGER.debug("Library changed, rebuilding library index")
+        try:
+            library = json.loads(library_json)
+        except JSONDecodeError as err:
+            raise LibraryLoadingError("library.json is not valid JSON") from err
+        index = LibraryIndex.build(library, json_hash)
+        index.save(index_path)
+        return index
 
-        self.model_infos.clear()
-        self.model_lookup.clear()
-        self.manufacturer_models.clear()
-        self.manufacturer_lookup.clear()
-
-        # Load contents of library JSON into several dictionaries for easy access
-        manufacturers: list[LibraryManufacturer] = self.library_contents.get("manufacturers", [])
-
-        for manufacturer in manufacturers:
-            manufacturer_name = str(manufacturer.get("dir_name"))
-            models = manufacturer.get("models", [])
-
-            # Store model info and group models by manufacturer
-            self.model_infos.update({f"{manufacturer_name}/{model.get('id')!s}": model for model in models})
-            self.manufacturer_models[manufacturer_name] = models
-
-            model_lookup: dict[str, list[LibraryModel]] = {}
-            for model in models:
-                model_id = str(model.get("id")).lower()
-                model_lookup.setdefault(model_id, []).append(model)
-                for alias in model.get("aliases", []):
-                    model_lookup.setdefault(alias.lower(), []).append(model)
-
-            self.model_lookup[manufacturer_name] = model_lookup
-
-            # Map manufacturer aliases
-            self.manufacturer_lookup[manufacturer_name.lower()] = {manufacturer_name}
-            for alias in manufacturer.get("aliases", []):
-                self.manufacturer_lookup.setdefault(alias.lower(), set()).add(manufacturer_name)
-
-    async def load_library_json(self) -> dict[str, Any]:
-        """Load library.json file"""
+    async def load_library_json(self) -> bytes:
+        """Load raw contents of library.json file"""
 
         local_path = self.hass.config.path(STORAGE_DIR, "powercalc_profiles", "library.json")
 
-        def _load_local_library_json() -> dict[str, Any]:
+        def _load_local_library_json() -> bytes:
             """Load library.json file from local storage"""
             if not os.path.exists(local_path):
                 raise ProfileDownloadError("Local library.json file not found")
-            with open(local_path) as f:
-                return cast(dict[str, Any], json.load(f))
+            with open(local_path, "rb") as f:
+                return f.read()
 
-        async def _download_remote_library_json() -> dict[str, Any] | None:
+        async def _download_remote_library_json() -> bytes | None:
             """
             Download library.json from Github.
             If download is successful, save it to local storage to use as fallback in case of internet connection issues.
@@ -115,14 +112,14 @@ class RemoteLoader(Loader):
                     with open(local_path, "wb") as f:
                         f.write(data)
 
-                json_data = cast(dict[str, Any], await resp.json())
+                json_data = await resp.read()
 
-                await self.hass.async_add_executor_job(_save_to_local_storage, await resp.read())
+                await self.hass.async_add_executor_job(_save_to_local_storage, json_data)
 
                 return json_data
 
         try:
-            return cast(dict[str, Any], await self.download_with_retry(_download_remote_library_json))
+            return cast(bytes, await self.download_with_retry(_download_remote_library_json))
         except ProfileDownloadError:
             _LOGGER.debug("Failed to download library.json, falling back to local copy")
             return await self.hass.async_add_executor_job(_load_local_library_json)
@@ -131,11 +128,8 @@ class RemoteLoader(Loader):
     async def get_manufacturer_listing(self, device_types: set[DeviceType] | None) -> set[tuple[str, str]]:
         """Get listing of available manufacturers."""
 
-        return {
-            (manufacturer["dir_name"], manufacturer["full_name"])
-            for manufacturer in self.library_contents.get("manufacturers", [])
-            if not device_types or any(device_type in manufacturer.get("device_types", []) for device_type in device_types)
-        }
+        mask = device_type_mask(device_types)
+        return {(dir_name, full_name) for dir_name, full_name, manufacturer_mask in self.manufacturers if not device_types or manufacturer_mask & mask}
 
     @async_cache
     async def find_manufacturers(self, search: str) -> set[str]:
@@ -146,15 +140,12 @@ class RemoteLoader(Loader):
     async def get_model_listing(self, manufacturer: str, device_types: set[DeviceType] | None) -> set[str]:
         """Get listing of available models for a given manufacturer."""
 
-        models = self.manufacturer_models.get(manufacturer)
+        models = self.model_device_types.get(manufacturer)
         if not models:
             return set()
 
-        return {
-            model["id"]
-            for model in self.manufacturer_models.get(manufacturer, [])
-            if not device_types or any(device_type in model.get("device_type", [DeviceType.LIGHT]) for device_type in device_types)
-        }
+        mask = device_type_mask(device_types)
+        return {model_id for model_id, model_mask in models.items() if not device_types or model_mask & mask}
 
     @async_cache
     async def find_model(self, manufacturer: str, search: set[str]) -> set[str]:
@@ -247,7 +238,7 @@ class RemoteLoader(Loader):
         """Retrieve the storage path for a given manufacturer and model."""
         return str(self.hass.config.path(STORAGE_DIR, "powercalc_profiles", manufacturer, model))
 
-    async def download_with_retry(self, callback: Callable[[], Coroutine[Any, Any, None | dict[str, Any]]]) -> None | dict[str, Any]:
+    async def download_with_retry(self, callback: Callable[[], Coroutine[Any, Any, None | bytes]]) -> None | bytes:
         """Download a file from a remote endpoint with retries"""
         max_retries = 3
         retry_count = 0
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import copy
 import json
 import logging
 import os
@@ -119,6 +120,12 @@ class PowerProfile:
         self._sub_profile_dir: str | None = None
         self._sub_profiles: list[tuple[str, dict]] | None = None
 
+    def clone(self) -> PowerProfile:
+        """Create an independent copy of this profile, so a sub profile can be selected without affecting the original."""
+        profile = copy.copy(self)
+        profile._json_data = self._json_data.copy()
+        return profile
+
     def get_model_directory(self, root_only: bool = False) -> str:
         """Get the model directory containing the data files."""
         if root_only:
@@ -4,8 +4,9 @@ import logging
 import time
 from abc import abstractmethod
 from collections.abc import Callable
-from datetime import timedelta
+from datetime import datetime, timedelta
 from decimal import Decimal, DecimalException
+from functools import lru_cache
 from typing import Any
 
 from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
@@ -31,6 +32,7 @@ from homeassistant.const import (
     UnitOfPower,
 )
 from homeassistant.core import (
+    CALLBACK_TYPE,
     Event,
     HomeAssistant,
     State,
@@ -42,6 +44,7 @@ from homeassistant.helpers import start
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.event import (
     EventStateChangedData,
+    async_call_later,
     async_track_state_change_event,
     async_track_time_interval,
 )
@@ -71,6 +74,7 @@ from custom_components.powercalc.const import (
     CONF_GROUP_MEMBER_DEVICES,
     CONF_GROUP_MEMBER_SENSORS,
     CONF_GROUP_POWER_ENTITIES,
+    CONF_GROUP_POWER_UPDATE_INTERVAL,
     CONF_GROUP_TYPE,
     CONF_HIDE_MEMBERS,
     CONF_IGNORE_UNAVAILABLE_STATE,
@@ -80,7 +84,9 @@ from custom_components.powercalc.const import (
     CONF_SUB_GROUPS,
     CONF_UTILITY_METER_NET_CONSUMPTION,
     DATA_DOMAIN_ENTITIES,
+    DATA_GROUP_GRAPH,
     DEFAULT_ENERGY_SENSOR_PRECISION,
+    DEFAULT_GROUP_POWER_UPDATE_INTERVAL,
     DEFAULT_POWER_SENSOR_PRECISION,
     DOMAIN,
     ENTRY_DATA_ENERGY_ENTITY,
@@ -104,6 +110,8 @@ from custom_components.powercalc.sensors.energy import EnergySensor, VirtualEner
 from custom_components.powercalc.sensors.power import PowerSensor
 from custom_components.powercalc.sensors.utility_meter import create_utility_meters
 
+from .graph import GroupGraph
+
 ENTITY_ID_FORMAT = SENSOR_DOMAIN + ".{}"
 
 _LOGGER = logging.getLogger(__name__)
@@ -123,6 +131,15 @@ UNIT_CONVERTERS: dict[str | None, type[BaseUnitConverter]] = {
     **dict.fromkeys(PowerConverter.VALID_UNITS, PowerConverter),
 }
 
+# Number of member updates after which the running total of a power group is summed again from scratch
+POWER_GROUP_RESUM_INTERVAL = 1000
+
+
+@lru_cache(maxsize=64)
+def get_unit_converter(from_unit: str, to_unit: str | None) -> Callable[[float], float]:
+    """Get (cached) conversion function between two units."""
+    return UNIT_CONVERTERS[from_unit].converter_factory(from_unit, to_unit)
+
 
 async def create_group_sensors_yaml(
     hass: HomeAssistant,
@@ -443,6 +460,11 @@ class GroupedSensor(BaseEntity, RestoreSensor, SensorEntity):
         self._start_time: float = time.time()
         self._last_update_time: float = 0
         self._update_interval: int = int(self._sensor_config.get(CONF_GROUP_UPDATE_INTERVAL, 60))
+        self._power_update_interval = float(self._sensor_config.get(CONF_GROUP_POWER_UPDATE_INTERVAL) or DEFAULT_GROUP_POWER_UPDATE_INTERVAL)
+        self._delayed_write: CALLBACK_TYPE | None = None
+        self._group_graph: GroupGraph = hass.data[DOMAIN][DATA_GROUP_GRAPH]
+        self._pending_state: Decimal | str | None = None
+        self._applied_member_states: dict[str, State] = {}
 
     async def async_added_to_hass(self) -> None:
         """Register state listeners."""
@@ -463,6 +485,9 @@ class GroupedSensor(BaseEntity, RestoreSensor, SensorEntity):
         """
         if self._sensor_config.get(CONF_HIDE_MEMBERS) is True:
             self._async_hide_members(False)
+        if self._delayed_write:
+            self._delayed_write()
+            self._delayed_write = None
 
     @callback
     def _async_hide_members(self, hide: bool) -> None:
@@ -487,8 +512,27 @@ class GroupedSensor(BaseEntity, RestoreSensor, SensorEntity):
         if not new_state:  # pragma: no cover
             return
         _LOGGER.debug("Group sensor %s. State change for %s: %s", self.entity_id, new_state.entity_id, new_state)
-        calculated_new_state = self.calculate_new_state(new_state)
-        self.set_new_state(calculated_new_state)
+        if self.async_apply_member_state(new_state):
+            self._group_graph.async_schedule(self)
+
+    @callback
+    def async_apply_member_state(self, state: State) -> bool:
+        """Calculate the new group state for a member state change, the state is written later by the group graph.
+        Member groups pass on their state directly, so the same state can also arrive via the state change event, which is skipped.
+        """
+        if self._applied_member_states.get(state.entity_id) is state:
+            return False
+        self._applied_member_states[state.entity_id] = state
+        self._pending_state = self.calculate_new_state(state)
+        return True
+
+    @callback
+    def async_write_pending_state(self) -> None:
+        """Write the group state calculated from the member changes since the last write."""
+        if self._pending_state is None:
+            return
+        state, self._pending_state = self._pending_state, None
+        self.set_new_state(state)
 
     async def init_domain_group(self) -> None:
         if self._group_type != GroupType.DOMAIN:
@@ -523,6 +567,8 @@ class GroupedSensor(BaseEntity, RestoreSensor, SensorEntity):
                 self.on_state_change,
             ),
         )
+        self._group_graph.async_register(self, self._entities)
+        self.async_on_remove(lambda: self._group_graph.async_unregister(self.entity_id))
 
         if not self._sensor_config.get(CONF_DISABLE_EXTENDED_ATTRIBUTES, False):
             self._attr_extra_state_attributes = {
@@ -558,10 +604,36 @@ class GroupedSensor(BaseEntity, RestoreSensor, SensorEntity):
         if should_throttle and current_time - self._last_update_time < self._update_interval:
             write_state = False
         self._attr_available = True
+        if not self._is_energy_sensor and self._power_update_interval:
+            self._set_native_value(state, write_state=False)
+            self._async_write_throttled(current_time)
+            return
         self._set_native_value(state, write_state=write_state)
         if should_throttle and write_state:
             self._last_update_time = current_time
 
+    @callback
+    def _async_write_throttled(self, current_time: float) -> None:
+        """Write the state at most once per power update interval.
+        Changes within the interval are written together at the end of it, so the last value is never lost.
+        """
+        if self._delayed_write:
+            return
+
+        remaining = self._last_update_time + self._power_update_interval - current_time
+        if remaining <= 0:
+            self._last_update_time = current_time
+            self.async_write_ha_state()
+            return
+
+        @callback
+        def _write_delayed(_: datetime) -> None:
+            self._delayed_write = None
+            self._last_update_time = time.time()
+            self.async_write_ha_state()
+
+        self._delayed_write = async_call_later(self.hass, remaining, _write_delayed)
+
     def _should_throttle(self, current_time: float) -> bool:
         if self._update_interval == 0:
             return False
@@ -576,8 +648,7 @@ class GroupedSensor(BaseEntity, RestoreSensor, SensorEntity):
         value = state.state
         unit_of_measurement = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
         if unit_of_measurement and self._attr_native_unit_of_measurement != unit_of_measurement:
-            converter = UNIT_CONVERTERS[unit_of_measurement]
-            convert = converter.converter_factory(unit_of_measurement, self._attr_native_unit_of_measurement)
+            convert = get_unit_converter(unit_of_measurement, self._attr_native_unit_of_measurement)
             value = str(convert(float(value)))
         try:
             return Decimal(value)
@@ -627,29 +698,66 @@ class GroupedPowerSensor(GroupedSensor, PowerSensor):
     _attr_native_unit_of_measurement = UnitOfPower.WATT
     _is_energy_sensor = False
 
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        name: str,
+        entities: set[str],
+        entity_id: str,
+        sensor_config: dict[str, Any],
+        group_type: GroupType,
+        unique_id: str | None = None,
+        device_id: str | None = None,
+    ) -> None:
+        super().__init__(
+            hass,
+            name,
+            entities,
+            entity_id,
+            sensor_config,
+            group_type,
+            unique_id,
+            device_id,
+        )
+        self._states_sum = Decimal(0)
+        self._updates_since_resum = 0
+
     def calculate_initial_state(
         self,
         member_available_states: list[State],
         member_states: list[State],
     ) -> Decimal | str:
         self._states = {state.entity_id: self._get_state_value_in_native_unit(state) for state in member_available_states}
+        self._resum_states()
         return self.get_summed_state()
 
     def calculate_new_state(self, state: State) -> Decimal | str:
-        if state.state in [STATE_UNKNOWN, STATE_UNAVAILABLE]:
-            if state.entity_id in self._states:
-                del self._states[state.entity_id]
-        else:
-            self._states[state.entity_id] = self._get_state_value_in_native_unit(state)
+        """Adjust the running total by the difference of the changed member, instead of summing all members again."""
+        previous_value = self._states.pop(state.entity_id, None)
+        if previous_value is not None:
+            self._states_sum -= previous_value
+        if state.state not in [STATE_UNKNOWN, STATE_UNAVAILABLE]:
+            value = self._get_state_value_in_native_unit(state)
+            self._states[state.entity_id] = value
+            self._states_sum += value
+
+        self._updates_since_resum += 1
+        if not self._states or self._updates_since_resum >= POWER_GROUP_RESUM_INTERVAL:
+            # Prevent rounding errors from accumulating in the running total
+            self._resum_states()
         return self.get_summed_state()
 
+    def _resum_states(self) -> None:
+        self._states_sum = Decimal(sum(self._states.values()))
+        self._updates_since_resum = 0
+
     def get_summed_state(self) -> Decimal | str:
         if not self._states:
             if self._ignore_unavailable_state:
                 return Decimal(0)
             return STATE_UNAVAILABLE
 
-        return Decimal(sum(self._states.values()))
+        return self._states_sum
 
 
 class GroupedEnergySensor(GroupedSensor, EnergySensor):
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import heapq
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+
+if TYPE_CHECKING:
+    from .custom import GroupedSensor
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_MEMBER_GROUPS = "member_groups"
+ATTR_PARENTS = "parents"
+ATTR_RANK = "rank"
+ATTR_UPDATES = "updates"
+ATTR_UPDATES_PER_MINUTE = "updates_per_minute"
+
+
+class GroupGraph:
+    """Dependency graph of all powercalc group sensors.
+
+    Group sensors can be members of other groups (nested YAML groups, domain groups, or groups including another group's sensor).
+    Member changes only mark a group dirty; all dirty groups are written once per event loop tick, in topological order,
+    children before parents. A written group directly passes its new state on to its parent groups,
+    so a leaf change reaches all ancestors in one pass instead of one state change event round trip per level.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._nodes: dict[str, GroupedSensor] = {}
+        self._members: dict[str, set[str]] = {}
+        self._parents: dict[str, set[str]] = {}
+        self._ranks: dict[str, int] | None = None
+        self._dirty: set[str] = set()
+        self._queue: list[tuple[int, str]] = []
+        self._flush_scheduled = False
+        self._updates: dict[str, int] = {}
+        self._registered_at: dict[str, float] = {}
+
+    @callback
+    def async_register(self, group: GroupedSensor, members: set[str]) -> None:
+        """Add or update a group sensor and its members."""
+        entity_id = group.entity_id
+        self.async_unregister(entity_id)
+        self._nodes[entity_id] = group
+        self._members[entity_id] = set(members)
+        for member in members:
+            self._parents.setdefault(member, set()).add(entity_id)
+        self._updates[entity_id] = 0
+        self._registered_at[entity_id] = time.monotonic()
+        self._ranks = None
+
+    @callback
+    def async_unregister(self, entity_id: str) -> None:
+        """Remove a group sensor from the graph."""
+        if self._nodes.pop(entity_id, None) is None:
+            return
+        for member in self._members.pop(entity_id, set()):
+            parents = self._parents.get(member)
+            if parents is None:
+                continue
+            parents.discard(entity_id)
+            if not parents:
+                del self._parents[member]
+        self._dirty.discard(entity_id)
+        self._updates.pop(entity_id, None)
+        self._registered_at.pop(entity_id, None)
+        self._ranks = None
+
+    @property
+    def ranks(self) -> dict[str, int]:
+        """Topological rank of each group, leaves only groups have rank 0, every group ranks above its member groups."""
+        if self._ranks is None:
+            ranks: dict[str, int] = {}
+            visiting: set[str] = set()
+
+            def _rank(entity_id: str) -> int:
+                if entity_id in ranks:
+                    return ranks[entity_id]
+                if entity_id in visiting:
+                    # Cyclic groups, break the cycle here
+                    _LOGGER.warning("Group %s is (indirectly) a member of itself", entity_id)
+                    return 0
+                visiting.add(entity_id)
+                member_groups = [member for member in self._members[entity_id] if member in self._nodes]
+                ranks[entity_id] = 1 + max(map(_rank, member_groups)) if member_groups else 0
+                visiting.discard(entity_id)
+                return ranks[entity_id]
+
+            for entity_id in self._nodes:
+                _rank(entity_id)
+            self._ranks = ranks
+        return self._ranks
+
+    @callback
+    def async_schedule(self, group: GroupedSensor) -> None:
+        """Mark a group dirty, it will be written in the next pass."""
+        entity_id = group.entity_id
+        if entity_id not in self._nodes:
+            group.async_write_pending_state()
+            return
+        if entity_id in self._dirty:
+            return
+        self._dirty.add(entity_id)
+        heapq.heappush(self._queue, (self.ranks.get(entity_id, 0), entity_id))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self._hass.loop.call_soon(self._async_flush)
+
+    @callback
+    def _async_flush(self) -> None:
+        """Write all dirty groups in topological order, passing the new states on to parent groups."""
+        while self._queue:
+            _, entity_id = heapq.heappop(self._queue)
+            if entity_id not in self._dirty:
+                continue
+            self._dirty.discard(entity_id)
+            group = self._nodes.get(entity_id)
+            if group is None:
+                continue
+
+            previous_state = self._hass.states.get(entity_id)
+            group.async_write_pending_state()
+            new_state = self._hass.states.get(entity_id)
+            if new_state is None or new_state is previous_state:
+                # Not written, i.e. throttled
+                continue
+            self._updates[entity_id] += 1
+
+            for parent_id in self._parents.get(entity_id, ()):
+                parent = self._nodes.get(parent_id)
+                if parent and parent.async_apply_member_state(new_state):
+                    self.async_schedule(parent)
+        self._flush_scheduled = False
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the graph with update statistics, for diagnostics."""
+        now = time.monotonic()
+        ranks = self.ranks
+        return {
+            entity_id: {
+                ATTR_RANK: ranks.get(entity_id, 0),
+                ATTR_MEMBER_GROUPS: sorted(member for member in self._members[entity_id] if member in self._nodes),
+                ATTR_PARENTS: sorted(self._parents.get(entity_id, ())),
+                ATTR_UPDATES: self._updates[entity_id],
+                ATTR_UPDATES_PER_MINUTE: round(self._updates[entity_id] * 60 / max(now - self._registered_at[entity_id], 1), 2),
+            }
+            for entity_id in sorted(self._nodes, key=lambda entity_id: (ranks.get(entity_id, 0), entity_id))
+        }
@@ -33,7 +33,6 @@ from homeassistant.core import (
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import issue_registry as ir
 from homeassistant.helpers import start
-from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.event import (
     EventStateChangedData,
@@ -73,12 +72,12 @@ from custom_components.powercalc.const import (
     CONF_STANDBY_POWER,
     CONF_UNAVAILABLE_POWER,
     DATA_DISCOVERY_MANAGER,
+    DATA_POWER_COORDINATOR,
     DATA_STANDBY_POWER_SENSORS,
     DEFAULT_POWER_SENSOR_PRECISION,
     DOMAIN,
     DUMMY_ENTITY_ID,
     OFF_STATES,
-    SIGNAL_POWER_SENSOR_STATE_CHANGE,
     CalculationStrategy,
 )
 from custom_components.powercalc.discovery import DiscoveryManager
@@ -107,6 +106,7 @@ from .abstract import (
     generate_power_sensor_entity_id,
     generate_power_sensor_name,
 )
+from .power_coordinator import PowerCalculationCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -388,6 +388,7 @@ class VirtualPowerSensor(SensorEntity, PowerSensor):
         if not self._ignore_unavailable_state and self._sensor_config.get(CONF_UNAVAILABLE_POWER) is not None:
             self._ignore_unavailable_state = True
         self._standby_sensors: dict = hass.data[DOMAIN][DATA_STANDBY_POWER_SENSORS]
+        self._coordinator: PowerCalculationCoordinator = hass.data[DOMAIN][DATA_POWER_COORDINATOR]
         self.calculation_strategy_factory = calculation_strategy_factory
         self._strategy_instance: PowerCalculationStrategyInterface | None = None
         self._availability_entity: str | None = sensor_config.get(CONF_AVAILABILITY_ENTITY)
@@ -414,22 +415,16 @@ class VirtualPowerSensor(SensorEntity, PowerSensor):
         assert self._strategy_instance is not None
         self.init_calculation_enabled_condition()
 
-        async def appliance_state_listener(event: Event[EventStateChangedData]) -> None:
+        @callback
+        def appliance_state_listener(event: Event[EventStateChangedData]) -> None:
             """Handle for state changes for dependent sensors."""
             new_state = event.data.get("new_state")
-            await self._handle_source_entity_state_change(
-                self._source_entity.entity_id,
-                new_state,
-            )
-            async_dispatcher_send(self.hass, SIGNAL_POWER_SENSOR_STATE_CHANGE)
+            self._coordinator.async_queue(self, self._source_entity.entity_id, new_state)
 
-        async def template_change_listener(*_: Any) -> None:  # noqa: ANN401
+        @callback
+        def template_change_listener(*_: Any) -> None:  # noqa: ANN401
             state = self.hass.states.get(self._source_entity.entity_id)
-            await self._handle_source_entity_state_change(
-                self._source_entity.entity_id,
-                state,
-            )
-            async_dispatcher_send(self.hass, SIGNAL_POWER_SENSOR_STATE_CHANGE)
+            self._coordinator.async_queue(self, self._source_entity.entity_id, state)
 
         async def initial_update(hass: HomeAssistant) -> None:
             """Calculate initial value and push state"""
@@ -446,11 +441,7 @@ class VirtualPowerSensor(SensorEntity, PowerSensor):
                 entities.add(DUMMY_ENTITY_ID)
             for entity_id in entities:
                 new_state = self.hass.states.get(entity_id) if entity_id != DUMMY_ENTITY_ID else State(entity_id, STATE_ON)
-                await self._handle_source_entity_state_change(
-                    entity_id,
-                    new_state,
-                )
-                async_dispatcher_send(self.hass, SIGNAL_POWER_SENSOR_STATE_CHANGE)
+                self._coordinator.async_queue(self, entity_id, new_state)
 
         """Add listeners and get initial state."""
         entities_to_track = self._get_tracking_entities()
@@ -482,6 +473,7 @@ class VirtualPowerSensor(SensorEntity, PowerSensor):
             )
 
         self.async_on_remove(start.async_at_start(self.hass, initial_update))
+        self.async_on_remove(lambda: self._coordinator.async_discard(self))
 
         if hasattr(self._strategy_instance, "set_update_callback"):
             self._strategy_instance.set_update_callback(self._update_power_sensor)
@@ -522,16 +514,27 @@ class VirtualPowerSensor(SensorEntity, PowerSensor):
         state: State | None,
     ) -> None:
         """Update power sensor based on new dependent entity state."""
-        self._standby_sensors.pop(self.entity_id, None)
-        if self._sleep_power_timer:
-            self._sleep_power_timer()
-            self._sleep_power_timer = None
+        await self.async_handle_source_entity_state_changes([(trigger_entity_id, state)])
 
+    async def async_handle_source_entity_state_changes(
+        self,
+        changes: list[tuple[str, State | None]],
+    ) -> None:
+        """Update power sensor based on dependent entity state changes, in order of occurrence.
+        All valid states are calculated in one batch, so strategies depending on multiple entities see every change,
+        but the sensor state is only written once, for the last change.
+        """
         discovery_by = self._power_profile.discovery_by if self._power_profile else DiscoveryBy.ENTITY
         if self.source_entity == DUMMY_ENTITY_ID and discovery_by == DiscoveryBy.ENTITY:
-            state = State(self.source_entity, STATE_ON)
+            changes = [(trigger_entity_id, State(self.source_entity, STATE_ON)) for trigger_entity_id, _ in changes]
 
+        trigger_entity_id, state = changes[-1]
+        valid_states = [change_state for _, change_state in changes if change_state and self._has_valid_state(change_state)]
         if not state or not self._has_valid_state(state):
+            if valid_states:
+                # Only for the side effects on the strategy, the result is discarded
+                await self.calculate_power_batch(valid_states)
+            self._reset_standby()
             _LOGGER.debug(
                 "%s: Source entity has an invalid state, setting power sensor to unavailable",
                 trigger_entity_id,
@@ -540,8 +543,9 @@ class VirtualPowerSensor(SensorEntity, PowerSensor):
             self.async_write_ha_state()
             return
 
+        self._reset_standby()
         await self._switch_sub_profile_dynamically(state)
-        self._power = await self.calculate_power(state)
+        self._power = (await self.calculate_power_batch(valid_states))[-1]
 
         if self._power is not None:
             self._power = round(self._power, self._rounding_digits)
@@ -555,6 +559,13 @@ class VirtualPowerSensor(SensorEntity, PowerSensor):
 
         self.async_write_ha_state()
 
+    def _reset_standby(self) -> None:
+        """Forget the standby power and pending sleep power of the previous state."""
+        self._standby_sensors.pop(self.entity_id, None)
+        if self._sleep_power_timer:
+            self._sleep_power_timer()
+            self._sleep_power_timer = None
+
     @callback
     def _update_power_sensor(self, power: Decimal) -> None:
         self._power = power
@@ -572,36 +583,68 @@ class VirtualPowerSensor(SensorEntity, PowerSensor):
 
     async def calculate_power(self, state: State) -> Decimal | None:
         """Calculate power consumption using configured strategy."""
+        return (await self.calculate_power_batch([state]))[0]
+
+    async def calculate_power_batch(self, states: list[State]) -> list[Decimal | None]:
+        """Calculate power consumption for multiple states, with the same results as calling calculate_power for each state in turn.
+        Consecutive states needing the strategy are calculated with one calculate_batch call.
+        """
         assert self._strategy_instance is not None
 
-        # Resolve the relevant entity state
-        entity_state = state
-        if (
-            self._calculation_strategy != CalculationStrategy.MULTI_SWITCH
-            and self._source_entity.entity_id != DUMMY_ENTITY_ID
-            and state.entity_id != self._source_entity.entity_id
-            and (entity_state := self.hass.states.get(self._source_entity.entity_id)) is None
-        ):
-            return None
+        results: list[Decimal | None] = [None] * len(states)
+        pending: list[tuple[int, State, Decimal | None]] = []
+
+        async def _calculate_pending() -> None:
+            if not pending:
+                return
+            assert self._strategy_instance is not None
+            if len(pending) == 1:
+                # Vectorized strategies only pay off for several states, the single state path is much cheaper
+                powers = [await self._strategy_instance.calculate(pending[0][1])]
+            else:
+                powers = await self._strategy_instance.calculate_batch([entity_state for _, entity_state, _ in pending])
+            for (index, _, standby_power), power in zip(pending, powers, strict=True):
+                results[index] = self._adjust_power(power, standby_power)
+            pending.clear()
 
-        # Handle unavailable power
         unavailable_power = self._sensor_config.get(CONF_UNAVAILABLE_POWER)
-        if entity_state.state == STATE_UNAVAILABLE and unavailable_power is not None:
-            return Decimal(unavailable_power)
-
-        # Handle standby power
-        standby_power = None
-        if entity_state.state in OFF_STATES or not await self.is_calculation_enabled():
-            if isinstance(self._strategy_instance, PlaybookStrategy):
-                await self._strategy_instance.stop_playbook()
-            standby_power = await self.calculate_standby_power(entity_state)
-            self._standby_sensors[self.entity_id] = standby_power
-
-            if self._strategy_instance.can_calculate_standby() or self._calculation_strategy != CalculationStrategy.MULTI_SWITCH:
-                return standby_power
+        for index, state in enumerate(states):
+            # Resolve the relevant entity state
+            entity_state = state
+            if (
+                self._calculation_strategy != CalculationStrategy.MULTI_SWITCH
+                and self._source_entity.entity_id != DUMMY_ENTITY_ID
+                and state.entity_id != self._source_entity.entity_id
+                and (entity_state := self.hass.states.get(self._source_entity.entity_id)) is None
+            ):
+                continue
+
+            # Handle unavailable power
+            if entity_state.state == STATE_UNAVAILABLE and unavailable_power is not None:
+                results[index] = Decimal(unavailable_power)
+                continue
+
+            # Handle standby power, keeping the order of strategy calculations
+            standby_power = None
+            if entity_state.state in OFF_STATES or not await self.is_calculation_enabled():
+                await _calculate_pending()
+                if isinstance(self._strategy_instance, PlaybookStrategy):
+                    await self._strategy_instance.stop_playbook()
+                standby_power = await self.calculate_standby_power(entity_state)
+                self._standby_sensors[self.entity_id] = standby_power
+
+                if self._strategy_instance.can_calculate_standby() or self._calculation_strategy != CalculationStrategy.MULTI_SWITCH:
+                    results[index] = standby_power
+                    continue
+
+            pending.append((index, entity_state, standby_power))
 
         # Calculate actual power using configured strategy
-        power = await self._strategy_instance.calculate(entity_state)
+        await _calculate_pending()
+        return results
+
+    def _adjust_power(self, power: Decimal | None, standby_power: Decimal | None) -> Decimal | None:
+        """Apply standby power and multiply factor to the power calculated by the strategy."""
         if power is None:
             return None
 
@@ -656,6 +699,8 @@ class VirtualPowerSensor(SensorEntity, PowerSensor):
                 self._power = round(power, self._rounding_digits)
                 self.async_write_ha_state()
 
+            if self._sleep_power_timer:
+                self._sleep_power_timer()
             self._sleep_power_timer = async_call_later(
                 self.hass,
                 delay,
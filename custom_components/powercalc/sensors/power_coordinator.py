@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, State, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from custom_components.powercalc.const import SIGNAL_POWER_SENSOR_STATE_CHANGE
+
+if TYPE_CHECKING:
+    from .power import VirtualPowerSensor
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PowerCalculationCoordinator:
+    """Collects source entity state changes of all virtual power sensors and calculates them together.
+
+    Changes arriving within the same event loop tick (i.e. a scene activation, or all sensors at HA startup) are handled in one pass.
+    Each power sensor calculates all of its changes with a single strategy calculate_batch call and writes its state once.
+    Sensors are handled concurrently, so a slow one (i.e. loading a LUT) doesn't hold up the others,
+    after which the power sensor state change signal is sent once for the whole pass.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._pending: dict[VirtualPowerSensor, list[tuple[str, State | None]]] = {}
+        self._flush_scheduled = False
+
+    @callback
+    def async_queue(self, sensor: VirtualPowerSensor, trigger_entity_id: str, state: State | None) -> None:
+        """Queue a dependent entity state change for a power sensor."""
+        self._pending.setdefault(sensor, []).append((trigger_entity_id, state))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self._hass.loop.call_soon(self._schedule_flush)
+
+    @callback
+    def async_discard(self, sensor: VirtualPowerSensor) -> None:
+        """Drop queued changes of a power sensor which is being removed."""
+        self._pending.pop(sensor, None)
+
+    @callback
+    def _schedule_flush(self) -> None:
+        self._hass.async_create_task(self._async_flush())
+
+    async def _async_flush(self) -> None:
+        """Calculate all queued changes, changes queued meanwhile are handled in the next pass."""
+        pending, self._pending = self._pending, {}
+        self._flush_scheduled = False
+        if not pending:
+            return
+
+        _LOGGER.debug("Calculating power for %d sensors", len(pending))
+        await asyncio.gather(*(self._async_handle_changes(sensor, changes) for sensor, changes in pending.items()))
+        async_dispatcher_send(self._hass, SIGNAL_POWER_SENSOR_STATE_CHANGE)
+
+    @staticmethod
+    async def _async_handle_changes(sensor: VirtualPowerSensor, changes: list[tuple[str, State | None]]) -> None:
+        try:
+            await sensor.async_handle_source_entity_state_changes(changes)
+        except Exception:  # noqa: BLE001
+            _LOGGER.exception("%s: Error calculating power", sensor.entity_id)
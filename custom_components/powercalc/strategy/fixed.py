@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from decimal import Decimal
 
 import homeassistant.helpers.config_validation as cv
@@ -40,6 +41,7 @@ class FixedStrategy(PowerCalculationStrategyInterface):
         self._source_entity = source_entity
         self._power = power
         self._per_state_power = per_state_power
+        self._state_attributes = [state_key.split("|", 2)[0] for state_key in per_state_power or {} if "|" in state_key]
 
     async def calculate(self, entity_state: State) -> Decimal | None:
         if self._per_state_power is not None:
@@ -61,6 +63,26 @@ class FixedStrategy(PowerCalculationStrategyInterface):
 
         return await evaluate_power(self._power)
 
+    async def calculate_batch(self, entity_states: Sequence[State]) -> list[Decimal | None]:
+        """Calculate the power for multiple states, only evaluating each distinct state (and relevant attributes) once."""
+        cache: dict[tuple, Decimal | None] = {}
+        results: list[Decimal | None] = []
+        for entity_state in entity_states:
+            key = self._cache_key(entity_state)
+            if key not in cache:
+                cache[key] = await self.calculate(entity_state)
+            results.append(cache[key])
+        return results
+
+    def _cache_key(self, entity_state: State) -> tuple:
+        """Return the parts of the state which determine the power."""
+        if self._per_state_power is None:
+            return ()
+        return (
+            entity_state.state,
+            *(str(entity_state.attributes.get(attribute)) for attribute in self._state_attributes),
+        )
+
     async def validate_config(self) -> None:
         """Validate correct setup of the strategy."""
         if self._power is None and self._per_state_power is None:
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Sequence
 from decimal import Decimal
 from typing import Any
 
 import homeassistant.helpers.config_validation as cv
+import numpy as np
 import voluptuous as vol
 from homeassistant.components import fan, light, media_player, vacuum
 from homeassistant.components.fan import ATTR_PERCENTAGE
@@ -70,14 +72,22 @@ class LinearStrategy(PowerCalculationStrategyInterface):
         self._standby_power = standby_power
         self._initialized: bool = False
         self._calibration: list[tuple[int, float]] | None = None
+        self._calibration_values: np.ndarray | None = None
+        self._calibration_powers: np.ndarray | None = None
+
+    async def _initialize(self, entity_state: State) -> None:
+        if self._initialized:
+            return
+        self._calibration = self.create_calibrate_list()
+        self._calibration_values = np.array([v[0] for v in self._calibration], dtype=np.float64)
+        self._calibration_powers = np.array([v[1] for v in self._calibration], dtype=np.float64)
+        self._attribute = self.get_attribute(entity_state)
+        self._value_entity = await self.get_value_entity(entity_state)
+        self._initialized = True
 
     async def calculate(self, entity_state: State) -> Decimal | None:
         """Calculate the current power consumption."""
-        if not self._initialized:
-            self._calibration = self.create_calibrate_list()
-            self._attribute = self.get_attribute(entity_state)
-            self._value_entity = await self.get_value_entity(entity_state)
-            self._initialized = True
+        await self._initialize(entity_state)
 
         value = self.get_current_state_value(entity_state)
         if value is None:
@@ -110,6 +120,73 @@ class LinearStrategy(PowerCalculationStrategyInterface):
 
         return Decimal(power)
 
+    async def calculate_batch(self, entity_states: Sequence[State]) -> list[Decimal | None]:
+        """Calculate the power consumption for multiple states in one vectorized pass over the calibration table."""
+        if not entity_states:
+            return []
+        await self._initialize(entity_states[0])
+
+        results: list[Decimal | None] = [None] * len(entity_states)
+        indexes: list[int] = []
+        values: list[int] = []
+        for index, entity_state in enumerate(entity_states):
+            value = self.get_current_state_value(entity_state)
+            if value is not None:
+                indexes.append(index)
+                values.append(value)
+        if not values:
+            return results
+
+        powers = self.calculate_powers(np.array(values, dtype=np.float64))
+        if powers is None:
+            # Degenerate calibration, let the scalar path handle (and report) these
+            for index in indexes:
+                results[index] = await self.calculate(entity_states[index])
+            return results
+
+        _LOGGER.debug(
+            "%s: Linear mode state values: %s",
+            self._value_entity.entity_id,
+            values,
+        )
+        for index, power in zip(indexes, powers.tolist(), strict=True):
+            results[index] = Decimal(power)
+        return results
+
+    def calculate_powers(self, values: np.ndarray) -> np.ndarray | None:
+        """Interpolate the power for an array of values, picking calibration points like get_min_calibrate and get_max_calibrate.
+        Returns None when the calibration table does not allow interpolation for some of the values.
+        """
+        calibration_values = self._calibration_values
+        calibration_powers = self._calibration_powers
+        if calibration_values is None or calibration_powers is None or not len(calibration_values):
+            return None
+
+        count = len(calibration_values)
+        above = np.searchsorted(calibration_values, values, side="right")
+        # Closest lower (or equal) point, or the highest point when there is none. First of equal values wins, like min()
+        lower = np.where(above > 0, above - 1, count - 1)
+        lower = np.searchsorted(calibration_values, calibration_values[lower], side="left")
+        # Closest higher point, or the lowest point when there is none
+        upper = np.where(above < count, above, 0)
+
+        min_values = calibration_values[lower]
+        value_range = calibration_values[upper] - min_values
+        if np.any(value_range == 0):
+            return None
+        relative_values = (values - min_values) / value_range
+        gamma_curve = self._config.get(CONF_GAMMA_CURVE) or 1
+        curved_values = relative_values
+        if gamma_curve != 1:
+            # Python floats, numpy pow may differ in the last digit from the scalar calculation
+            curved = [relative_value**gamma_curve for relative_value in relative_values.tolist()]
+            if any(isinstance(value, complex) for value in curved):
+                return None
+            curved_values = np.array(curved, dtype=np.float64)
+
+        power_range = calibration_powers[upper] - calibration_powers[lower]
+        return power_range * curved_values + calibration_powers[lower]  # type: ignore[no-any-return]
+
     def get_min_calibrate(self, value: int) -> tuple[int, float]:
         """Get closest lower value from calibration table."""
         return min(self._calibration or (), key=lambda v: (v[0] > value, value - v[0]))
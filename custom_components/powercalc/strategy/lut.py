@@ -4,7 +4,7 @@ import gzip
 import logging
 import os
 from collections import defaultdict
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
 from csv import reader
 from dataclasses import dataclass
 from decimal import Decimal
@@ -37,14 +37,6 @@ from .strategy_interface import PowerCalculationStrategyInterface
 
 _LOGGER = logging.getLogger(__name__)
 
-BrightnessLutValue = float
-ColorTempLutValue = dict[int, float]
-SatLutValue = dict[int, float]
-HsLutValue = dict[int, SatLutValue]
-EffectLutValue = dict[str, float]
-LookupDictValue = BrightnessLutValue | ColorTempLutValue | HsLutValue
-LookupDictType = dict[int, LookupDictValue]
-
 
 class LookupMode(StrEnum):
     EFFECT = "effect"
@@ -57,64 +49,230 @@ class LookupMode(StrEnum):
         return LookupMode(color_mode.value)
 
 
+# Bump when the layout of the compiled LUT sidecar files changes
+LUT_CACHE_VERSION = 1
+LUT_CACHE_SUFFIX = ".npz"
+
+
+@dataclass(frozen=True)
+class LutTable:
+    """Lookup table compiled into sorted NumPy arrays.
+
+    `brightness` holds the sorted brightness levels. Every further lookup dimension
+    (mired for color temp, hue and saturation for hs) is one entry in `levels`, holding
+    the sorted keys of all rows of the previous dimension concatenated, and offsets
+    indicating which slice of the keys belongs to which row.
+    The power values belong to the keys of the last dimension.
+    """
+
+    brightness: np.ndarray
+    values: np.ndarray
+    levels: tuple[tuple[np.ndarray, np.ndarray], ...] = ()
+
+    @classmethod
+    def compile(cls, lookup_dict: Mapping[int, Any]) -> LutTable:
+        """Compile a nested lookup dictionary (brightness -> ... -> power)."""
+        rows: list[Any] = [lookup_dict[key] for key in sorted(lookup_dict)]
+        brightness = np.array(sorted(lookup_dict), dtype=np.int32)
+        levels = []
+        while rows and isinstance(rows[0], Mapping):
+            keys: list[int] = []
+            offsets = [0]
+            next_rows = []
+            for row in rows:
+                sorted_keys = sorted(row)
+                keys.extend(sorted_keys)
+                next_rows.extend(row[key] for key in sorted_keys)
+                offsets.append(len(keys))
+            levels.append((np.array(keys, dtype=np.int32), np.array(offsets, dtype=np.int64)))
+            rows = next_rows
+        return cls(brightness, np.array(rows, dtype=np.float64), tuple(levels))
+
+    def to_arrays(self, prefix: str = "") -> dict[str, np.ndarray]:
+        """Return the arrays making up this table, to be stored in a sidecar file."""
+        arrays = {f"{prefix}brightness": self.brightness, f"{prefix}values": self.values}
+        for index, (keys, offsets) in enumerate(self.levels):
+            arrays[f"{prefix}keys{index}"] = keys
+            arrays[f"{prefix}offsets{index}"] = offsets
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays: Mapping[str, np.ndarray], prefix: str = "") -> LutTable:
+        """Restore a table from arrays as returned by to_arrays."""
+        levels = []
+        while f"{prefix}keys{len(levels)}" in arrays:
+            index = len(levels)
+            levels.append((arrays[f"{prefix}keys{index}"], arrays[f"{prefix}offsets{index}"]))
+        return cls(arrays[f"{prefix}brightness"], arrays[f"{prefix}values"], tuple(levels))
+
+    def lookup(self, brightness: int, search_keys: tuple[int, ...] = ()) -> float:
+        """Lookup power for a brightness, interpolating between the nearest brightness levels.
+
+        For the other dimensions the nearest key is used.
+        """
+        levels = self.brightness
+        index = int(np.searchsorted(levels, brightness))
+        if index < len(levels) and levels[index] == brightness:
+            return self._lookup_row(index, search_keys)
+
+        lower = max(index - 1, 0)
+        higher = min(index, len(levels) - 1)
+        lower_power = self._lookup_row(lower, search_keys)
+        if lower == higher:
+            return lower_power
+        higher_power = self._lookup_row(higher, search_keys)
+        lower_brightness = int(levels[lower])
+        fraction = (brightness - lower_brightness) / (int(levels[higher]) - lower_brightness)
+        return lower_power + (higher_power - lower_power) * fraction
+
+    def _lookup_row(self, index: int, search_keys: tuple[int, ...]) -> float:
+        for (keys, offsets), search_key in zip(self.levels, search_keys):
+            index = self._nearest(keys, int(offsets[index]), int(offsets[index + 1]), search_key)
+        return float(self.values[index])
+
+    @staticmethod
+    def _nearest(keys: np.ndarray, start: int, end: int, search_key: int) -> int:
+        """Return index of the key nearest to search_key within keys[start:end]. On a tie the lower key wins."""
+        index = start + int(np.searchsorted(keys[start:end], search_key))
+        if index == end:
+            return end - 1
+        if index == start or keys[index] == search_key:
+            return index
+        if search_key - keys[index - 1] <= keys[index] - search_key:
+            return index - 1
+        return index
+
+
+LutTableType = LutTable | dict[str, LutTable]
+
+
 class LutRegistry:
     def __init__(self, hass: HomeAssistant) -> None:
         self._hass = hass
-        self._lookup_dictionaries: dict[str, dict] = {}
+        self._lookup_tables: dict[str, LutTableType] = {}
         self.supported_modes: dict[str, set[LookupMode]] = {}
 
-    async def get_lookup_dictionary(
+    async def get_lookup_table(
         self,
         power_profile: PowerProfile,
         lookup_mode: LookupMode,
-    ) -> LookupDictType:
+    ) -> LutTableType:
+        """Get the compiled LUT, for effect mode a table per effect is returned."""
         cache_key = f"{power_profile.manufacturer}_{power_profile.model}_{lookup_mode}_{power_profile.sub_profile}"
-        lookup_dict = self._lookup_dictionaries.get(cache_key)
-        if lookup_dict is None:
-            lookup_dict = defaultdict(partial(defaultdict, dict))
-
-            csv_file = await self._hass.async_add_executor_job(partial(self.get_lut_file, power_profile, lookup_mode))
-            with csv_file:
-                csv_reader = reader(csv_file)
-                next(csv_reader)  # skip header row
-
-                line_count = 0
-                for row in csv_reader:
-                    if lookup_mode == LookupMode.HS:
-                        lookup_dict[int(row[0])][int(row[1])][int(row[2])] = float(
-                            row[3],
-                        )
-                    elif lookup_mode == LookupMode.COLOR_TEMP:
-                        lookup_dict[int(row[0])][int(row[1])] = float(row[2])
-                    elif lookup_mode == LookupMode.EFFECT:
-                        lookup_dict[row[0]][int(row[1])] = float(row[2])
-                    else:
-                        lookup_dict[int(row[0])] = float(row[1])
-                    line_count += 1
-
-            _LOGGER.debug("LUT file loaded: %d lines", line_count)
-
-            lookup_dict = dict(lookup_dict)
-            self._lookup_dictionaries[cache_key] = lookup_dict
-
-        return lookup_dict
+        lookup_table = self._lookup_tables.get(cache_key)
+        if lookup_table is None:
+            lookup_table = await self._hass.async_add_executor_job(self.load_lookup_table, power_profile, lookup_mode)
+            self._lookup_tables[cache_key] = lookup_table
+
+        return lookup_table
+
+    @classmethod
+    def load_lookup_table(cls, power_profile: PowerProfile, lookup_mode: LookupMode) -> LutTableType:
+        """Load the compiled LUT from the sidecar file, or compile it from the CSV file when outdated."""
+        path = cls.get_lut_path(power_profile, lookup_mode)
+        cache_path = f"{path}{LUT_CACHE_SUFFIX}"
+        source_stat = os.stat(path)
+
+        try:
+            with np.load(cache_path, allow_pickle=False) as cache:
+                if (
+                    int(cache["version"]) == LUT_CACHE_VERSION
+                    and int(cache["source_mtime"]) == source_stat.st_mtime_ns
+                    and int(cache["source_size"]) == source_stat.st_size
+                ):
+                    _LOGGER.debug("Loading compiled LUT file: %s", cache_path)
+                    return cls._tables_from_arrays(cache, lookup_mode)
+        except (OSError, KeyError, ValueError):
+            pass
+
+        with cls.get_lut_file(power_profile, lookup_mode) as csv_file:
+            lookup_dict = cls.parse_lut_file(csv_file, lookup_mode)
+
+        if lookup_mode == LookupMode.EFFECT:
+            lookup_table: LutTableType = {effect: LutTable.compile(table) for effect, table in lookup_dict.items()}
+        else:
+            lookup_table = LutTable.compile(lookup_dict)
+
+        arrays = cls._tables_to_arrays(lookup_table)
+        arrays["version"] = np.array(LUT_CACHE_VERSION)
+        arrays["source_mtime"] = np.array(source_stat.st_mtime_ns)
+        arrays["source_size"] = np.array(source_stat.st_size)
+        try:
+            temp_path = f"{cache_path}.tmp"
+            with open(temp_path, "wb") as cache_file:
+                np.savez(cache_file, **arrays)
+            os.replace(temp_path, cache_path)
+        except OSError as err:
+            _LOGGER.debug("Could not write compiled LUT file %s: %s", cache_path, err)
+
+        return lookup_table
 
     @staticmethod
-    def get_lut_file(power_profile: PowerProfile, lookup_mode: LookupMode) -> TextIO:
-        """Open the LUT file for the given power profile and color mode. When the file is gzipped, it will be extracted with gzip."""
+    def parse_lut_file(csv_file: TextIO, lookup_mode: LookupMode) -> dict:
+        """Parse the LUT CSV file into a nested dictionary."""
+        lookup_dict: dict = defaultdict(partial(defaultdict, dict))
+        csv_reader = reader(csv_file)
+        next(csv_reader)  # skip header row
+
+        line_count = 0
+        for row in csv_reader:
+            if lookup_mode == LookupMode.HS:
+                lookup_dict[int(row[0])][int(row[1])][int(row[2])] = float(
+                    row[3],
+                )
+            elif lookup_mode == LookupMode.COLOR_TEMP:
+                lookup_dict[int(row[0])][int(row[1])] = float(row[2])
+            elif lookup_mode == LookupMode.EFFECT:
+                lookup_dict[row[0]][int(row[1])] = float(row[2])
+            else:
+                lookup_dict[int(row[0])] = float(row[1])
+            line_count += 1
+
+        _LOGGER.debug("LUT file loaded: %d lines", line_count)
+        return dict(lookup_dict)
+
+    @staticmethod
+    def _tables_to_arrays(lookup_table: LutTableType) -> dict[str, np.ndarray]:
+        if isinstance(lookup_table, LutTable):
+            return lookup_table.to_arrays()
+
+        effects = list(lookup_table)
+        arrays = {"effects": np.array(effects, dtype=str)}
+        for index, effect in enumerate(effects):
+            arrays.update(lookup_table[effect].to_arrays(f"effect{index}_"))
+        return arrays
+
+    @staticmethod
+    def _tables_from_arrays(arrays: Mapping[str, np.ndarray], lookup_mode: LookupMode) -> LutTableType:
+        if lookup_mode != LookupMode.EFFECT:
+            return LutTable.from_arrays(arrays)
+
+        return {str(effect): LutTable.from_arrays(arrays, f"effect{index}_") for index, effect in enumerate(arrays["effects"])}
+
+    @staticmethod
+    def get_lut_path(power_profile: PowerProfile, lookup_mode: LookupMode) -> str:
+        """Get the path of the LUT file for the given power profile and color mode, preferring the gzipped file."""
         path = os.path.join(power_profile.get_model_directory(), f"{lookup_mode}.csv")
 
         gzip_path = f"{path}.gz"
         if os.path.exists(gzip_path):
-            _LOGGER.debug("Loading LUT data file: %s", gzip_path)
-            return gzip.open(gzip_path, "rt")
+            return gzip_path
 
         if os.path.exists(path):
-            _LOGGER.debug("Loading LUT data file: %s", path)
-            return open(path)
+            return path
 
         raise LutFileNotFoundError("Data file not found: %s")
 
+    @classmethod
+    def get_lut_file(cls, power_profile: PowerProfile, lookup_mode: LookupMode) -> TextIO:
+        """Open the LUT file for the given power profile and color mode. When the file is gzipped, it will be extracted with gzip."""
+        path = cls.get_lut_path(power_profile, lookup_mode)
+        _LOGGER.debug("Loading LUT data file: %s", path)
+        if path.endswith(".gz"):
+            return gzip.open(path, "rt")
+
+        return open(path)
+
     async def get_supported_modes(self, power_profile: PowerProfile) -> set[LookupMode]:
         """Return the color modes supported by the Profile."""
         cache_key = f"{power_profile.manufacturer}_{power_profile.model}_supported_modes"
@@ -144,6 +302,42 @@ class LutStrategy(PowerCalculationStrategyInterface):
 
     async def calculate(self, entity_state: State) -> Decimal | None:
         """Calculate the power consumption based on brightness, mired, hsl or effect."""
+        supported_lut_modes = await self._lut_registry.get_supported_modes(self._profile)
+        resolved = await self._resolve_lookup(entity_state, supported_lut_modes)
+        if resolved is None:
+            return None
+
+        lookup_table, light_setting = resolved
+        power = Decimal(self.lookup_power(lookup_table, light_setting))
+
+        _LOGGER.debug("%s: Calculated power:%s", entity_state.entity_id, power)
+        return power
+
+    async def calculate_batch(self, entity_states: Sequence[State]) -> list[Decimal | None]:
+        """Calculate the power consumption for multiple states, looking up identical light settings only once."""
+        supported_lut_modes = await self._lut_registry.get_supported_modes(self._profile)
+        cache: dict[tuple, Decimal] = {}
+        results: list[Decimal | None] = []
+        for entity_state in entity_states:
+            resolved = await self._resolve_lookup(entity_state, supported_lut_modes)
+            if resolved is None:
+                results.append(None)
+                continue
+
+            lookup_table, light_setting = resolved
+            key = (id(lookup_table), light_setting.color_mode, light_setting.brightness, light_setting.color_temp, light_setting.hue, light_setting.saturation)
+            if key not in cache:
+                cache[key] = Decimal(self.lookup_power(lookup_table, light_setting))
+            _LOGGER.debug("%s: Calculated power:%s", entity_state.entity_id, cache[key])
+            results.append(cache[key])
+        return results
+
+    async def _resolve_lookup(
+        self,
+        entity_state: State,
+        supported_lut_modes: set[LookupMode],
+    ) -> tuple[LutTable, LightSetting] | None:
+        """Resolve the lookup table and light setting to use for the entity state."""
         attrs = entity_state.attributes
 
         brightness = attrs.get(ATTR_BRIGHTNESS)
@@ -156,7 +350,6 @@ class LutStrategy(PowerCalculationStrategyInterface):
         if brightness > 255:
             brightness = 255
 
-        supported_lut_modes = await self._lut_registry.get_supported_modes(self._profile)
         color_mode = await self.get_selected_color_mode(attrs, supported_lut_modes)
         if color_mode == ColorMode.UNKNOWN:
             _LOGGER.warning(
@@ -168,7 +361,7 @@ class LutStrategy(PowerCalculationStrategyInterface):
         effect = attrs.get(ATTR_EFFECT)
         active_mode = LookupMode.EFFECT if effect and LookupMode.EFFECT in supported_lut_modes else LookupMode.from_color_mode(color_mode)
         try:
-            lookup_table = await self._lut_registry.get_lookup_dictionary(
+            lookup_table = await self._lut_registry.get_lookup_table(
                 self._profile,
                 active_mode,
             )
@@ -191,16 +384,13 @@ class LutStrategy(PowerCalculationStrategyInterface):
             {attr: getattr(light_setting, attr) for attr in vars(light_setting)},
         )
 
-        if active_mode == LookupMode.EFFECT:
+        if isinstance(lookup_table, dict):
             lookup_table = lookup_table.get(effect)  # type: ignore
             if not lookup_table:
                 _LOGGER.warning('%s: Effect "%s" not found in LUT', entity_state.entity_id, effect)
                 return None
 
-        power = Decimal(self.lookup_power(lookup_table, light_setting))
-
-        _LOGGER.debug("%s: Calculated power:%s", entity_state.entity_id, power)
-        return power
+        return lookup_table, light_setting
 
     def create_light_setting(
         self,
@@ -256,82 +446,18 @@ class LutStrategy(PowerCalculationStrategyInterface):
             color_mode = ColorMode.HS
         return color_mode
 
+    @staticmethod
     def lookup_power(
-        self,
-        lookup_table: LookupDictType,
+        lookup_table: LutTable,
         light_setting: LightSetting,
     ) -> float:
-        brightness = light_setting.brightness
-        brightness_table = lookup_table.get(brightness)
-
-        # Check if we have an exact match for the selected brightness level in de LUT
-        if brightness_table:
-            return self.lookup_power_for_brightness(brightness_table, light_setting)
-
-        # We don't have an exact match, use interpolation
-        brightness_range = [
-            self.get_nearest_lower_brightness(lookup_table, brightness),
-            self.get_nearest_higher_brightness(lookup_table, brightness),
-        ]
-        power_range = [
-            self.lookup_power_for_brightness(
-                lookup_table[brightness_range[0]],
-                light_setting,
-            ),
-            self.lookup_power_for_brightness(
-                lookup_table[brightness_range[1]],
-                light_setting,
-            ),
-        ]
-        return float(np.interp(brightness, brightness_range, power_range))
-
-    def lookup_power_for_brightness(
-        self,
-        lut_value: LookupDictValue,
-        light_setting: LightSetting,
-    ) -> float:
-        if isinstance(lut_value, float):
-            return lut_value
-
+        search_keys: tuple[int, ...] = ()
         if light_setting.color_mode == ColorMode.COLOR_TEMP:
-            return self.get_nearest(lut_value, light_setting.color_temp or 0)  # type: ignore
+            search_keys = (light_setting.color_temp or 0,)
+        elif light_setting.color_mode == ColorMode.HS:
+            search_keys = (light_setting.hue or 0, light_setting.saturation or 0)
 
-        sat_values = self.get_nearest(lut_value, light_setting.hue or 0)
-        return self.get_nearest(sat_values, light_setting.saturation or 0)  # type: ignore
-
-    @staticmethod
-    def get_nearest(
-        lookup_dict: ColorTempLutValue | HsLutValue | SatLutValue,
-        search_key: int,
-    ) -> LookupDictValue:
-        return lookup_dict.get(search_key) or lookup_dict[min(lookup_dict.keys(), key=lambda key: abs(key - search_key))]
-
-    @staticmethod
-    def get_nearest_lower_brightness(
-        lookup_dict: LookupDictType,
-        search_key: int,
-    ) -> int:
-        keys = lookup_dict.keys()
-        last_key = [*keys][-1]
-        if last_key < search_key:
-            return int(last_key)
-
-        return max(
-            (k for k in lookup_dict if int(k) <= int(search_key)),
-            default=next(iter(keys)),
-        )
-
-    @staticmethod
-    def get_nearest_higher_brightness(
-        lookup_dict: LookupDictType,
-        search_key: int,
-    ) -> int:
-        keys = lookup_dict.keys()
-        first_key = next(iter(keys))
-        if first_key > search_key:
-            return int(first_key)
-
-        return min((k for k in keys if int(k) >= int(search_key)), default=[*keys][-1])
+        return lookup_table.lookup(light_setting.brightness, search_keys)
 
     async def validate_config(self) -> None:
         if self._source_entity.domain != light.DOMAIN:
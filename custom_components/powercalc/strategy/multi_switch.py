@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Sequence
 from decimal import Decimal
 
 import homeassistant.helpers.config_validation as cv
@@ -38,26 +39,39 @@ class MultiSwitchStrategy(PowerCalculationStrategyInterface):
         self.hass = hass
         self.switch_entities = switch_entities
         self.known_states: dict[str, str] | None = None
+        self.total: Decimal | None = None
         self.on_power = on_power
         self.off_power = off_power
 
     async def calculate(self, entity_state: State) -> Decimal | None:
+        return (await self.calculate_batch([entity_state]))[0]
+
+    async def calculate_batch(self, entity_states: Sequence[State]) -> list[Decimal | None]:
+        """Apply the switch states in turn, updating the total by the difference of each change instead of summing all switches again."""
         if self.known_states is None:
             self.known_states = {
                 entity_id: (state.state if (state := self.hass.states.get(entity_id)) else STATE_UNAVAILABLE) for entity_id in self.switch_entities
             }
+            self.total = None
 
-        if entity_state.entity_id != DUMMY_ENTITY_ID and entity_state.entity_id in self.switch_entities:
-            self.known_states[entity_state.entity_id] = entity_state.state
-
-        def _get_power(state: str) -> Decimal:
-            if state == STATE_UNAVAILABLE:
-                return Decimal(0)
-            if state in ON_STATES:
-                return self.on_power
-            return self.off_power or Decimal(0)
+        if self.total is None:
+            self.total = Decimal(sum(self._get_power(state) for state in self.known_states.values()))
+        total = self.total
+        results: list[Decimal | None] = []
+        for entity_state in entity_states:
+            if entity_state.entity_id != DUMMY_ENTITY_ID and entity_state.entity_id in self.switch_entities:
+                total += self._get_power(entity_state.state) - self._get_power(self.known_states[entity_state.entity_id])
+                self.known_states[entity_state.entity_id] = entity_state.state
+            results.append(total)
+        self.total = total
+        return results
 
-        return Decimal(sum(_get_power(state) for state in self.known_states.values()))
+    def _get_power(self, state: str) -> Decimal:
+        if state == STATE_UNAVAILABLE:
+            return Decimal(0)
+        if state in ON_STATES:
+            return self.on_power
+        return self.off_power or Decimal(0)
 
     def get_entities_to_track(self) -> list[str | TrackTemplate]:
         return self.switch_entities  # type: ignore
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from decimal import Decimal
 
 from homeassistant.core import HomeAssistant, State
@@ -10,6 +11,12 @@ class PowerCalculationStrategyInterface:
     async def calculate(self, entity_state: State) -> Decimal | None:
         """Calculate power consumption based on entity state."""
 
+    async def calculate_batch(self, entity_states: Sequence[State]) -> list[Decimal | None]:
+        """Calculate power consumption for multiple entity states, in order.
+        Results must be the same as calling calculate for each state in turn, strategies can override this to share work between the states.
+        """
+        return [await self.calculate(entity_state) for entity_state in entity_states]
+
     async def validate_config(self) -> None:
         """Validate correct setup of the strategy."""
 
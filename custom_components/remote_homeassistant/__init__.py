@@ -139,6 +139,7 @@ CONFIG_SCHEMA = vol.Schema(
 
 HEARTBEAT_INTERVAL = 20
 HEARTBEAT_TIMEOUT = 5
+ENTITY_NAMES_TIMEOUT = 30
 
 INTERNALLY_USED_EVENTS = [EVENT_STATE_CHANGED]
 
@@ -336,6 +337,13 @@ class RemoteConnection:
         self._subscribe_events = set(
             config_entry.options.get(CONF_SUBSCRIBE_EVENTS, []) + INTERNALLY_USED_EVENTS
         )
+
+        # subscribe_entities can only filter by entity id, so the remote filters
+        # when just entities are included. Domains, excludes and filter rules are
+        # still applied locally in state_changed.
+        self._subscribe_entity_ids = None
+        if self._whitelist_e and not self._whitelist_d:
+            self._subscribe_entity_ids = sorted(self._whitelist_e - self._blacklist_e)
         self._entity_prefix = config_entry.options.get(
             CONF_ENTITY_PREFIX, "")
         self._entity_friendly_name_prefix = config_entry.options.get(
@@ -346,6 +354,9 @@ class RemoteConnection:
         self._is_stopping = False
         self._entities = set()
         self._all_entity_names = set()
+        # Last state and attributes received per remote entity id, to apply
+        # the diffs sent by subscribe_entities
+        self._remote_states = {}
         self._handlers = {}
         self._remove_listener = None
         self.proxy_services = ProxyServices(hass, config_entry, self)
@@ -506,6 +517,30 @@ class RemoteConnection:
             await self._connection.close()
         await self.proxy_services.unload()
 
+    async def async_load_entity_names(self):
+        """Fetch the ids of all entities on the remote instance.
+
+        When the subscription is limited to the included entities only those
+        are seen, so the full list is requested from the remote when needed.
+        """
+        if self._subscribe_entity_ids is None or self._connection is None:
+            return
+
+        received = asyncio.Event()
+
+        def got_states(message):
+            if message.get("success"):
+                self._all_entity_names.update(
+                    entity["entity_id"] for entity in message["result"]
+                )
+            received.set()
+
+        await self.call(got_states, "get_states")
+        try:
+            await asyncio.wait_for(received.wait(), ENTITY_NAMES_TIMEOUT)
+        except asyncio.TimeoutError:
+            _LOGGER.warning("timed out fetching entity list from remote instance")
+
     def _next_id(self):
         _id = self.__id
         self.__id += 1
@@ -544,6 +579,7 @@ class RemoteConnection:
         self._remove_listener = None
         self._entities = set()
         self._all_entity_names = set()
+        self._remote_states = {}
         if not self._is_stopping:
             asyncio.ensure_future(self.async_connect())
 
@@ -744,6 +780,16 @@ class RemoteConnection:
             self._entities.add(entity_id)
             self._hass.states.async_set(entity_id, state, attr)
 
+        def entity_removed(entity_id):
+            """Remove an entity that was removed in the remote instance."""
+            self._remote_states.pop(entity_id, None)
+            entity_id = self._prefixed_entity_id(entity_id)
+            with suppress(ValueError, AttributeError, KeyError):
+                self._entities.remove(entity_id)
+            with suppress(ValueError, AttributeError, KeyError):
+                self._all_entity_names.remove(entity_id)
+            self._hass.states.async_remove(entity_id)
+
         def fire_event(message):
             """Publish remote event on local instance."""
             if message["type"] == "result":
@@ -756,13 +802,7 @@ class RemoteConnection:
                 data = message["event"]["data"]
                 entity_id = data["entity_id"]
                 if not data["new_state"]:
-                    entity_id = self._prefixed_entity_id(entity_id)
-                    # entity was removed in the remote instance
-                    with suppress(ValueError, AttributeError, KeyError):
-                        self._entities.remove(entity_id)
-                    with suppress(ValueError, AttributeError, KeyError):
-                        self._all_entity_names.remove(entity_id)
-                    self._hass.states.async_remove(entity_id)
+                    entity_removed(entity_id)
                     return
 
                 state = data["new_state"]["state"]
@@ -795,13 +835,77 @@ class RemoteConnection:
 
                 state_changed(entity_id, state, attributes)
 
+        async def subscribe_state_changed():
+            """Sync states from state_changed events, for remotes without subscribe_entities."""
+            await self.call(fire_event, "subscribe_events", event_type=EVENT_STATE_CHANGED)
+            await self.call(got_states, "get_states")
+
+        def entities_changed(message):
+            """Apply compressed states and diffs sent by subscribe_entities."""
+            if message["type"] == "result":
+                if not message["success"]:
+                    _LOGGER.info(
+                        "remote instance does not support subscribe_entities (%s), "
+                        "falling back to state_changed events",
+                        message.get("error"),
+                    )
+                    self._hass.async_create_task(subscribe_state_changed())
+                return
+
+            if message["type"] != "event":
+                return
+
+            event = message["event"]
+
+            # Full states of entities that are new to the subscription
+            for entity_id, compressed in event.get("a", {}).items():
+                state = compressed["s"]
+                attr = compressed.get("a", {})
+                self._remote_states[entity_id] = (state, attr)
+                # state_changed modifies the attributes it publishes
+                state_changed(entity_id, state, dict(attr))
+
+            # Diffs against the states above, only changed values are sent
+            for entity_id, diff in event.get("c", {}).items():
+                remote_state = self._remote_states.get(entity_id)
+                if remote_state is None:
+                    continue
+                state, attr = remote_state
+                changed = False
+                if additions := diff.get("+"):
+                    if "s" in additions:
+                        state = additions["s"]
+                        changed = True
+                    if "a" in additions:
+                        attr.update(additions["a"])
+                        changed = True
+                if removals := diff.get("-"):
+                    for key in removals.get("a", ()):
+                        attr.pop(key, None)
+                        changed = True
+                if not changed:
+                    # Only last_changed, last_updated or context changed
+                    continue
+                self._remote_states[entity_id] = (state, attr)
+                state_changed(entity_id, state, dict(attr))
+
+            for entity_id in event.get("r", ()):
+                entity_removed(entity_id)
+
         self._remove_listener = self._hass.bus.async_listen(
             EVENT_CALL_SERVICE, forward_event
         )
 
-        for event in self._subscribe_events:
+        for event in self._subscribe_events - {EVENT_STATE_CHANGED}:
             await self.call(fire_event, "subscribe_events", event_type=event)
 
-        await self.call(got_states, "get_states")
+        if self._subscribe_entity_ids is not None:
+            await self.call(
+                entities_changed,
+                "subscribe_entities",
+                entity_ids=self._subscribe_entity_ids,
+            )
+        else:
+            await self.call(entities_changed, "subscribe_entities")
 
         await self.proxy_services.load()
@@ -219,12 +219,13 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             self.options = user_input.copy()
             return await self.async_step_domain_entity_filters()
 
-        domains, _ = self._domains_and_entities()
-        domains = set(domains + self.config_entry.options.get(CONF_LOAD_COMPONENTS, []))
-
         remote = self.hass.data[DOMAIN][self.config_entry.entry_id][
             CONF_REMOTE_CONNECTION
         ]
+        await remote.async_load_entity_names()
+
+        domains, _ = self._domains_and_entities()
+        domains = set(domains + self.config_entry.options.get(CONF_LOAD_COMPONENTS, []))
 
         return self.async_show_form(
             step_id="init",
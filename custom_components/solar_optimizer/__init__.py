@@ -4,7 +4,7 @@ import logging
 import asyncio
 import voluptuous as vol
 
-from homeassistant.const import EVENT_HOMEASSISTANT_START, SERVICE_RELOAD
+from homeassistant.const import EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP, SERVICE_RELOAD
 from homeassistant.core import HomeAssistant
 from homeassistant.setup import async_setup_component
 
@@ -35,8 +35,11 @@ from .const import (
     CONF_BATTERY_SOC_THRESHOLD,
     CONF_MAX_ON_TIME_PER_DAY_MIN,
     CONF_MIN_ON_TIME_PER_DAY_MIN,
+    CONF_DEVICE_TYPE,
+    CONF_DEVICE_CENTRAL,
 )
 from .coordinator import SolarOptimizerCoordinator
+from .solvers import SOLVERS, DEFAULT_SOLVER, DEFAULT_RESTARTS, DEFAULT_EXACT_MAX_SEARCH_SPACE
 
 # from .input_boolean import async_setup_entry as async_setup_entry_input_boolean
 
@@ -54,6 +57,11 @@ CONFIG_SCHEMA = vol.Schema(
                         vol.Required(
                             "max_iteration_number", default=1000
                         ): cv.positive_int,
+                        vol.Optional("solver", default=DEFAULT_SOLVER): vol.In(SOLVERS),
+                        vol.Optional("restarts", default=DEFAULT_RESTARTS): cv.positive_int,
+                        vol.Optional(
+                            "exact_max_search_space", default=DEFAULT_EXACT_MAX_SEARCH_SPACE
+                        ): cv.positive_int,
                     }
                 ),
             }
@@ -79,6 +87,10 @@ async def async_setup(
     # L'argument config contient votre fichier configuration.yaml
     solar_optimizer_config = config.get(DOMAIN)
 
+    # On reload, the previous coordinator is replaced
+    if (previous_coordinator := hass.data[DOMAIN].get("coordinator")) is not None:
+        previous_coordinator.shutdown_solver()
+
     hass.data[DOMAIN]["coordinator"] = coordinator = SolarOptimizerCoordinator(
         hass, solar_optimizer_config
     )
@@ -97,6 +109,7 @@ async def async_setup(
     await async_setup_reload_service(hass, DOMAIN, PLATFORMS)
 
     hass.bus.async_listen_once("homeassistant_started", coordinator.on_ha_started)
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, coordinator.shutdown_solver)
     return True
 
 
@@ -129,6 +142,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if unloaded := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         if (coordinator := SolarOptimizerCoordinator.get_coordinator()) is not None:
             coordinator.remove_device(name_to_unique_id(entry.data[CONF_NAME]))
+            if entry.data.get(CONF_DEVICE_TYPE) == CONF_DEVICE_CENTRAL:
+                coordinator.shutdown_solver()
         # hass.data[DOMAIN].pop(entry.entry_id)
     return unloaded
 
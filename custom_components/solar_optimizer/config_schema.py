@@ -43,6 +43,9 @@ central_config_schema = vol.Schema(
             selector.EntitySelectorConfig(domain=[SENSOR_DOMAIN, INPUT_NUMBER_DOMAIN])
         ),
         vol.Optional(CONF_SUBSCRIBE_TO_EVENTS, default=False): cv.boolean,
+        vol.Optional(CONF_REFRESH_DEBOUNCE_SEC, default=DEFAULT_REFRESH_DEBOUNCE_SEC): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional(CONF_REFRESH_MIN_DELTA_W, default=DEFAULT_REFRESH_MIN_DELTA_W): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(CONF_WARM_START, default=True): cv.boolean,
         vol.Required(CONF_SELL_COST_ENTITY_ID): selector.EntitySelector(
             selector.EntitySelectorConfig(domain=[SENSOR_DOMAIN, INPUT_NUMBER_DOMAIN])
         ),
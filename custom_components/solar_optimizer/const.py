@@ -18,6 +18,10 @@ DEVICE_MANUFACTURER = "JMCOLLIN"
 DEVICE_MODEL = "Solar Optimizer"
 
 DEFAULT_REFRESH_PERIOD_SEC = 300
+DEFAULT_REFRESH_DEBOUNCE_SEC = 10
+DEFAULT_REFRESH_MIN_DELTA_W = 50
+# A change of the inputs of more than this factor times the min delta is recalculated at once, without waiting for the debounce
+LARGE_SWING_FACTOR = 10
 DEFAULT_RAZ_TIME = "05:00"
 
 CONF_ACTION_MODE_ACTION = "action_call"
@@ -51,6 +55,9 @@ CONF_DEVICE_TYPES = [CONF_DEVICE, CONF_POWERED_DEVICE]
 CONF_POWER_CONSUMPTION_ENTITY_ID = "power_consumption_entity_id"
 CONF_POWER_PRODUCTION_ENTITY_ID = "power_production_entity_id"
 CONF_SUBSCRIBE_TO_EVENTS = "subscribe_to_events"
+CONF_REFRESH_DEBOUNCE_SEC = "refresh_debounce_sec"
+CONF_REFRESH_MIN_DELTA_W = "refresh_min_delta_w"
+CONF_WARM_START = "warm_start"
 CONF_SELL_COST_ENTITY_ID = "sell_cost_entity_id"
 CONF_BUY_COST_ENTITY_ID = "buy_cost_entity_id"
 CONF_SELL_TAX_PERCENT_ENTITY_ID = "sell_tax_percent_entity_id"
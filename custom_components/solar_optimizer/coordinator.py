@@ -5,9 +5,10 @@ import math
 from datetime import datetime, timedelta, time
 from typing import Any
 
-from homeassistant.core import HomeAssistant, Event, EventStateChangedData
+from homeassistant.core import HomeAssistant, Event, EventStateChangedData, callback
 from homeassistant.components.select import SelectEntity
 
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.event import (
     async_track_state_change_event,
 )
@@ -23,9 +24,18 @@ from homeassistant.util.unit_conversion import (
 
 from homeassistant.config_entries import ConfigEntry
 
-from .const import DEFAULT_REFRESH_PERIOD_SEC, name_to_unique_id, SOLAR_OPTIMIZER_DOMAIN, DEFAULT_RAZ_TIME
+from .const import (
+    DEFAULT_REFRESH_PERIOD_SEC,
+    DEFAULT_REFRESH_DEBOUNCE_SEC,
+    DEFAULT_REFRESH_MIN_DELTA_W,
+    LARGE_SWING_FACTOR,
+    name_to_unique_id,
+    SOLAR_OPTIMIZER_DOMAIN,
+    DEFAULT_RAZ_TIME,
+)
 from .managed_device import ManagedDevice
 from .simulated_annealing_algo import SimulatedAnnealingAlgorithm
+from .solvers import Solver, create_solver
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -60,6 +70,12 @@ class SolarOptimizerCoordinator(DataUpdateCoordinator):
         self._power_production_entity_id: str = None
         self._subscribe_to_events: bool = False
         self._unsub_events = None
+        self._refresh_debouncer: Debouncer | None = None
+        self._refresh_min_delta_w: float = DEFAULT_REFRESH_MIN_DELTA_W
+        # consumption and production used by the last calculation
+        self._last_inputs: tuple[float, float] | None = None
+        self._warm_start: bool = True
+        self._last_best_solution: list[dict] = []
         self._sell_cost_entity_id: str = None
         self._buy_cost_entity_id: str = None
         self._sell_tax_percent_entity_id: str = None
@@ -88,6 +104,7 @@ class SolarOptimizerCoordinator(DataUpdateCoordinator):
         self._algo = SimulatedAnnealingAlgorithm(
             init_temp, min_temp, cooling_factor, max_iteration_number
         )
+        self._solver: Solver = create_solver(config.get("algorithm") if config else None, self._algo)
         self.config = config
 
     async def configure(self, config: ConfigEntry) -> None:
@@ -108,6 +125,24 @@ class SolarOptimizerCoordinator(DataUpdateCoordinator):
             self._unsub_events()
             self._unsub_events = None
 
+        if self._refresh_debouncer is not None:
+            self._refresh_debouncer.async_cancel()
+            self._refresh_debouncer = None
+
+        refresh_debounce_sec = config.data.get("refresh_debounce_sec", DEFAULT_REFRESH_DEBOUNCE_SEC)
+        if refresh_debounce_sec > 0:
+            self._refresh_debouncer = Debouncer(
+                self.hass,
+                _LOGGER,
+                cooldown=refresh_debounce_sec,
+                immediate=False,
+                function=self._async_refresh_now,
+            )
+        self._refresh_min_delta_w = config.data.get("refresh_min_delta_w", DEFAULT_REFRESH_MIN_DELTA_W)
+        self._last_inputs = None
+        self._warm_start = config.data.get("warm_start", True)
+        self._last_best_solution = []
+
         if self._subscribe_to_events:
             self._unsub_events = async_track_state_change_event(
                 self.hass,
@@ -134,9 +169,45 @@ class SolarOptimizerCoordinator(DataUpdateCoordinator):
         _LOGGER.info("First initialization of Solar Optimizer")
 
     async def _async_on_change(self, event: Event[EventStateChangedData]) -> None:
+        """Recalculate after a change of the consumption or of the production.
+        Changes smaller than the min delta are ignored, the others are merged during the debounce delay
+        except large swings which are recalculated at once"""
+        delta = self._inputs_delta()
+        if delta is not None and delta < self._refresh_min_delta_w:
+            _LOGGER.debug("Consumption and production moved by %.2fW only. No new calculation", delta)
+            return
+
+        if (
+            self._refresh_debouncer is None
+            or delta is None
+            or (self._refresh_min_delta_w > 0 and delta >= LARGE_SWING_FACTOR * self._refresh_min_delta_w)
+        ):
+            if self._refresh_debouncer is not None:
+                self._refresh_debouncer.async_cancel()
+            await self._async_refresh_now()
+            return
+
+        await self._refresh_debouncer.async_call()
+
+    async def _async_refresh_now(self) -> None:
         await self.async_refresh()
         self._schedule_refresh()
 
+    def _get_inputs(self) -> tuple[float, float] | None:
+        """The consumption (with the battery charge) and the production the calculation depends on"""
+        power_consumption = get_safe_float(self.hass, self._power_consumption_entity_id, "W")
+        power_production = get_safe_float(self.hass, self._power_production_entity_id, "W")
+        if power_consumption is None or power_production is None:
+            return None
+        charge_power = get_safe_float(self.hass, self._battery_charge_power_entity_id)
+        return power_consumption + (charge_power or 0), power_production
+
+    def _inputs_delta(self) -> float | None:
+        """The largest change of the inputs since the last calculation. None if it cannot be known"""
+        if self._last_inputs is None or (inputs := self._get_inputs()) is None:
+            return None
+        return max(abs(inputs[0] - self._last_inputs[0]), abs(inputs[1] - self._last_inputs[1]))
+
     async def _async_update_data(self):
         _LOGGER.info("Refreshing Solar Optimizer calculation")
 
@@ -191,10 +262,16 @@ class SolarOptimizerCoordinator(DataUpdateCoordinator):
 
         calculated_data["priority_weight"] = self.priority_weight
 
+        if calculated_data["power_consumption"] is not None:
+            self._last_inputs = (
+                calculated_data["power_consumption"] + calculated_data["battery_charge_power"],
+                power_production,
+            )
+
         #
-        # Call Algorithm Recuit simulé
+        # Call the solver
         #
-        best_solution, best_objective, total_power = self._algo.recuit_simule(
+        probleme = self._algo.preparer_probleme(
             self._devices,
             calculated_data["power_consumption"] + calculated_data["battery_charge_power"],
             calculated_data["power_production"],
@@ -204,6 +281,17 @@ class SolarOptimizerCoordinator(DataUpdateCoordinator):
             calculated_data["battery_soc"],
             calculated_data["priority_weight"],
         )
+        if probleme is None:
+            best_solution, best_objective, total_power = [], -1, -1
+            calculated_data["solver_stats"] = None
+        else:
+            if self._warm_start and self._last_best_solution:
+                probleme.demarrer_depuis(self._last_best_solution)
+            result = await self._solver.async_solve(self.hass, probleme)
+            best_solution, best_objective, total_power = result.best_solution, result.best_objective, result.total_power
+            calculated_data["solver_stats"] = result.stats
+            _LOGGER.debug("Solver statistics: %s", result.stats)
+            self._last_best_solution = best_solution
 
         calculated_data["best_solution"] = best_solution
         calculated_data["best_objective"] = best_objective
@@ -290,6 +378,19 @@ class SolarOptimizerCoordinator(DataUpdateCoordinator):
             "coordinator"
         ] = None
 
+    @callback
+    def shutdown_solver(self, _=None) -> None:
+        """Stop the event driven refreshes and release the resources of the solver (its process pool)"""
+        if self._unsub_events is not None:
+            self._unsub_events()
+            self._unsub_events = None
+
+        if self._refresh_debouncer is not None:
+            self._refresh_debouncer.async_cancel()
+            self._refresh_debouncer = None
+
+        self._solver.shutdown()
+
     @property
     def is_central_config_done(self) -> bool:
         """Return True if the central config is done"""
@@ -97,6 +97,22 @@ async def async_setup_entry(
 class SolarOptimizerSensorEntity(CoordinatorEntity, SensorEntity):
     """The entity holding the algorithm calculation"""
 
+    _entity_component_unrecorded_attributes = (
+        SensorEntity._entity_component_unrecorded_attributes.union(
+            frozenset(
+                {
+                    "solver",
+                    "duration_ms",
+                    "search_space_size",
+                    "iterations",
+                    "restarts",
+                    "converged",
+                    "objective_spread",
+                }
+            )
+        )
+    )
+
     def __init__(self, coordinator, hass, idx):
         super().__init__(coordinator, context=idx)
         self._hass = hass
@@ -118,6 +134,9 @@ class SolarOptimizerSensorEntity(CoordinatorEntity, SensorEntity):
             return
 
         self._attr_native_value = value
+        if self.idx == "best_objective":
+            # Give the statistics of the solver which found the best solution
+            self._attr_extra_state_attributes = self.coordinator.data.get("solver_stats") or {}
         self.async_write_ha_state()
 
     @property
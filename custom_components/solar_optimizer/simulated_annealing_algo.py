@@ -2,7 +2,9 @@
 import logging
 import random
 import math
-import copy
+from dataclasses import dataclass
+
+import numpy as np
 
 from .managed_device import ManagedDevice
 
@@ -10,6 +12,101 @@ _LOGGER = logging.getLogger(__name__)
 
 DEBUG = False
 
+# With a warm start the search starts close to a good solution, so it starts colder and needs less iterations
+WARM_START_TEMPERATURE_FACTOR = 0.1
+
+
+@dataclass
+class AnnealingProblem:
+    """A snapshot of the enabled devices and of the energy context.
+    It only holds plain values so that it can be solved outside of the event loop.
+    Each device is an index in the arrays"""
+
+    names: list[str]
+    state: np.ndarray
+    requested_power: np.ndarray
+    current_power: np.ndarray
+    power_min: np.ndarray
+    power_max: np.ndarray
+    power_step: np.ndarray
+    priority: np.ndarray
+    is_usable: np.ndarray
+    is_waiting: np.ndarray
+    can_change_power: np.ndarray
+    consommation_net: float
+    production_solaire: float
+    puissance_totale_eqt_initiale: float
+    coef_import: float
+    coef_rejets: float
+    priority_weight: float
+    # The solution the annealing starts from. The current state of the devices if None
+    depart_state: np.ndarray | None = None
+    depart_requested_power: np.ndarray | None = None
+
+    def demarrer_depuis(self, solution: list[dict]) -> None:
+        """Warm start: start the annealing from a previous solution.
+        Only the devices which are free to change (usable and not waiting) take their state and power from that solution"""
+        precedente = {equipement["name"]: equipement for equipement in solution}
+        state = self.state.copy()
+        requested_power = self.requested_power.copy()
+        for idx, name in enumerate(self.names):
+            if (equipement := precedente.get(name)) is None or not self.is_usable[idx] or self.is_waiting[idx]:
+                continue
+            if equipement["state"]:
+                power_max = self.power_max[idx]
+                power_min = self.power_min[idx] if self.can_change_power[idx] else power_max
+                state[idx] = True
+                requested_power[idx] = min(max(equipement["requested_power"], power_min), power_max)
+            else:
+                state[idx] = False
+                requested_power[idx] = 0
+        self.depart_state = state
+        self.depart_requested_power = requested_power
+
+    def solution(self, state: np.ndarray, requested_power: np.ndarray) -> list[dict]:
+        """Convert the given state and requested_power arrays to a list of device dicts"""
+        return [
+            {
+                "power_max": power_max,
+                "power_min": power_min,
+                "power_step": power_step,
+                "current_power": current_power,
+                "requested_power": device_requested_power,
+                "name": name,
+                "state": device_state,
+                "is_usable": is_usable,
+                "is_waiting": is_waiting,
+                "can_change_power": can_change_power,
+                "priority": priority,
+            }
+            for name, device_state, device_requested_power, current_power, power_min, power_max, power_step, priority, is_usable, is_waiting, can_change_power in zip(
+                self.names,
+                state.tolist(),
+                requested_power.tolist(),
+                self.current_power.tolist(),
+                self.power_min.tolist(),
+                self.power_max.tolist(),
+                self.power_step.tolist(),
+                self.priority.tolist(),
+                self.is_usable.tolist(),
+                self.is_waiting.tolist(),
+                self.can_change_power.tolist(),
+            )
+        ]
+
+
+@dataclass
+class AnnealingRun:
+    """The result of one annealing chain"""
+
+    state: np.ndarray
+    requested_power: np.ndarray
+    objective: float
+    iterations: int
+    # True if the chain stopped because the temperature reached its minimum or the objective reached 0,
+    # False if it was stopped by the maximum number of iterations
+    converged: bool
+
 
 class SimulatedAnnealingAlgorithm:
     """The class which implemenets the Simulated Annealing algorithm"""
@@ -19,13 +116,6 @@ class SimulatedAnnealingAlgorithm:
     _temperature_minimale: float = 0.1
     _facteur_refroidissement: float = 0.95
     _nombre_iterations: float = 1000
-    _equipements: list[ManagedDevice]
-    _puissance_totale_eqt_initiale: float
-    _cout_achat: float = 15  # centimes
-    _cout_revente: float = 10  # centimes
-    _taxe_revente: float = 10  # pourcentage
-    _consommation_net: float
-    _production_solaire: float
 
     def __init__(
         self,
@@ -74,6 +164,34 @@ class SimulatedAnnealingAlgorithm:
           - best_objectif: the measure of the objective for that solution,
           - total_power_consumption: the total of power consumption for all equipments which should be activated (state=True)
         """
+        probleme = self.preparer_probleme(
+            devices,
+            power_consumption,
+            solar_power_production,
+            sell_cost,
+            buy_cost,
+            sell_tax_percent,
+            battery_soc,
+            priority_weight,
+        )
+        if probleme is None:
+            return [], -1, -1
+
+        return self.resoudre(probleme)
+
+    def preparer_probleme(
+        self,
+        devices: list[ManagedDevice],
+        power_consumption: float,
+        solar_power_production: float,
+        sell_cost: float,
+        buy_cost: float,
+        sell_tax_percent: float,
+        battery_soc: float,
+        priority_weight: int,
+    ) -> AnnealingProblem | None:
+        """Take a snapshot of the enabled devices and of the energy context.
+        Returns None if not all informations are available"""
         if (
             len(devices) <= 0  # pylint: disable=too-many-boolean-expressions
             or power_consumption is None
@@ -85,7 +203,7 @@ class SimulatedAnnealingAlgorithm:
             _LOGGER.info(
                 "Not all informations are available for Simulated Annealign algorithm to work. Calculation is abandoned"
             )
-            return [], -1, -1
+            return None
 
         _LOGGER.debug(
             "Calling recuit_simule with power_consumption=%.2f, solar_power_production=%.2f sell_cost=%.2f, buy_cost=%.2f, tax=%.2f%% devices=%s",
@@ -96,24 +214,22 @@ class SimulatedAnnealingAlgorithm:
             sell_tax_percent,
             devices,
         )
-        self._cout_achat = buy_cost
-        self._cout_revente = sell_cost
-        self._taxe_revente = sell_tax_percent
-        self._consommation_net = power_consumption
-        self._production_solaire = solar_power_production
-        self._priority_weight = priority_weight / 100.0  # to get percentage
+        cout_achat = buy_cost
+        cout_revente = sell_cost
 
         # fix #131 - costs cannot be negative or 0
-        if self._cout_achat <= 0 or self._cout_revente <= 0:
+        if cout_achat <= 0 or cout_revente <= 0:
             _LOGGER.warning(
                 "The cost of energy cannot be negative or 0. Buy cost=%.2f, Sell cost=%.2f. Setting them to 1",
-                self._cout_achat,
-                self._cout_revente,
+                cout_achat,
+                cout_revente,
             )
-            self._cout_achat = self._cout_revente = 1
+            cout_achat = cout_revente = 1
+
+        cout_revente_impose = cout_revente * (1.0 - sell_tax_percent / 100.0)
 
-        self._equipements = []
-        for _, device in enumerate(devices):
+        equipements = []
+        for device in devices:
             if not device.is_enabled:
                 _LOGGER.debug("%s is disabled. Forget it", device.name)
                 continue
@@ -128,270 +244,196 @@ class SimulatedAnnealingAlgorithm:
                 and ((not usable and not waiting) or device.current_power <= 0)
                 else device.is_active
             )
-            self._equipements.append(
-                {
-                    "power_max": device.power_max,
-                    "power_min": device.power_min,
-                    "power_step": device.power_step,
-                    "current_power": device.current_power,  # if force_state else 0,
+            equipements.append(
+                (
+                    device.name,
+                    force_state,
                     # Initial Requested power is the current power if usable
-                    "requested_power": device.current_power,  # if force_state else 0,
-                    "name": device.name,
-                    "state": force_state,
-                    "is_usable": device.is_usable,
-                    "is_waiting": waiting,
-                    "can_change_power": device.can_change_power,
-                    "priority": device.priority,
-                }
+                    device.current_power,
+                    device.power_min,
+                    device.power_max,
+                    device.power_step,
+                    device.priority,
+                    usable,
+                    waiting,
+                    device.can_change_power,
+                )
             )
         if DEBUG:
-            _LOGGER.debug("enabled _equipements are: %s", self._equipements)
-
-        # Générer une solution initiale
-        solution_actuelle = self.generer_solution_initiale(self._equipements)
-        meilleure_solution = solution_actuelle
-        meilleure_objectif = self.calculer_objectif(solution_actuelle)
-        temperature = self._temperature_initiale
+            _LOGGER.debug("enabled _equipements are: %s", equipements)
 
-        for _ in range(self._nombre_iterations):
-            # Générer un voisin
-            objectif_actuel = self.calculer_objectif(solution_actuelle)
-            if DEBUG:
-                _LOGGER.debug("Objectif actuel : %.2f", objectif_actuel)
+        (names, states, current_powers, powers_min, powers_max, powers_step, priorities, usables, waitings, can_change_powers) = (
+            [list(values) for values in zip(*equipements)] if equipements else [[] for _ in range(10)]
+        )
+        # Keep ints when all powers are ints, so the requested powers given to the devices stay the same type
+        power_dtype = np.result_type(*current_powers, *powers_min, *powers_max, *powers_step) if equipements else np.float64
+        state = np.array(states, dtype=bool)
+        current_power = np.array(current_powers, dtype=power_dtype)
+
+        return AnnealingProblem(
+            names=names,
+            state=state,
+            requested_power=current_power.copy(),
+            current_power=current_power,
+            power_min=np.array(powers_min, dtype=power_dtype),
+            power_max=np.array(powers_max, dtype=power_dtype),
+            power_step=np.array(powers_step, dtype=power_dtype),
+            priority=np.array(priorities, dtype=np.float64),
+            is_usable=np.array(usables, dtype=bool),
+            is_waiting=np.array(waitings, dtype=bool),
+            can_change_power=np.array(can_change_powers, dtype=bool),
+            consommation_net=power_consumption,
+            production_solaire=solar_power_production,
+            puissance_totale_eqt_initiale=current_power[state].sum().item(),
+            coef_import=cout_achat / (cout_achat + cout_revente_impose),
+            coef_rejets=cout_revente_impose / (cout_achat + cout_revente_impose),
+            priority_weight=priority_weight / 100.0,  # to get percentage
+        )
 
-            voisin = self.permuter_equipement(solution_actuelle)
+    def resoudre(self, probleme: AnnealingProblem):
+        """Search the best solution of the problem and return it as recuit_simule does.
+        This does not use the event loop and can be run in an executor"""
+        run = self.recuit(probleme)
+        return (
+            probleme.solution(run.state, run.requested_power),
+            run.objective,
+            run.requested_power[run.state].sum().item(),
+        )
 
-            # Calculer les objectifs pour la solution actuelle et le voisin
-            objectif_voisin = self.calculer_objectif(voisin)
-            if DEBUG:
-                _LOGGER.debug("Objectif voisin : %2.f", objectif_voisin)
-
-            # Accepter le voisin si son objectif est meilleur ou si la consommation totale n'excède pas la production solaire
-            if objectif_voisin < objectif_actuel:
-                _LOGGER.debug("---> On garde l'objectif voisin")
-                solution_actuelle = voisin
-                if objectif_voisin < meilleure_objectif:
-                    _LOGGER.debug("---> C'est la meilleure jusque là")
-                    meilleure_solution = voisin
-                    meilleure_objectif = objectif_voisin
-            else:
-                # Accepter le voisin avec une certaine probabilité
-                probabilite = math.exp(
-                    (objectif_actuel - objectif_voisin) / temperature
+    def recuit(self, probleme: AnnealingProblem, rng: random.Random = random) -> AnnealingRun:
+        """Run one annealing chain drawing its random numbers from rng.
+        The current solution is changed in place, one device at a time, and its objective is updated
+        from the change of the total power of the devices, so an iteration does not depend on the number of devices"""
+        warm_start = probleme.depart_state is not None
+        state = (probleme.depart_state if warm_start else probleme.state).copy()
+        requested_power = (probleme.depart_requested_power if warm_start else probleme.requested_power).copy()
+        priority = probleme.priority.tolist()
+        usable = np.flatnonzero(probleme.is_usable).tolist()
+
+        puissance_totale_eqt = requested_power[state].sum().item()
+        priorite_totale = float(np.dot(probleme.priority[state], requested_power[state]))
+
+        objectif_actuel = self.calculer_objectif(probleme, puissance_totale_eqt, priorite_totale)
+        meilleure_state = state.copy()
+        meilleure_requested_power = requested_power.copy()
+        meilleure_objectif = objectif_actuel
+        temperature = self._temperature_initiale * (WARM_START_TEMPERATURE_FACTOR if warm_start else 1)
+        iterations = 0
+        converged = False
+
+        while iterations < self._nombre_iterations:
+            iterations += 1
+            # Générer un voisin
+            voisin = self.permuter_equipement(probleme, state, requested_power, rng.choice(usable), rng) if usable else None
+
+            if voisin is not None:
+                idx, nouvel_etat, nouvelle_puissance = voisin
+                delta_puissance = (nouvelle_puissance if nouvel_etat else 0) - (requested_power[idx].item() if state[idx] else 0)
+                objectif_voisin = self.calculer_objectif(
+                    probleme,
+                    puissance_totale_eqt + delta_puissance,
+                    priorite_totale + priority[idx] * delta_puissance,
                 )
-                if (seuil := random.random()) < probabilite:
-                    solution_actuelle = voisin
-                    if DEBUG:
-                        _LOGGER.debug(
-                            "---> On garde l'objectif voisin car seuil (%.2f) inférieur à proba (%.2f)",
-                            seuil,
-                            probabilite,
-                        )
-                else:
-                    if DEBUG:
-                        _LOGGER.debug("--> On ne prend pas")
+                if DEBUG:
+                    _LOGGER.debug("Objectif actuel : %.2f, objectif voisin : %.2f", objectif_actuel, objectif_voisin)
+
+                # Accepter le voisin si son objectif est meilleur ou avec une certaine probabilité
+                if objectif_voisin < objectif_actuel or rng.random() < math.exp((objectif_actuel - objectif_voisin) / temperature):
+                    state[idx] = nouvel_etat
+                    requested_power[idx] = nouvelle_puissance
+                    puissance_totale_eqt += delta_puissance
+                    priorite_totale += priority[idx] * delta_puissance
+                    objectif_actuel = objectif_voisin
+                    if objectif_voisin < meilleure_objectif:
+                        _LOGGER.debug("---> C'est la meilleure jusque là")
+                        np.copyto(meilleure_state, state)
+                        np.copyto(meilleure_requested_power, requested_power)
+                        meilleure_objectif = objectif_voisin
 
             # Réduire la température
             temperature *= self._facteur_refroidissement
             if DEBUG:
                 _LOGGER.debug(" !! Temperature %.2f", temperature)
             if temperature < self._temperature_minimale or meilleure_objectif <= 0:
+                converged = True
                 break
 
-        return (
-            meilleure_solution,
-            meilleure_objectif,
-            self.consommation_equipements(meilleure_solution),
-        )
+        return AnnealingRun(meilleure_state, meilleure_requested_power, meilleure_objectif, iterations, converged)
 
-    def calculer_objectif(self, solution) -> float:
+    @staticmethod
+    def calculer_objectif(probleme: AnnealingProblem, puissance_totale_eqt: float, priorite_totale: float) -> float:
         """Calcul de l'objectif : minimiser le surplus de production solaire
         rejets = 0 if consommation_net >=0 else -consommation_net
-        consommation_solaire = min(production_solaire, production_solaire - rejets)
-        consommation_totale = consommation_net + consommation_solaire
+        The objective only depends on the total power of the active devices and on the sum of their priority weighted by their power
         """
-
-        puissance_totale_eqt = self.consommation_equipements(solution)
-        diff_puissance_totale_eqt = (
-            puissance_totale_eqt - self._puissance_totale_eqt_initiale
-        )
-
-        new_consommation_net = self._consommation_net + diff_puissance_totale_eqt
+        new_consommation_net = probleme.consommation_net + puissance_totale_eqt - probleme.puissance_totale_eqt_initiale
         new_rejets = 0 if new_consommation_net >= 0 else -new_consommation_net
         new_import = 0 if new_consommation_net < 0 else new_consommation_net
-        new_consommation_solaire = min(
-            self._production_solaire, self._production_solaire - new_rejets
-        )
-        new_consommation_totale = (
-            new_consommation_net + new_rejets
-        ) + new_consommation_solaire
-        if DEBUG:
-            _LOGGER.debug(
-                "Objectif : cette solution ajoute %.3fW a la consommation initial. Nouvelle consommation nette=%.3fW. Nouveaux rejets=%.3fW. Nouvelle conso totale=%.3fW",
-                diff_puissance_totale_eqt,
-                new_consommation_net,
-                new_rejets,
-                new_consommation_totale,
-            )
 
-        cout_revente_impose = self._cout_revente * (1.0 - self._taxe_revente / 100.0)
-        coef_import = (self._cout_achat) / (self._cout_achat + cout_revente_impose)
-        coef_rejets = (cout_revente_impose) / (self._cout_achat + cout_revente_impose)
-
-        consumption_coef = coef_import * new_import + coef_rejets * new_rejets
+        consumption_coef = probleme.coef_import * new_import + probleme.coef_rejets * new_rejets
         # calculate the priority coef as the sum of the priority of all devices
         # in the solution
-        if puissance_totale_eqt > 0:
-            priority_coef = sum((equip["priority"] * equip["requested_power"] / puissance_totale_eqt) for i, equip in enumerate(solution) if equip["state"])
-        else:
-            priority_coef = 0
-        priority_weight = self._priority_weight
-
-        ret = consumption_coef * (1.0 - priority_weight) + priority_coef * priority_weight
-        return ret
-
-    def generer_solution_initiale(self, solution):
-        """Generate the initial solution (which is the solution given in argument) and calculate the total initial power"""
-        self._puissance_totale_eqt_initiale = self.consommation_equipements(solution)
-        return copy.deepcopy(solution)
-
-    def consommation_equipements(self, solution):
-        """The total power consumption for all active equipement"""
-        return sum(
-            equipement["requested_power"]
-            for _, equipement in enumerate(solution)
-            if equipement["state"]
-        )
+        priority_coef = priorite_totale / puissance_totale_eqt if puissance_totale_eqt > 0 else 0
+        priority_weight = probleme.priority_weight
 
+        return consumption_coef * (1.0 - priority_weight) + priority_coef * priority_weight
+
+    @staticmethod
     def calculer_new_power(
-        self, current_power, power_step, power_min, power_max, can_switch_off
+        current_power, power_step, power_min, power_max, can_switch_off, rng: random.Random = random
     ):
-        """Calcul une nouvelle puissance"""
-        choices = []
-        power_min_to_use = max(0, power_min - power_step) if can_switch_off else power_min
-
-        # add all choices from current_power to power_min_to_use descending
-        cp = current_power
-        choice = -1
-        while cp > power_min_to_use:
-            cp -= power_step
-            choices.append(choice)
-            choice -= 1
-
-        # if current_power > power_min_to_use:
-        #    choices.append(-1)
-
-        # add all choices from current_power to power_max ascending
-        cp = current_power
-        choice = 1
-        while cp < power_max:
-            cp += power_step
-            choices.append(choice)
-            choice += 1
-        # if current_power < power_max:
-        #     choices.append(1)
-
-        if len(choices) <= 0:
-            # No changes
+        """Calcul une nouvelle puissance: a random number of power_step up or down, between power_min (or 0 if the device can be switched off) and power_max"""
+        if power_step <= 0:
             return current_power
 
-        power_add = random.choice(choices) * power_step
-        _LOGGER.debug("Adding %d power to current_power (%d)", power_add, current_power)
-        requested_power = current_power + power_add
-        _LOGGER.debug("New requested_power is %s", requested_power)
-        return requested_power
-
-    def permuter_equipement(self, solution):
-        """Permuter le state d'un equipement eau hasard"""
-        voisin = copy.deepcopy(solution)
+        power_min_to_use = max(0, power_min - power_step) if can_switch_off else power_min
 
-        usable = [eqt for eqt in voisin if eqt["is_usable"]]
+        # number of choices from current_power to power_min_to_use descending
+        nb_down = math.ceil((current_power - power_min_to_use) / power_step) if current_power > power_min_to_use else 0
+        # number of choices from current_power to power_max ascending
+        nb_up = math.ceil((power_max - current_power) / power_step) if current_power < power_max else 0
 
-        if len(usable) <= 0:
-            return voisin
+        if nb_down + nb_up <= 0:
+            # No changes
+            return current_power
 
-        eqt = random.choice(usable)
+        choice = rng.randrange(nb_down + nb_up)
+        choice = -(choice + 1) if choice < nb_down else choice - nb_down + 1
+        return current_power + choice * power_step
 
-        # name = eqt["name"]
-        state = eqt["state"]
-        can_change_power = eqt["can_change_power"]
-        is_waiting = eqt["is_waiting"]
+    def permuter_equipement(self, probleme: AnnealingProblem, state: np.ndarray, requested_power: np.ndarray, idx: int, rng: random.Random = random):
+        """Permuter le state d'un equipement: compute the move of the device at idx.
+        Returns (idx, new state, new requested_power) or None if the device cannot change"""
+        etat = bool(state[idx])
+        can_change_power = probleme.can_change_power[idx]
+        is_waiting = probleme.is_waiting[idx]
 
         # Current power is the last requested_power
-        current_power = eqt.get("requested_power")
-        power_max = eqt.get("power_max")
-        power_step = eqt.get("power_step")
-        if can_change_power:
-            power_min = eqt.get("power_min")
-        else:
-            # If power is not manageable, min = max
-            power_min = power_max
+        current_power = requested_power[idx].item()
+        power_max = probleme.power_max[idx].item()
+        # If power is not manageable, min = max
+        power_min = probleme.power_min[idx].item() if can_change_power else power_max
 
         # On veut gérer le is_waiting qui interdit d'allumer ou éteindre un eqt usable.
         # On veut pouvoir changer la puissance si l'eqt est déjà allumé malgré qu'il soit waiting.
         # Usable veut dire qu'on peut l'allumer/éteindre OU qu'on peut changer la puissance
-
-        # if not can_change_power and is_waiting:
-        #    -> on ne fait rien (mais ne devrait pas arriver car il ne serait pas usable dans ce cas)
-        #
-        # if state and can_change_power and is_waiting:
-        #    -> change power mais sans l'éteindre (requested_power >= power_min)
-        #
-        # if state and can_change_power and not is_waiting:
-        #    -> change power avec extinction possible
-        #
-        # if not state and not is_waiting
-        #    -> allumage
-        #
-        # if state and not is_waiting
-        #    -> extinction
-        #
-        if (not can_change_power and is_waiting) or (
-            not state and can_change_power and is_waiting
-        ):
+        if is_waiting and not (etat and can_change_power):
             _LOGGER.debug("not can_change_power and is_waiting -> do nothing")
-            return voisin
+            return None
 
-        if state and can_change_power and is_waiting:
-            # calculated a new power but do not switch off (because waiting)
-            requested_power = self.calculer_new_power(
-                current_power, power_step, power_min, power_max, can_switch_off=False
+        if etat and can_change_power:
+            # change power, switching off is accepted only if not waiting
+            nouvelle_puissance = self.calculer_new_power(
+                current_power, probleme.power_step[idx].item(), power_min, power_max, can_switch_off=not is_waiting, rng=rng
             )
-            assert (
-                requested_power > 0
-            ), "Requested_power should be > 0 because is_waiting is True"
-
-        elif state and can_change_power and not is_waiting:
-            # change power and accept switching off
-            requested_power = self.calculer_new_power(
-                current_power, power_step, power_min, power_max, can_switch_off=True
-            )
-            if requested_power < power_min:
+            if not is_waiting and nouvelle_puissance < power_min:
                 # deactivate the equipment
-                eqt["state"] = False
-                requested_power = 0
+                return idx, False, 0
+            return idx, True, nouvelle_puissance
 
-        elif not state and not is_waiting:
+        if not etat:
             # Allumage
-            eqt["state"] = not state
-            requested_power = power_min
-
-        elif state and not is_waiting:
-            # Extinction
-            eqt["state"] = not state
-            requested_power = 0
+            return idx, True, power_min
 
-        elif "requested_power" not in locals():
-            _LOGGER.error("We should not be there. eqt=%s", eqt)
-            assert False, "Requested power n'a pas été calculé. Ce n'est pas normal"
-
-        eqt["requested_power"] = requested_power
-
-        if DEBUG:
-            _LOGGER.debug(
-                "      -- On permute %s puissance max de %.2f. Il passe à %s",
-                eqt["name"],
-                eqt["requested_power"],
-                eqt["state"],
-            )
-        return voisin
+        # Extinction
+        return idx, False, 0
@@ -0,0 +1,336 @@
+""" The solvers which search the best solution of an AnnealingProblem"""
+import asyncio
+import logging
+import math
+import os
+import random
+import time
+import multiprocessing
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, asdict
+
+import numpy as np
+
+from homeassistant.core import HomeAssistant
+
+from .simulated_annealing_algo import AnnealingProblem, AnnealingRun, SimulatedAnnealingAlgorithm
+
+_LOGGER = logging.getLogger(__name__)
+
+SOLVER_AUTO = "auto"
+SOLVER_EXACT = "exact"
+SOLVER_SIMULATED_ANNEALING = "simulated_annealing"
+SOLVER_MULTI_RESTART = "multi_restart"
+SOLVERS = [SOLVER_AUTO, SOLVER_EXACT, SOLVER_SIMULATED_ANNEALING, SOLVER_MULTI_RESTART]
+
+DEFAULT_SOLVER = SOLVER_AUTO
+DEFAULT_RESTARTS = 4
+DEFAULT_EXACT_MAX_SEARCH_SPACE = 1_000_000
+
+
+@dataclass
+class SolverResult:
+    """The best solution found by a solver and how it was found"""
+
+    best_solution: list[dict]
+    best_objective: float
+    total_power: float
+    solver: str
+    duration_ms: float
+    search_space_size: int
+    # annealing iterations of all the chains or number of partial solutions evaluated by the exact solver
+    iterations: int
+    restarts: int
+    converged: bool
+    # difference between the worst and the best objective of the chains of the multi restart solver
+    objective_spread: float = 0.0
+
+    @property
+    def stats(self) -> dict:
+        """The statistics of the resolution, without the solution"""
+        stats = asdict(self)
+        for key in ("best_solution", "best_objective", "total_power"):
+            stats.pop(key)
+        return stats
+
+
+def device_options(probleme: AnnealingProblem, idx: int) -> list[tuple[bool, float]]:
+    """All the (state, requested_power) a device can be given.
+    A device that is not usable or that is waiting (and cannot only change its power) keeps its current state"""
+    state = bool(probleme.state[idx])
+    current_power = probleme.requested_power[idx].item()
+    can_change_power = bool(probleme.can_change_power[idx])
+    is_waiting = bool(probleme.is_waiting[idx])
+
+    if not probleme.is_usable[idx] or (is_waiting and not (state and can_change_power)):
+        return [(state, current_power)]
+
+    power_max = probleme.power_max[idx].item()
+    # If power is not manageable, min = max
+    power_min = probleme.power_min[idx].item() if can_change_power else power_max
+    power_step = probleme.power_step[idx].item()
+
+    powers = [power_min]
+    if can_change_power and power_step > 0:
+        # A waiting device can only change its power by steps from its current power
+        first = current_power - math.floor((current_power - power_min) / power_step) * power_step if is_waiting else power_min
+        powers = (first + power_step * np.arange(math.floor((power_max - first) / power_step) + 1)).tolist()
+    if state and current_power not in powers:
+        powers.append(current_power)
+
+    options = [(True, power) for power in powers]
+    if not is_waiting:
+        options.append((False, 0))
+    return options
+
+
+def search_space_size(probleme: AnnealingProblem) -> int:
+    """The number of different solutions of the problem"""
+    return math.prod(len(device_options(probleme, idx)) for idx in range(len(probleme.names)))
+
+
+def exact_search_space_size(probleme: AnnealingProblem) -> int:
+    """An upper bound of the number of partial solutions the exact solver evaluates.
+    For each device, it is the number of different total powers of the previous devices times the number of options of the device.
+    With integer powers, the number of total powers is bounded by the maximum total divided by the gcd of the powers"""
+    all_options = [device_options(probleme, idx) for idx in range(len(probleme.names))]
+    powers = [power for options in all_options for state, power in options if state]
+    granularity = math.gcd(*(int(power) for power in powers)) if powers and all(float(power).is_integer() for power in powers) else 0
+
+    size = 0
+    nb_totals = 1
+    max_total = 0
+    for options in all_options:
+        size += nb_totals * len(options)
+        max_total += max((power for state, power in options if state), default=0)
+        nb_totals *= len(options)
+        if granularity > 0:
+            nb_totals = min(nb_totals, int(max_total) // granularity + 1)
+    return size
+
+
+class Solver(ABC):
+    """The interface of the solvers. A solver searches the best solution of an AnnealingProblem"""
+
+    name: str
+
+    async def async_solve(self, hass: HomeAssistant, probleme: AnnealingProblem) -> SolverResult:
+        """Search the best solution without blocking the event loop"""
+        return await hass.async_add_executor_job(self.solve, probleme)
+
+    @abstractmethod
+    def solve(self, probleme: AnnealingProblem) -> SolverResult:
+        """Search the best solution"""
+
+    def shutdown(self) -> None:
+        """Release the resources of the solver"""
+
+
+class AnnealingSolver(Solver):
+    """A single annealing chain. This was the only solver of Solar Optimizer"""
+
+    name = SOLVER_SIMULATED_ANNEALING
+
+    def __init__(self, algo: SimulatedAnnealingAlgorithm):
+        self._algo = algo
+
+    def solve(self, probleme: AnnealingProblem) -> SolverResult:
+        start = time.perf_counter()
+        run = self._algo.recuit(probleme)
+        return _result_from_run(self.name, probleme, run, start, [run])
+
+
+class MultiRestartAnnealingSolver(Solver):
+    """Several annealing chains run in parallel in a process pool, the best solution is kept.
+    Each chain has its own fixed seed so the same inputs always give the same solution"""
+
+    name = SOLVER_MULTI_RESTART
+
+    def __init__(self, algo: SimulatedAnnealingAlgorithm, restarts: int = DEFAULT_RESTARTS):
+        self._algo = algo
+        self._restarts = max(1, restarts)
+        self._pool: ProcessPoolExecutor | None = None
+
+    async def async_solve(self, hass: HomeAssistant, probleme: AnnealingProblem) -> SolverResult:
+        start = time.perf_counter()
+        try:
+            pool = self._get_pool()
+            runs = await asyncio.gather(
+                *(hass.loop.run_in_executor(pool, _recuit_chaine, self._algo, probleme, seed) for seed in range(self._restarts)),
+                return_exceptions=True,
+            )
+            if errors := [run for run in runs if isinstance(run, BaseException)]:
+                raise errors[0]
+        except (BrokenProcessPool, OSError) as err:
+            _LOGGER.warning("The process pool of the multi restart solver is not usable (%s). Running the chains in a thread", err)
+            self.shutdown()
+            runs = await hass.async_add_executor_job(self._recuit_chaines, probleme)
+
+        return _result_from_run(self.name, probleme, min(runs, key=lambda run: run.objective), start, runs)
+
+    def solve(self, probleme: AnnealingProblem) -> SolverResult:
+        start = time.perf_counter()
+        runs = self._recuit_chaines(probleme)
+        return _result_from_run(self.name, probleme, min(runs, key=lambda run: run.objective), start, runs)
+
+    def _recuit_chaines(self, probleme: AnnealingProblem) -> list[AnnealingRun]:
+        """Run all the chains one after the other"""
+        return [_recuit_chaine(self._algo, probleme, seed) for seed in range(self._restarts)]
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn and not fork, the HA process has many threads
+            self._pool = ProcessPoolExecutor(
+                max_workers=min(self._restarts, os.cpu_count() or 1),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+class ExactSolver(Solver):
+    """Gives the optimal solution by dynamic programming over the total power of the active devices.
+    The objective only depends on the total power and on the sum of the priorities weighted by the power,
+    and for a given total power a lower weighted priority is always better. So only the best weighted
+    priority of each total power has to be kept when devices are added one by one"""
+
+    name = SOLVER_EXACT
+
+    def solve(self, probleme: AnnealingProblem) -> SolverResult:
+        start = time.perf_counter()
+        nb_devices = len(probleme.names)
+        all_options = [device_options(probleme, idx) for idx in range(nb_devices)]
+
+        totals = np.zeros(1)
+        priorities = np.zeros(1)
+        # for each device, the index in the candidates of the kept partial solutions
+        kept_candidates: list[np.ndarray] = []
+        iterations = 0
+        for idx, options in enumerate(all_options):
+            option_powers = np.array([power if state else 0 for state, power in options], dtype=np.float64)
+            candidate_totals = (totals[:, None] + option_powers[None, :]).ravel()
+            candidate_priorities = (priorities[:, None] + probleme.priority[idx] * option_powers[None, :]).ravel()
+            iterations += candidate_totals.size
+
+            # keep the lowest weighted priority of each total power
+            rounded_totals = np.round(candidate_totals, 6)
+            order = np.lexsort((candidate_priorities, rounded_totals))
+            first = np.ones(order.size, dtype=bool)
+            first[1:] = rounded_totals[order[1:]] != rounded_totals[order[:-1]]
+            kept = order[first]
+
+            totals = candidate_totals[kept]
+            priorities = candidate_priorities[kept]
+            kept_candidates.append(kept)
+
+        objectives = self._objectifs(probleme, totals, priorities)
+        best = int(np.argmin(objectives))
+
+        state = probleme.state.copy()
+        requested_power = probleme.requested_power.copy()
+        for idx in range(nb_devices - 1, -1, -1):
+            parent, option = divmod(int(kept_candidates[idx][best]), len(all_options[idx]))
+            state[idx], requested_power[idx] = all_options[idx][option]
+            best = parent
+
+        total_power = requested_power[state].sum().item()
+        return SolverResult(
+            best_solution=probleme.solution(state, requested_power),
+            best_objective=SimulatedAnnealingAlgorithm.calculer_objectif(
+                probleme, total_power, float(np.dot(probleme.priority[state], requested_power[state]))
+            ),
+            total_power=total_power,
+            solver=self.name,
+            duration_ms=_duration_ms(start),
+            search_space_size=math.prod(len(options) for options in all_options),
+            iterations=iterations,
+            restarts=0,
+            converged=True,
+        )
+
+    @staticmethod
+    def _objectifs(probleme: AnnealingProblem, totals: np.ndarray, priorities: np.ndarray) -> np.ndarray:
+        """SimulatedAnnealingAlgorithm.calculer_objectif for arrays of total powers and weighted priorities"""
+        consommation_net = probleme.consommation_net + totals - probleme.puissance_totale_eqt_initiale
+        rejets = np.where(consommation_net < 0, -consommation_net, 0)
+        imports = np.where(consommation_net >= 0, consommation_net, 0)
+        consumption_coef = probleme.coef_import * imports + probleme.coef_rejets * rejets
+        priority_coef = np.divide(priorities, totals, out=np.zeros_like(totals), where=totals > 0)
+        return consumption_coef * (1.0 - probleme.priority_weight) + priority_coef * probleme.priority_weight
+
+
+class AutoSolver(Solver):
+    """Uses the exact solver when its search space is small enough and the multi restart annealing otherwise"""
+
+    name = SOLVER_AUTO
+
+    def __init__(self, exact: Solver, annealing: Solver, max_search_space: int = DEFAULT_EXACT_MAX_SEARCH_SPACE):
+        self._exact = exact
+        self._annealing = annealing
+        self._max_search_space = max_search_space
+
+    def _select(self, probleme: AnnealingProblem) -> Solver:
+        size = exact_search_space_size(probleme)
+        solver = self._exact if size <= self._max_search_space else self._annealing
+        _LOGGER.debug("Exact search space size is %d. Using the %s solver", size, solver.name)
+        return solver
+
+    async def async_solve(self, hass: HomeAssistant, probleme: AnnealingProblem) -> SolverResult:
+        return await self._select(probleme).async_solve(hass, probleme)
+
+    def solve(self, probleme: AnnealingProblem) -> SolverResult:
+        return self._select(probleme).solve(probleme)
+
+    def shutdown(self) -> None:
+        self._exact.shutdown()
+        self._annealing.shutdown()
+
+
+def create_solver(algo_config: dict | None, algo: SimulatedAnnealingAlgorithm) -> Solver:
+    """Create the solver from the algorithm configuration"""
+    algo_config = algo_config or {}
+    solver_name = algo_config.get("solver", DEFAULT_SOLVER)
+    restarts = int(algo_config.get("restarts", DEFAULT_RESTARTS))
+
+    if solver_name == SOLVER_EXACT:
+        return ExactSolver()
+    if solver_name == SOLVER_SIMULATED_ANNEALING:
+        return AnnealingSolver(algo)
+    if solver_name == SOLVER_MULTI_RESTART:
+        return MultiRestartAnnealingSolver(algo, restarts)
+    return AutoSolver(
+        ExactSolver(),
+        MultiRestartAnnealingSolver(algo, restarts),
+        int(algo_config.get("exact_max_search_space", DEFAULT_EXACT_MAX_SEARCH_SPACE)),
+    )
+
+
+def _recuit_chaine(algo: SimulatedAnnealingAlgorithm, probleme: AnnealingProblem, seed: int) -> AnnealingRun:
+    """Run one annealing chain with a fixed seed. This is a module function so it can be run in a process pool"""
+    return algo.recuit(probleme, random.Random(seed))
+
+
+def _result_from_run(name: str, probleme: AnnealingProblem, run: AnnealingRun, start: float, runs: list[AnnealingRun]) -> SolverResult:
+    """Build the SolverResult of annealing chains, run being the best one"""
+    return SolverResult(
+        best_solution=probleme.solution(run.state, run.requested_power),
+        best_objective=run.objective,
+        total_power=run.requested_power[run.state].sum().item(),
+        solver=name,
+        duration_ms=_duration_ms(start),
+        search_space_size=search_space_size(probleme),
+        iterations=sum(chain.iterations for chain in runs),
+        restarts=len(runs),
+        converged=all(chain.converged for chain in runs),
+        objective_spread=max(chain.objective for chain in runs) - min(chain.objective for chain in runs),
+    )
+
+
+def _duration_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 3)
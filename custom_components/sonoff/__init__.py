@@ -29,6 +29,7 @@ from .core import devices as core_devices
 from .core.const import (
     CONF_APPID,
     CONF_APPSECRET,
+    CONF_BULK_WINDOW,
     CONF_COUNTRY_CODE,
     CONF_DEFAULT_CLASS,
     CONF_DEVICEKEY,
@@ -62,6 +63,7 @@ CONFIG_SCHEMA = vol.Schema(
             {
                 vol.Optional(CONF_APPID): cv.string,
                 vol.Optional(CONF_APPSECRET): cv.string,
+                vol.Optional(CONF_BULK_WINDOW): cv.positive_float,
                 vol.Optional(CONF_USERNAME): cv.string,
                 vol.Optional(CONF_PASSWORD): cv.string,
                 vol.Optional(CONF_DEFAULT_CLASS): cv.string,
@@ -110,6 +112,8 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
         if CONF_APPID in conf and CONF_APPSECRET in conf:
             APP[0] = conf[CONF_APPID]
             APP.append(conf[CONF_APPSECRET])
+        if CONF_BULK_WINDOW in conf:
+            XRegistry.bulk_window = conf[CONF_BULK_WINDOW]
         if CONF_DEFAULT_CLASS in conf:
             core_devices.set_default_class(conf.get(CONF_DEFAULT_CLASS))
         if CONF_SENSORS in conf:
@@ -2,6 +2,7 @@ DOMAIN = "sonoff"
 
 CONF_APPID = "appid"
 CONF_APPSECRET = "appsecret"
+CONF_BULK_WINDOW = "bulk_window"
 CONF_DEBUG = "debug"
 CONF_DEFAULT_CLASS = "default_class"
 CONF_DEVICEKEY = "devicekey"
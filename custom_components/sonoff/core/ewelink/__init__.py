@@ -1,10 +1,21 @@
 import asyncio
+import copy
+import heapq
 import logging
 import time
+import zlib
+from collections import deque
 
 from aiohttp import ClientSession
 
-from .base import SIGNAL_CONNECTED, SIGNAL_UPDATE, XDevice, XRegistryBase
+from .base import (
+    SIGNAL_CONNECTED,
+    SIGNAL_UPDATE,
+    XDevice,
+    XRegistryBase,
+    can_merge_params,
+    merge_params,
+)
 from .cloud import XRegistryCloud
 from .local import XRegistryLocal
 
@@ -12,16 +23,85 @@ _LOGGER = logging.getLogger(__name__)
 
 SIGNAL_ADD_ENTITIES = "add_entities"
 LOCAL_TTL = 60
+# POW devices send energy data only for some time after refresh request
+REFRESH_INTERVAL = 30
+# [5] POW, [32] POWR2, [182] S40, [190] POWR3 - one channel, only cloud update
+# [181] THR316D/THR320D, [226] CK-BL602-W102SW18-01
+# [126] DUALR3 - two channels, local and cloud update
+# [130] SPM-4Relay - four channels, separate update for each channel
+REFRESH_UIIDS = (5, 32, 182, 190, 181, 226, 126, 130)
+# max number of devices checked via LAN at the same time
+PROBES_LIMIT = 10
+
+
+class XBatch:
+    """Params of send_bulk calls to one device, that will be sent as one command."""
+
+    def __init__(
+        self, params: dict, params_lan: dict | None, cmd_lan: str | None, query_cloud: bool
+    ):
+        # params will be merged with next calls, so don't touch caller dicts
+        self.params = copy.deepcopy(params)
+        self.params_lan = copy.deepcopy(params_lan)
+        self.cmd_lan = cmd_lan
+        self.query_cloud = query_cloud
+        self.loop = asyncio.get_running_loop()
+        self.future = self.loop.create_future()
+
+    def merge(
+        self, params: dict, params_lan: dict | None, cmd_lan: str | None, query_cloud: bool
+    ) -> bool:
+        # this can be called from different threads/loops
+        # https://github.com/AlexxIT/SonoffLAN/issues/1368
+        if self.loop is not asyncio.get_running_loop():
+            return False
+        if cmd_lan != self.cmd_lan or query_cloud != self.query_cloud:
+            return False
+        if (params_lan is None) != (self.params_lan is None):
+            return False
+        # LAN command is taken from the first param, different commands
+        # use different URLs and can't be merged
+        if cmd_lan is None and next(iter(params_lan or params), None) != next(
+            iter(self.params_lan or self.params), None
+        ):
+            return False
+        if not can_merge_params(self.params, params):
+            return False
+        if params_lan is not None and not can_merge_params(self.params_lan, params_lan):
+            return False
+
+        merge_params(self.params, params)
+        if params_lan is not None:
+            merge_params(self.params_lan, params_lan)
+        return True
 
 
 class XRegistry(XRegistryBase):
     config: dict = None
     task: asyncio.Task | None = None
+    # seconds to wait for other send_bulk calls to the same device
+    bulk_window: float = 0.1
 
     def __init__(self, session: ClientSession):
         super().__init__(session)
 
         self.devices: dict[str, XDevice] = {}
+        self.batches: dict[str, XBatch] = {}
+        # last encrypted LAN message per device: seq, iv, data, host
+        self.local_msgs: dict[str, tuple] = {}
+
+        # heap of (time, deviceid, kind), kind is "refresh" or "local"
+        self.deadlines: list[tuple[float, str, str]] = []
+        self.scheduled: set[tuple[str, str]] = set()
+        self.wakeup = asyncio.Event()
+        self.probes = asyncio.Semaphore(PROBES_LIMIT)
+        self.probing: set[str] = set()
+        # send time of last minute local probes and refresh requests
+        self.activity: dict[str, deque[float]] = {
+            "local_probe": deque(),
+            "local_refresh": deque(),
+            "cloud_refresh": deque(),
+        }
 
         self.cloud = XRegistryCloud(session)
         self.cloud.dispatcher_connect(SIGNAL_CONNECTED, self.cloud_connected)
@@ -61,6 +141,12 @@ class XRegistry(XRegistryBase):
 
                 self.devices[did] = device
 
+                if uiid in REFRESH_UIIDS and (did, "refresh") not in self.scheduled:
+                    # golden ratio spreads devices evenly over refresh interval
+                    n = sum(1 for _, kind in self.scheduled if kind == "refresh")
+                    offset = (n * 0.618034) % 1 * REFRESH_INTERVAL
+                    self.schedule(did, "refresh", time.time() + offset)
+
             except Exception as e:
                 _LOGGER.warning(f"{did} !! can't setup device", exc_info=e)
 
@@ -72,7 +158,10 @@ class XRegistry(XRegistryBase):
 
     async def stop(self, *args):
         self.devices.clear()
+        self.local_msgs.clear()
         self.dispatcher.clear()
+        self.deadlines.clear()
+        self.scheduled.clear()
 
         await self.cloud.stop()
         await self.local.stop()
@@ -101,6 +190,8 @@ class XRegistry(XRegistryBase):
         :param query_cloud: optional query Cloud state after update state,
           ignored if params empty
         :param timeout_lan: optional custom LAN timeout
+        :return: "online" if the command was delivered, else the error of the
+          last try, None if device is not available
         """
         seq = await self.sequence()
 
@@ -142,53 +233,49 @@ class XRegistry(XRegistryBase):
                 await self.cloud.send(device, timeout=0)
 
         else:
-            return
+            return None
 
         # TODO: response state
         # self.dispatcher_send(device["deviceid"], state)
 
-    async def send_bulk(self, device: XDevice, params: dict):
-        assert "switches" in params
-
-        if "params_bulk" in device:
-            for new in params["switches"]:
-                for old in device["params_bulk"]["switches"]:
-                    # check on duplicates
-                    if new["outlet"] == old["outlet"]:
-                        old["switch"] = new["switch"]
-                        break
-                else:
-                    device["params_bulk"]["switches"].append(new)
-        else:
-            device["params_bulk"] = params
+        return ok
 
-        await asyncio.sleep(0.1)
+    async def send_bulk(
+        self,
+        device: XDevice,
+        params: dict,
+        params_lan: dict = None,
+        cmd_lan: str = None,
+        query_cloud: bool = True,
+    ):
+        """Send command to device together with other send_bulk calls to the
+        same device within bulk_window. Params are merged with same rules as
+        LAN queue: outlets by outlet number, nested dicts by key, other keys
+        by last value. Every caller gets the result of the merged command.
+        """
+        did = device["deviceid"]
+        batch = self.batches.get(did)
+        if batch is None or not batch.merge(params, params_lan, cmd_lan, query_cloud):
+            batch = self.batches[did] = XBatch(params, params_lan, cmd_lan, query_cloud)
+            asyncio.create_task(self._send_batch(device, batch))
 
-        # this can be called from different threads/loops
-        # https://github.com/AlexxIT/SonoffLAN/issues/1368
-        if params := device.pop("params_bulk", None):
-            return await self.send(device, params)
-
-    # TODO: Unify send_bulk and send_bulk_configure
-    async def send_bulk_configure(self, device: XDevice, params: dict):
-        assert "configure" in params
-
-        if "params_bulk" in device:
-            for new in params["configure"]:
-                for old in device["params_bulk"]["configure"]:
-                    # check on duplicates
-                    if new["outlet"] == old["outlet"]:
-                        old["startup"] = new["switch"]
-                        break
-                else:
-                    device["params_bulk"]["configure"].append(new)
-        else:
-            device["params_bulk"] = params
+        # merged command is shared with other callers, so don't cancel it
+        return await asyncio.shield(batch.future)
 
-        await asyncio.sleep(0.1)
+    async def _send_batch(self, device: XDevice, batch: XBatch):
+        await asyncio.sleep(self.bulk_window)
 
-        if params := device.pop("params_bulk", None):
-            return await self.send(device, params)
+        # next calls will start a new batch
+        if self.batches.get(device["deviceid"]) is batch:
+            del self.batches[device["deviceid"]]
+
+        try:
+            ok = await self.send(
+                device, batch.params, batch.params_lan, batch.cmd_lan, batch.query_cloud
+            )
+            batch.future.set_result(ok)
+        except Exception as e:
+            batch.future.set_exception(e)
 
     async def send_cloud(self, device: XDevice, params: dict = None, query=True):
         if not self.can_cloud(device):
@@ -205,10 +292,12 @@ class XRegistry(XRegistryBase):
             if i > 0:
                 await asyncio.sleep(5)
 
+            self.count_activity("local_probe")
             ok = await self.local.send(device, command="getState")
             if ok in ("online", "error"):
                 device["local_ts"] = time.time() + LOCAL_TTL
                 device["local"] = True
+                self.schedule_local(device)
                 return
 
             # just one try for the long lost
@@ -287,6 +376,16 @@ class XRegistry(XRegistryBase):
             if "devicekey" not in device:
                 # this is known device with encrypted payload but without devicekey
                 return
+
+            # device repeats the last announcement (mDNS cache refresh, several
+            # network interfaces), so only LAN availability needs an update
+            realid = msg.get("subdevid", mainid)
+            last_msg = (msg.get("seq"), msg.get("iv"), msg.get("data"), msg.get("host"))
+            if device.get("local") and self.local_msgs.get(realid) == last_msg:
+                device["local_ts"] = time.time() + LOCAL_TTL
+                self.schedule_local(device)
+                return
+
             try:
                 # decrypt payload for known device with devicekey
                 params = self.local.decrypt_msg(msg, device["devicekey"])
@@ -294,6 +393,8 @@ class XRegistry(XRegistryBase):
                 _LOGGER.debug("Can't decrypt message", exc_info=e)
                 return
 
+            self.local_msgs[realid] = last_msg
+
         elif "devicekey" in device:
             # unencripted device with devicekey in config, this means that the
             # DIY device is still connected to the ewelink account
@@ -321,6 +422,7 @@ class XRegistry(XRegistryBase):
 
         device["local_ts"] = time.time() + LOCAL_TTL
         device["local"] = True
+        self.schedule_local(device)
 
         self.dispatcher_send(realid, params)
 
@@ -328,26 +430,79 @@ class XRegistry(XRegistryBase):
         if realid != mainid:
             self.dispatcher_send(mainid, None)
 
+    def schedule(self, deviceid: str, kind: str, ts: float):
+        self.scheduled.add((deviceid, kind))
+        heapq.heappush(self.deadlines, (ts, deviceid, kind))
+        # wake up run_forever if this is the nearest deadline
+        if self.deadlines[0][0] == ts:
+            self.wakeup.set()
+
+    @staticmethod
+    def local_deadline(device: XDevice) -> float:
+        # devices often announce at the same time (after reboot, Wi-Fi
+        # reconnect), so each device has own fixed delay after local_ts
+        delay = zlib.crc32(device["deviceid"].encode()) % 1000 / 1000
+        return device["local_ts"] + delay * REFRESH_INTERVAL
+
+    def schedule_local(self, device: XDevice):
+        # local_ts is updated on each LAN message, deadline is checked lazily
+        # and moved to the new local_ts when it expires
+        did = device["deviceid"]
+        if (did, "local") not in self.scheduled:
+            self.schedule(did, "local", self.local_deadline(device))
+
+    def count_activity(self, kind: str):
+        self.activity[kind].append(time.time())
+
+    def activity_per_minute(self) -> dict[str, int]:
+        ts = time.time() - 60
+        for times in self.activity.values():
+            while times and times[0] < ts:
+                times.popleft()
+        return {kind: len(times) for kind, times in self.activity.items()}
+
     async def run_forever(self):
         """This daemon function doing two things:
 
         1. Force update POW devices. Some models support only cloud update, some support
            local queries
         2. Ping LAN devices if they are silent for more than 1 minute
+
+        Each device has own deadlines in a heap, so the work is done only for
+        devices with expired deadline and is spread over time.
         """
         while True:
-            for device in self.devices.values():
+            now = time.time()
+
+            while self.deadlines and self.deadlines[0][0] <= now:
+                _, did, kind = heapq.heappop(self.deadlines)
+                self.scheduled.discard((did, kind))
+
+                device = self.devices.get(did)
+                if not device:
+                    continue
+
                 try:
-                    self.update_device(device)
+                    if kind == "refresh":
+                        self.refresh_device(device)
+                        self.schedule(did, kind, now + REFRESH_INTERVAL)
+                    else:
+                        self.check_local(device, now)
                 except Exception as e:
                     _LOGGER.warning("run_forever", exc_info=e)
 
-            await asyncio.sleep(30)
+            self.wakeup.clear()
+            if self.deadlines:
+                timeout = self.deadlines[0][0] - now
+            else:
+                timeout = REFRESH_INTERVAL
 
-    def update_device(self, device: XDevice):
-        if "extra" not in device:
-            return
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
 
+    def refresh_device(self, device: XDevice):
         uiid = device["extra"]["uiid"]
 
         # [5] POW, [32] POWR2, [182] S40, [190] POWR3 - one channel, only cloud update
@@ -355,15 +510,18 @@ class XRegistry(XRegistryBase):
         if uiid in (5, 32, 182, 190, 181, 226):
             if self.can_cloud(device):
                 params = {"uiActive": 60}
+                self.count_activity("cloud_refresh")
                 asyncio.create_task(self.cloud.send(device, params, timeout=0))
 
         # DUALR3 - two channels, local and cloud update
         elif uiid == 126:
             if self.can_local(device):
                 # empty params is OK
+                self.count_activity("local_refresh")
                 asyncio.create_task(self.local.send(device, command="statistics"))
             elif self.can_cloud(device):
                 params = {"uiActive": {"all": 1, "time": 60}}
+                self.count_activity("cloud_refresh")
                 asyncio.create_task(self.cloud.send(device, params, timeout=0))
 
         # SPM-4Relay - four channels, separate update for each channel
@@ -373,14 +531,33 @@ class XRegistry(XRegistryBase):
                 outlet = device.get("active_outlet", 0)
                 device["active_outlet"] = outlet + 1 if outlet < 3 else 0
                 params = {"uiActive": {"outlet": outlet, "time": 60}}
+                self.count_activity("cloud_refresh")
                 asyncio.create_task(self.cloud.send(device, params, timeout=0))
 
-        # checks if device still available via LAN
-        if "local_ts" not in device or device["local_ts"] > time.time():
+    def check_local(self, device: XDevice, now: float):
+        """Checks if device still available via LAN."""
+        did = device["deviceid"]
+
+        deadline = self.local_deadline(device)
+        if deadline > now:
+            # got LAN message after the deadline was scheduled
+            self.schedule(did, "local", deadline)
             return
 
-        if self.local.online:
-            asyncio.create_task(self.check_offline(device))
+        if self.local.online and did not in self.probing:
+            asyncio.create_task(self.probe_local(device))
+
+        # device silent - check it again later, like for any other device
+        self.schedule(did, "local", now + REFRESH_INTERVAL)
+
+    async def probe_local(self, device: XDevice):
+        did = device["deviceid"]
+        self.probing.add(did)
+        try:
+            async with self.probes:
+                await self.check_offline(device)
+        finally:
+            self.probing.discard(did)
 
     def can_cloud(self, device: XDevice) -> bool:
         if not self.cloud.online:
@@ -26,12 +26,57 @@ class XDevice(TypedDict, total=False):
     devicekey: Optional[str]  # required for encrypted local devices (not DIY)
 
     local_ts: Optional[float]  # time of last local msg from device
-    params_bulk: Optional[dict]  # helper for send_bulk commands
     active_outlet: Optional[int]  # required for SPM-4Relay power updates
 
     parent: Optional[dict]
 
 
+def can_merge_params(params: dict, new: dict) -> bool:
+    """Check if new params can be merged into params with merge_params.
+
+    Params are merged if both update the state of same device. RF commands
+    can't be merged, because they are actions and not a state.
+    """
+    if params.get("subDevId") != new.get("subDevId"):
+        return False
+    if "cmd" in params or "cmd" in new:
+        return False
+
+    for k, v in new.items():
+        old = params.get(k)
+        if isinstance(old, list) and isinstance(v, list):
+            # switches, configure, pulses, etc.
+            if not all(isinstance(i, dict) and "outlet" in i for i in old + v):
+                return False
+        elif isinstance(old, dict) and isinstance(v, dict):
+            # nested light params (color, white, etc.)
+            if not can_merge_params(old, v):
+                return False
+    return True
+
+
+def merge_params(params: dict, new: dict):
+    """Merge new params into params, check can_merge_params before.
+
+    Lists with outlets are merged by outlet, nested dicts are merged by key,
+    other keys are replaced by the new value.
+    """
+    for k, v in new.items():
+        old = params.get(k)
+        if isinstance(old, list) and isinstance(v, list):
+            outlets = {i["outlet"]: i for i in old}
+            for item in v:
+                if item["outlet"] in outlets:
+                    outlets[item["outlet"]].update(item)
+                else:
+                    old.append(item)
+                    outlets[item["outlet"]] = item
+        elif isinstance(old, dict) and isinstance(v, dict):
+            merge_params(old, v)
+        else:
+            params[k] = v
+
+
 class XRegistryBase:
     dispatcher: dict[str, list[Callable]] = None
     _sequence: int = 0
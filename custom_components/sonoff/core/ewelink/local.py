@@ -6,10 +6,13 @@ devices and their devicekey.
 
 import asyncio
 import base64
+import copy
 import errno
 import ipaddress
 import json
 import logging
+import time
+from collections import deque
 
 import aiohttp
 from Crypto.Cipher import AES
@@ -19,7 +22,14 @@ from aiohttp.hdrs import CONTENT_TYPE
 from zeroconf import ServiceStateChange, Zeroconf
 from zeroconf.asyncio import AsyncServiceBrowser, AsyncServiceInfo
 
-from .base import SIGNAL_CONNECTED, SIGNAL_UPDATE, XDevice, XRegistryBase
+from .base import (
+    SIGNAL_CONNECTED,
+    SIGNAL_UPDATE,
+    XDevice,
+    XRegistryBase,
+    can_merge_params,
+    merge_params,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -40,16 +50,31 @@ def unpad(padded_data: bytes, block_size: int):
     return padded_data[:-padding_len]
 
 
-def encrypt(payload: dict, devicekey: str):
-    devicekey = devicekey.encode("utf-8")
+# MD5 of devicekey and AES cipher with expanded key schedule, per devicekey
+CIPHERS: dict[str, tuple[bytes, object]] = {}
+
+
+def get_cipher(devicekey: str) -> tuple[bytes, object]:
+    if cipher := CIPHERS.get(devicekey):
+        return cipher
 
     hash_ = MD5.new()
-    hash_.update(devicekey)
+    hash_.update(devicekey.encode("utf-8"))
     key = hash_.digest()
 
+    # ECB object holds expanded key and has no state between calls
+    cipher = CIPHERS[devicekey] = (key, AES.new(key, AES.MODE_ECB))
+    return cipher
+
+
+def encrypt(payload: dict, devicekey: str):
+    key, _ = get_cipher(devicekey)
+
     iv = get_random_bytes(16)
     plaintext = json.dumps(payload["data"]).encode("utf-8")
 
+    # CBC encrypt can't be done in one ECB pass like decrypt, and chaining
+    # blocks over the cached ECB is slower than a new cipher for 2+ blocks
     cipher = AES.new(key, AES.MODE_CBC, iv=iv)
     padded = pad(plaintext, AES.block_size)
     ciphertext = cipher.encrypt(padded)
@@ -62,21 +87,111 @@ def encrypt(payload: dict, devicekey: str):
 
 
 def decrypt(payload: dict, devicekey: str):
-    devicekey = devicekey.encode("utf-8")
+    _, ecb = get_cipher(devicekey)
 
-    hash_ = MD5.new()
-    hash_.update(devicekey)
-    key = hash_.digest()
-
-    cipher = AES.new(key, AES.MODE_CBC, iv=base64.b64decode(payload["iv"]))
+    iv = base64.b64decode(payload["iv"])
     ciphertext = base64.b64decode(payload["data"])
-    padded = cipher.decrypt(ciphertext)
+    if len(iv) != AES.block_size or len(ciphertext) % AES.block_size:
+        raise ValueError("Data must be padded to 16 byte boundary in CBC mode")
+
+    # CBC decrypt: each decrypted block XOR previous ciphertext block (or iv),
+    # blocks are independent, so decrypt all at once and XOR as one big int
+    size = len(ciphertext)
+    padded = (
+        int.from_bytes(ecb.decrypt(ciphertext), "big")
+        ^ int.from_bytes(iv + ciphertext[:-AES.block_size], "big")
+    ).to_bytes(size, "big")
     return unpad(padded, AES.block_size)
 
 
+class XLocalRequest:
+    def __init__(self, command: str, params: dict | None, sequence: str, timeout: int):
+        self.command = command
+        self.params = params
+        self.sequence = sequence
+        self.timeout = timeout
+        self.future = asyncio.get_running_loop().create_future()
+        self.ts = time.monotonic()
+        self.count = 1
+
+    def merge(self, command: str, params: dict | None, timeout: int) -> bool:
+        if command != self.command:
+            return False
+        if not params or not self.params:
+            # same query (getState, statistics) - share the response
+            if params or self.params:
+                return False
+        elif can_merge_params(self.params, params):
+            merge_params(self.params, params)
+        else:
+            return False
+        self.timeout = max(self.timeout, timeout)
+        self.count += 1
+        return True
+
+
+class XLocalChannel:
+    """Queue of LAN requests to one device.
+
+    Device web server is not multi-threaded and can process only one request
+    at a time. So requests are sent one by one and params of requests waiting
+    in the queue are merged into one POST. Connection is kept alive until the
+    device closes it, after that each request uses a new connection.
+    """
+
+    def __init__(self):
+        self.queue: list[XLocalRequest] = []
+        # request that is being posted, params can't be merged into it anymore
+        self.sending: XLocalRequest | None = None
+        self.task: asyncio.Task | None = None
+        self.keepalive = True
+        self.latency: deque[float] = deque(maxlen=100)
+        self.max_depth = 0
+        self.requests = 0
+        self.posts = 0
+
+    def put(
+        self, command: str, params: dict | None, sequence: str, timeout: int
+    ) -> asyncio.Future:
+        self.requests += 1
+
+        for request in self.queue:
+            if request.merge(command, params, timeout):
+                return request.future
+
+        # params will be merged with next requests, so don't touch caller dict
+        request = XLocalRequest(command, copy.deepcopy(params), sequence, timeout)
+        self.queue.append(request)
+        self.max_depth = max(self.max_depth, len(self.queue))
+        return request.future
+
+    def diagnostics(self) -> dict:
+        latency = sorted(self.latency)
+
+        def percentile(p: int) -> float | None:
+            if not latency:
+                return None
+            i = min(len(latency) - 1, len(latency) * p // 100)
+            return round(latency[i] * 1000)
+
+        return {
+            "queue": len(self.queue) + (self.sending is not None),
+            "max_queue": self.max_depth,
+            "requests": self.requests,
+            "posts": self.posts,
+            "keepalive": self.keepalive,
+            "latency_ms": {
+                "p50": percentile(50),
+                "p90": percentile(90),
+                "p99": percentile(99),
+            },
+        }
+
+
 class XRegistryLocal(XRegistryBase):
     browser: AsyncServiceBrowser = None
     online: bool = False
+    channels: dict[str, XLocalChannel] = None
 
     def start(self, zeroconf: Zeroconf):
         self.browser = AsyncServiceBrowser(
@@ -167,7 +282,6 @@ class XRegistryLocal(XRegistryBase):
         command: str = None,
         sequence: str = None,
         timeout: int = 5,
-        cre_retry_counter: int = 10,
     ):
         # known commands for DIY: switch, startup, pulse, sledonline
         # other commands: switch, switches, transmit, dimmable, light, fan
@@ -177,8 +291,59 @@ class XRegistryLocal(XRegistryBase):
                 return "noquery"
             command = next(iter(params))
 
+        if self.channels is None:
+            self.channels = {}
+        channel = self.channels.get(device["deviceid"])
+        if channel is None:
+            channel = self.channels[device["deviceid"]] = XLocalChannel()
+
+        future = channel.put(
+            command, params, sequence or await self.sequence(), timeout
+        )
+        if channel.task is None:
+            channel.task = asyncio.create_task(self._channel_loop(device, channel))
+
+        # merged request is shared with other callers, so don't cancel it
+        return await asyncio.shield(future)
+
+    async def _channel_loop(self, device: XDevice, channel: XLocalChannel):
+        try:
+            while channel.queue:
+                # new requests can't be merged to sent one anymore
+                channel.sending = request = channel.queue.pop(0)
+                try:
+                    ok = await self._post(device, channel, request)
+                except Exception as e:
+                    _LOGGER.error("Local send error", exc_info=e)
+                    ok = "E#???"
+                channel.sending = None
+                channel.posts += 1
+                channel.latency.append(time.monotonic() - request.ts)
+                if not request.future.done():
+                    request.future.set_result(ok)
+        finally:
+            channel.task = None
+            if channel.sending:
+                channel.queue.insert(0, channel.sending)
+                channel.sending = None
+            for request in channel.queue:
+                if not request.future.done():
+                    request.future.set_result("E#COS")
+            channel.queue.clear()
+
+    async def _post(
+        self,
+        device: XDevice,
+        channel: XLocalChannel,
+        request: XLocalRequest,
+        cre_retry_counter: int = 10,
+    ):
+        command = request.command
+        params = request.params
+        timeout = request.timeout
+
         payload = {
-            "sequence": sequence or await self.sequence(),
+            "sequence": request.sequence,
             "deviceid": device["deviceid"],
             "selfApikey": "123",
             "data": params or {},
@@ -198,14 +363,18 @@ class XRegistryLocal(XRegistryBase):
             r = await self.session.post(
                 f"http://{host}/zeroconf/{command}",
                 json=payload,
-                headers={"Connection": "close"},
+                headers=None if channel.keepalive else {"Connection": "close"},
                 timeout=timeout,
             )
 
+            if channel.keepalive and r.headers.get("Connection", "").lower() == "close":
+                channel.keepalive = False
+
             try:
                 # some devices don't support getState command
                 # https://github.com/AlexxIT/SonoffLAN/issues/1442
                 if command == "getState" and r.headers.get(CONTENT_TYPE) == "text/html":
+                    r.release()
                     return "online"
 
                 resp: dict = await r.json()
@@ -247,29 +416,37 @@ class XRegistryLocal(XRegistryBase):
                 _LOGGER.debug(log, exc_info=e)
                 return "E#COE"  # ClientOSError
 
+            if channel.keepalive:
+                # firmware closed the kept alive connection
+                _LOGGER.debug(f"{log} !! Keep-alive not supported")
+                channel.keepalive = False
+                return await self._post(device, channel, request, cre_retry_counter)
+
             # This happens because the device's web server is not multi-threaded
-            # and can only process one request at a time. Therefore, if the
-            # device is busy processing another request, it will close the
-            # connection for the new request and we will get this error.
-            #
-            # It appears that the device takes some time to process a new request
-            # after the previous one was closed, which caused a locking approach
-            # to not work across different devices. Simply retrying on this error
-            # a few times seems to fortunately work reliably, so we'll do that.
+            # and can only process one request at a time. Requests from this
+            # registry are sent one by one, but the device can be busy with
+            # another client (eWeLink app) or still finishing the previous
+            # request. Retrying on this error a few times works reliably.
 
             _LOGGER.debug(f"{log} !! ConnectionResetError")
             if cre_retry_counter > 0:
                 await asyncio.sleep(0.1)
-                return await self.send(
-                    device, params, command, sequence, timeout, cre_retry_counter - 1
+                return await self._post(
+                    device, channel, request, cre_retry_counter - 1
                 )
 
             return "E#CRE"  # ConnectionResetError
 
-        except (
-            aiohttp.ServerDisconnectedError,
-            asyncio.CancelledError,
-        ) as e:
+        except aiohttp.ServerDisconnectedError as e:
+            if channel.keepalive:
+                # firmware closed the kept alive connection
+                _LOGGER.debug(f"{log} !! Keep-alive not supported")
+                channel.keepalive = False
+                return await self._post(device, channel, request, cre_retry_counter)
+            _LOGGER.debug(log, exc_info=e)
+            return "E#COS"
+
+        except asyncio.CancelledError as e:
             _LOGGER.debug(log, exc_info=e)
             return "E#COS"
 
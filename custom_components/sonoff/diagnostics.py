@@ -49,6 +49,9 @@ async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigE
             )
             for did, device in registry.devices.items()
         }
+        for did, channel in (registry.local.channels or {}).items():
+            if did in devices:
+                devices[did]["lan"] = channel.diagnostics()
     except Exception as e:
         devices = repr(e)
 
@@ -59,6 +62,7 @@ async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigE
         "options": options,
         "errors": xutils.system_log_records(hass, DOMAIN),
         "devices": devices,
+        "activity_per_minute": registry.activity_per_minute(),
     }
 
 
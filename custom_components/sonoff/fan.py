@@ -97,7 +97,7 @@ class XFan(XEntity, FanEntity):
         # strip - iFan02 using old LAN API (same as cloud)
         if self.device.get("localtype") != "fan_light":
             params_lan = None
-        await self.ewelink.send(self.device, {"switches": param}, params_lan)
+        await self.ewelink.send_bulk(self.device, {"switches": param}, params_lan)
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         percentage = int(
@@ -1123,7 +1123,7 @@ class XFanLight(XOnOffLight):
             params_lan = {"light": "on"}
         else:
             params_lan = None
-        await self.ewelink.send(self.device, params, params_lan)
+        await self.ewelink.send_bulk(self.device, params, params_lan)
 
     async def async_turn_off(self):
         params = {"switches": [{"outlet": 0, "switch": "off"}]}
@@ -1131,7 +1131,7 @@ class XFanLight(XOnOffLight):
             params_lan = {"light": "off"}
         else:
             params_lan = None
-        await self.ewelink.send(self.device, params, params_lan)
+        await self.ewelink.send_bulk(self.device, params, params_lan)
 
 
 # noinspection PyAbstractClass, UIID25
@@ -48,6 +48,8 @@ from .const import (
     CONF_TARIFF,
     CONF_TARIFF_ENTITY,
     CONF_TARIFFS,
+    CONF_WRITE_MIN_CHANGE,
+    CONF_WRITE_MIN_INTERVAL,
     DATA_TARIFF_SENSORS,
     DATA_UTILITY,
     DOMAIN,
@@ -98,6 +100,8 @@ METER_CONFIG_SCHEMA = vol.Schema(
             ),
             vol.Optional(CONF_CRON_PATTERN): validate_cron_pattern,
             vol.Optional(CONF_SENSOR_ALWAYS_AVAILABLE, default=False): cv.boolean,
+            vol.Optional(CONF_WRITE_MIN_INTERVAL, default=0): cv.positive_float,
+            vol.Optional(CONF_WRITE_MIN_CHANGE, default=0): cv.positive_float,
         },
         period_or_cron,
     )
@@ -85,6 +85,7 @@ MULTI_METER_TYPES = [
 
 DATA_UTILITY = "utility_meter_next_gen_data"
 DATA_TARIFF_SENSORS = "utility_meter_next_gen_sensors"
+DATA_SOURCE_DISPATCHER = "utility_meter_next_gen_source_dispatcher"
 
 COLLECTING = "collecting"
 PRECISION = 5
@@ -119,6 +120,8 @@ CONF_SOURCE_SENSOR = "source"
 CONF_TARIFFS = "tariffs"
 CONF_TARIFF = "tariff"
 CONF_TARIFF_ENTITY = "tariff_entity"
+CONF_WRITE_MIN_CHANGE = "write_min_change"
+CONF_WRITE_MIN_INTERVAL = "write_min_interval"
 
 CONFIG_TYPES = [
     CONF_CONFIG_CRON,
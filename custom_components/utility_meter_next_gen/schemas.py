@@ -29,6 +29,8 @@ from .const import (
     CONF_SOURCE_CALC_SENSOR,
     CONF_SOURCE_SENSOR,
     CONF_TARIFFS,
+    CONF_WRITE_MIN_CHANGE,
+    CONF_WRITE_MIN_INTERVAL,
     CONFIG_TYPES,
     DEVICE_CLASSES_METER,
     METER_TYPES,
@@ -123,6 +125,26 @@ BASE_COMMON_CONFIG_SCHEMA = {
             CONF_SENSOR_ALWAYS_AVAILABLE,
             default=True,
         ): selector.BooleanSelector(),
+        vol.Optional(
+            CONF_WRITE_MIN_INTERVAL,
+            default=0,
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0,
+                mode=selector.NumberSelectorMode.BOX,
+                unit_of_measurement="s",
+            ),
+        ),
+        vol.Optional(
+            CONF_WRITE_MIN_CHANGE,
+            default=0,
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0,
+                mode=selector.NumberSelectorMode.BOX,
+                step="any",
+            ),
+        ),
 }
 def create_calc_extras_schema(data):
     """Create the calibration schema for predefined and cron cycles."""
@@ -249,6 +271,26 @@ def create_common_multi_config_schema_step_2c():
             CONF_SENSOR_ALWAYS_AVAILABLE,
             default=True,
         ): selector.BooleanSelector(),
+        vol.Optional(
+            CONF_WRITE_MIN_INTERVAL,
+            default=0,
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0,
+                mode=selector.NumberSelectorMode.BOX,
+                unit_of_measurement="s",
+            ),
+        ),
+        vol.Optional(
+            CONF_WRITE_MIN_CHANGE,
+            default=0,
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0,
+                mode=selector.NumberSelectorMode.BOX,
+                step="any",
+            ),
+        ),
 }
 
 def create_predefined_config_schema(data):
@@ -379,6 +421,26 @@ def create_common_option_schema(data):
             CONF_SENSOR_ALWAYS_AVAILABLE,
             default=data[CONF_SENSOR_ALWAYS_AVAILABLE],
         ): selector.BooleanSelector(),
+        vol.Optional(
+            CONF_WRITE_MIN_INTERVAL,
+            default=data.get(CONF_WRITE_MIN_INTERVAL, 0),
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0,
+                mode=selector.NumberSelectorMode.BOX,
+                unit_of_measurement="s",
+            ),
+        ),
+        vol.Optional(
+            CONF_WRITE_MIN_CHANGE,
+            default=data.get(CONF_WRITE_MIN_CHANGE, 0),
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0,
+                mode=selector.NumberSelectorMode.BOX,
+                step="any",
+            ),
+        ),
     }
     return option_schema
 
@@ -671,6 +733,26 @@ def create_multi_option_schema_step_2(data):
             CONF_SENSOR_ALWAYS_AVAILABLE,
             default=data[CONF_SENSOR_ALWAYS_AVAILABLE],
         ): selector.BooleanSelector(),
+        vol.Optional(
+            CONF_WRITE_MIN_INTERVAL,
+            default=data.get(CONF_WRITE_MIN_INTERVAL, 0),
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0,
+                mode=selector.NumberSelectorMode.BOX,
+                unit_of_measurement="s",
+            ),
+        ),
+        vol.Optional(
+            CONF_WRITE_MIN_CHANGE,
+            default=data.get(CONF_WRITE_MIN_CHANGE, 0),
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0,
+                mode=selector.NumberSelectorMode.BOX,
+                step="any",
+            ),
+        ),
     }
     return vol.Schema(
         {**create_multi_option_schema_step_1(data).schema,
@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
-from collections.abc import Mapping
-from dataclasses import dataclass
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal, DecimalException, InvalidOperation
 import logging
 import re
+import time
 from typing import Any, Self
 
 from cronsim import CronSim
@@ -34,6 +35,7 @@ from homeassistant.const import (
     STATE_UNKNOWN,
 )
 from homeassistant.core import (
+    CALLBACK_TYPE,
     Event,
     EventStateChangedData,
     HomeAssistant,
@@ -45,6 +47,7 @@ from homeassistant.helpers.device import async_device_info_to_link_from_entity
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.event import (
+    async_call_later,
     async_track_point_in_time,
     async_track_state_change_event,
     async_track_state_report_event,
@@ -87,6 +90,9 @@ from .const import (
     CONF_TARIFF,
     CONF_TARIFF_ENTITY,
     CONF_TARIFFS,
+    CONF_WRITE_MIN_CHANGE,
+    CONF_WRITE_MIN_INTERVAL,
+    DATA_SOURCE_DISPATCHER,
     DATA_TARIFF_SENSORS,
     DATA_UTILITY,
     METER_NAME_TYPES,
@@ -166,6 +172,11 @@ async def async_setup_entry(
     )
     source_calc_multiplier = config_entry.options[CONF_SOURCE_CALC_MULTIPLIER]
     tariff_entity = hass.data[DATA_UTILITY][entry_id][CONF_TARIFF_ENTITY]
+    source_dispatcher = async_get_source_dispatcher(
+        hass, entry_id, source_entity_id, source_calc_entity_id
+    )
+    write_min_change = config_entry.options.get(CONF_WRITE_MIN_CHANGE, 0)
+    write_min_interval = config_entry.options.get(CONF_WRITE_MIN_INTERVAL, 0)
 
     meters = []
     calc_sensors = []
@@ -194,6 +205,9 @@ async def async_setup_entry(
                     parent_meter=entry_id,
                     periodically_resetting=periodically_resetting,
                     sensor_always_available=sensor_always_available,
+                    write_min_change=write_min_change,
+                    write_min_interval=write_min_interval,
+                    source_dispatcher=source_dispatcher,
                     source_calc_entity=source_calc_entity_id,
                     source_calc_multiplier=source_calc_multiplier,
                     source_entity=source_entity_id,
@@ -259,6 +273,9 @@ async def async_setup_entry(
                         parent_meter=entry_id,
                         periodically_resetting=periodically_resetting,
                         sensor_always_available=sensor_always_available,
+                        write_min_change=write_min_change,
+                        write_min_interval=write_min_interval,
+                        source_dispatcher=source_dispatcher,
                         source_calc_entity=source_calc_entity_id,
                         source_calc_multiplier=source_calc_multiplier,
                         source_entity=source_entity_id,
@@ -317,6 +334,9 @@ async def async_setup_entry(
                 parent_meter=entry_id,
                 periodically_resetting=periodically_resetting,
                 sensor_always_available=sensor_always_available,
+                write_min_change=write_min_change,
+                write_min_interval=write_min_interval,
+                source_dispatcher=source_dispatcher,
                 source_calc_entity=source_calc_entity_id,
                 source_calc_multiplier=source_calc_multiplier,
                 source_entity=source_entity_id,
@@ -368,6 +388,9 @@ async def async_setup_entry(
                     parent_meter=entry_id,
                     periodically_resetting=periodically_resetting,
                     sensor_always_available=sensor_always_available,
+                    write_min_change=write_min_change,
+                    write_min_interval=write_min_interval,
+                    source_dispatcher=source_dispatcher,
                     source_calc_entity=source_calc_entity_id,
                     source_calc_multiplier=source_calc_multiplier,
                     source_entity=source_entity_id,
@@ -474,6 +497,15 @@ async def async_setup_platform(
         conf_sensor_always_available = hass.data[DATA_UTILITY][meter][
             CONF_SENSOR_ALWAYS_AVAILABLE
         ]
+        conf_write_min_change = hass.data[DATA_UTILITY][meter].get(
+            CONF_WRITE_MIN_CHANGE, 0
+        )
+        conf_write_min_interval = hass.data[DATA_UTILITY][meter].get(
+            CONF_WRITE_MIN_INTERVAL, 0
+        )
+        conf_source_dispatcher = async_get_source_dispatcher(
+            hass, meter, conf_meter_source, conf_meter_calc_source
+        )
         meter_sensor = UtilityMeterSensor(
             cron_pattern=conf_cron_pattern,
             delta_values=conf_meter_delta_values,
@@ -493,6 +525,9 @@ async def async_setup_platform(
             unique_id=conf_sensor_unique_id,
             suggested_entity_id=suggested_entity_id,
             sensor_always_available=conf_sensor_always_available,
+            write_min_change=conf_write_min_change,
+            write_min_interval=conf_write_min_interval,
+            source_dispatcher=conf_source_dispatcher,
         )
         meters.append(meter_sensor)
 
@@ -585,6 +620,162 @@ class UtilitySensorExtraStoredData(SensorExtraStoredData):
         )
 
 
+@dataclass(slots=True)
+class SourceReading:
+    """A source state change, parsed once for all the sensors of a meter."""
+
+    new_state: State | None
+    old_state: State | None
+    value: Decimal | None
+    old_value: Decimal | None
+    delta: Decimal | None
+    calc_state: State | None = None
+    calc_value: Decimal | None = None
+    _calculated: dict[tuple[Decimal, Decimal], Decimal] = field(default_factory=dict)
+
+    def calculated(self, adjustment: Decimal, multiplier: Decimal) -> Decimal:
+        """Return the calculated value of an adjustment, computed once per reading."""
+        key = (adjustment, multiplier)
+        if (result := self._calculated.get(key)) is None:
+            result = self._calculated[key] = round(
+                self.calc_value * adjustment * multiplier,  # type: ignore[operator]
+                PRECISION,
+            )
+        return result
+
+
+class SourceDispatcher:
+    """Fan out the source readings of a parent meter to its collecting sensors.
+
+    The source is tracked once per parent meter and each reading is parsed
+    once, paused tariff sensors are not subscribed and do no work at all.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        meter: str,
+        source_entity: str,
+        source_calc_entity: str | None,
+    ) -> None:
+        """Initialize the dispatcher."""
+        self._hass = hass
+        self._meter = meter
+        self._source_entity = source_entity
+        self._source_calc_entity = source_calc_entity
+        self._calc_state: State | None = None
+        self._calc_value: Decimal | None = None
+        self._listeners: list[Callable[[SourceReading], None]] = []
+        self._unsub_source: CALLBACK_TYPE | None = None
+        self._last_state: State | None = None
+        self._last_value: Decimal | None = None
+
+    @staticmethod
+    def _validate_state(state: State | None) -> Decimal | None:
+        """Parse the state as a Decimal if available. Throws DecimalException if not a number."""
+        try:
+            return (
+                None
+                if state is None or state.state in [STATE_UNAVAILABLE, STATE_UNKNOWN]
+                else Decimal(state.state)
+            )
+        except DecimalException:
+            return None
+
+    @callback
+    def async_add_listener(
+        self, listener: Callable[[SourceReading], None]
+    ) -> CALLBACK_TYPE:
+        """Send the source readings to listener until the returned callback is called."""
+        self._listeners.append(listener)
+        if self._unsub_source is None:
+            self._unsub_source = async_track_state_change_event(
+                self._hass, [self._source_entity], self._async_source_changed
+            )
+
+        @callback
+        def remove_listener() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+            if not self._listeners and self._unsub_source is not None:
+                self._unsub_source()
+                self._unsub_source = None
+                self._last_state = None
+                self._last_value = None
+
+        return remove_listener
+
+    @callback
+    def _async_source_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Parse the new source state and dispatch it."""
+        new_state = event.data["new_state"]
+        old_state = event.data["old_state"]
+        value = self._validate_state(new_state)
+        if value is None and new_state is not None and new_state.state != STATE_UNAVAILABLE:
+            # First check if the new_state is valid (see discussion in PR #88446)
+            _LOGGER.warning(
+                "%s received an invalid new state from %s : %s",
+                self._meter,
+                self._source_entity,
+                new_state.state,
+            )
+            self._last_state = new_state
+            self._last_value = None
+            return
+
+        # The old state is usually the previous reading, which was parsed already
+        old_value = (
+            self._last_value
+            if old_state is not None and old_state is self._last_state
+            else self._validate_state(old_state)
+        )
+        self._last_state = new_state
+        self._last_value = value
+
+        reading = SourceReading(
+            new_state,
+            old_state,
+            value,
+            old_value,
+            None if value is None or old_value is None else value - old_value,
+        )
+        if self._source_calc_entity is not None:
+            self._update_calc_source(reading)
+        # A listener may unsubscribe (e.g. a tariff change) while dispatching
+        for listener in list(self._listeners):
+            listener(reading)
+
+    def _update_calc_source(self, reading: SourceReading) -> None:
+        """Add the calc source state to the reading, parsed only when it changed."""
+        calc_state = self._hass.states.get(self._source_calc_entity)  # type: ignore[arg-type]
+        if calc_state is not self._calc_state:
+            self._calc_state = calc_state
+            try:
+                self._calc_value = (
+                    None if calc_state is None else Decimal(calc_state.state)
+                )
+            except (DecimalException, InvalidOperation):
+                self._calc_value = None
+        reading.calc_state = calc_state
+        reading.calc_value = self._calc_value
+
+
+@callback
+def async_get_source_dispatcher(
+    hass: HomeAssistant,
+    meter: str,
+    source_entity: str,
+    source_calc_entity: str | None,
+) -> SourceDispatcher:
+    """Return the source dispatcher shared by the sensors of a parent meter."""
+    meter_data = hass.data[DATA_UTILITY][meter]
+    if (dispatcher := meter_data.get(DATA_SOURCE_DISPATCHER)) is None:
+        dispatcher = meter_data[DATA_SOURCE_DISPATCHER] = SourceDispatcher(
+            hass, meter, source_entity, source_calc_entity
+        )
+    return dispatcher
+
+
 class UtilityMeterSensor(RestoreSensor):
     """Representation of an utility meter sensor."""
 
@@ -625,6 +816,9 @@ class UtilityMeterSensor(RestoreSensor):
         sensor_always_available,
         suggested_entity_id=None,
         device_info=None,
+        write_min_change=0,
+        write_min_interval=0,
+        source_dispatcher: SourceDispatcher,
     ):
         """Initialize the Utility Meter sensor."""
         self._attr_unique_id = unique_id
@@ -632,6 +826,7 @@ class UtilityMeterSensor(RestoreSensor):
         self.entity_id = suggested_entity_id
         self._parent_meter = parent_meter
         self._sensor_source_id = source_entity
+        self._source_dispatcher = source_dispatcher
         self._sensor_calc_source_id = source_calc_entity
         self._last_period = Decimal(0)
         self._last_reset = dt_util.utcnow()
@@ -643,6 +838,7 @@ class UtilityMeterSensor(RestoreSensor):
         self._attr_calculated_current_value = Decimal(0)
         self._attr_calculated_last_value = Decimal(0)
         self._attr_multiplier = source_calc_multiplier or Decimal(1)
+        self._multiplier = Decimal(self._attr_multiplier)
         self._period = meter_type
         if meter_type is not None:
             # We convert the period and offset into a cron pattern
@@ -661,6 +857,13 @@ class UtilityMeterSensor(RestoreSensor):
         self._sensor_periodically_resetting = periodically_resetting
         self._calibrate_value = Decimal(calibrate_value) or Decimal(0)
         self._calibrate_calc_value = calibrate_calc_value or Decimal(0)
+        # Write policy, readings that do not pass it are held back until the
+        # next write. Tariff switches, resets and calibrations always write.
+        self._write_min_change = Decimal(str(write_min_change or 0))
+        self._write_min_interval = write_min_interval or 0
+        self._write_pending = None
+        self._written_value: Decimal | None = None
+        self._last_write = 0.0
         self._tariff = tariff
         self._tariff_entity = tariff_entity
         self._next_reset = None
@@ -687,29 +890,11 @@ class UtilityMeterSensor(RestoreSensor):
         self._attr_calculated_current_value = Decimal(
             self._calibrate_calc_value
         )
-        self.async_write_ha_state()
-
-    @staticmethod
-    def _validate_state(state: State | None) -> Decimal | None:
-        """Parse the state as a Decimal if available. Throws DecimalException if not a number."""
-        try:
-            return (
-                None
-                if state is None or state.state in [STATE_UNAVAILABLE, STATE_UNKNOWN]
-                else Decimal(state.state)
-            )
-        except DecimalException:
-            return None
-
-    def calculate_adjustment(
-        self, old_state: State | None, new_state: State
-    ) -> Decimal | None:
-        """Calculate the adjustment based on the old and new state."""
+        self._async_write_now()
 
-        # First check if the new_state is valid (see discussion in PR #88446)
-        if (new_state_val := self._validate_state(new_state)) is None:
-            _LOGGER.warning("Invalid state %s", new_state.state)
-            return None
+    def calculate_adjustment(self, reading: SourceReading) -> Decimal | None:
+        """Calculate the adjustment based on the old and new source values."""
+        new_state_val: Decimal = reading.value  # type: ignore[assignment]
 
         if self._sensor_delta_values:
             return new_state_val
@@ -718,47 +903,36 @@ class UtilityMeterSensor(RestoreSensor):
             not self._sensor_periodically_resetting
             and self._last_valid_state is not None
         ):  # Fallback to old_state if sensor is periodically resetting but last_valid_state is None
+            if self._last_valid_state is reading.old_value:
+                # Collected the previous reading too, same as the shared delta
+                return reading.delta
             return new_state_val - self._last_valid_state
 
-        if (old_state_val := self._validate_state(old_state)) is not None:
-            return new_state_val - old_state_val
+        if reading.delta is not None:
+            return reading.delta
 
         _LOGGER.debug(
             "%s received an invalid state change coming from %s (%s > %s)",
             self.name,
             self._sensor_source_id,
-            old_state.state if old_state else None,
+            reading.old_state.state if reading.old_state else None,
             new_state_val,
         )
         return None
 
     @callback
-    def async_reading(self, event: Event[EventStateChangedData]) -> None:
-        """Handle the sensor state changes."""
-        if (
-            source_state := self.hass.states.get(self._sensor_source_id)
-        ) is None or source_state.state == STATE_UNAVAILABLE:
+    def async_reading(self, reading: SourceReading) -> None:
+        """Handle a source reading, already validated by the source dispatcher."""
+        new_state = reading.new_state
+        if (new_state_val := reading.value) is None or new_state is None:
+            # The source is unavailable or was removed
             if not self._sensor_always_available:
                 self._attr_available = False
-                self.async_write_ha_state()
+                self._async_write_now()
             return
 
-        old_state = event.data["old_state"]
-        new_state = event.data["new_state"]
-        if new_state is None:
-            return
         new_state_attributes: Mapping[str, Any] = new_state.attributes or {}
 
-        # First check if the new_state is valid (see discussion in PR #88446)
-        if (new_state_val := self._validate_state(new_state)) is None:
-            _LOGGER.warning(
-                "%s received an invalid new state from %s : %s",
-                self.name,
-                self._sensor_source_id,
-                new_state.state,
-            )
-            return
-
         if self.native_value is None:
             _LOGGER.debug("selfHassDATA: %s",self.hass.data[DATA_UTILITY][self._parent_meter][
                 DATA_TARIFF_SENSORS
@@ -776,43 +950,86 @@ class UtilityMeterSensor(RestoreSensor):
                     )
 
         if (
-            adjustment := self.calculate_adjustment(old_state, new_state)
+            adjustment := self.calculate_adjustment(reading)
         ) is not None and (self._sensor_net_consumption or adjustment >= 0):
             # If net_consumption is off, the adjustment must be non-negative
             _LOGGER.debug("%s: Adjustment Check:  %s : %s", self.name, adjustment, self._tariff)
-            self._attr_native_value += Decimal(adjustment)  # type: ignore[operator]
+            self._attr_native_value += adjustment  # type: ignore[operator]
 
-            if (
-                self._sensor_calc_source_id is not None
-                and (
-                    source_calc_state := self.hass.states.get(
-                        self._sensor_calc_source_id
-                    )
-                )
-                and source_calc_state.state not in [STATE_UNAVAILABLE, STATE_UNKNOWN]
-            ):
-                try:
-                    self._attr_calculated_current_value += round(
-                        (
-                            Decimal(source_calc_state.state)
-                            * Decimal(adjustment)
-                            * Decimal(self._attr_multiplier)
-                        ),
-                        PRECISION,
-                    )
-                except (DecimalException, InvalidOperation) as err:
-                    _LOGGER.error(
-                        "Error while parsing value %s from sensor %s: %s",
-                        source_calc_state.state,
-                        self._sensor_calc_source_id,
-                        err,
-                    )
-                    self._attr_calculated_current_value = Decimal(0)
+            if self._sensor_calc_source_id is not None:
+                self._add_calculated(reading, adjustment)
         self._input_device_class = new_state_attributes.get(ATTR_DEVICE_CLASS)
         self._attr_native_unit_of_measurement = new_state_attributes.get(
             ATTR_UNIT_OF_MEASUREMENT
         )
         self._last_valid_state = new_state_val
+        self._async_write_reading()
+
+    def _add_calculated(self, reading: SourceReading, adjustment: Decimal) -> None:
+        """Add the calculated value of an adjustment, using the calc source state."""
+        if (
+            source_calc_state := reading.calc_state
+        ) is None or source_calc_state.state in [STATE_UNAVAILABLE, STATE_UNKNOWN]:
+            return
+
+        if reading.calc_value is None:
+            _LOGGER.error(
+                "Error while parsing value %s from sensor %s",
+                source_calc_state.state,
+                self._sensor_calc_source_id,
+            )
+            self._attr_calculated_current_value = Decimal(0)
+            return
+
+        self._attr_calculated_current_value += reading.calculated(
+            adjustment, self._multiplier
+        )
+
+    @callback
+    def _async_write_reading(self) -> None:
+        """Write the state after a reading, if the write policy allows it."""
+        if self._write_pending is not None:
+            # The pending write will publish the latest totals
+            return
+
+        if (
+            self._write_min_change
+            and self._written_value is not None
+            and abs(self._attr_native_value - self._written_value)  # type: ignore[operator]
+            < self._write_min_change
+        ):
+            return
+
+        if (
+            self._write_min_interval
+            and (
+                delay := self._last_write
+                + self._write_min_interval
+                - time.monotonic()
+            )
+            > 0
+        ):
+            self._write_pending = async_call_later(
+                self.hass, delay, self._async_write_pending
+            )
+            return
+
+        self._async_write_now()
+
+    @callback
+    def _async_write_pending(self, _now: datetime) -> None:
+        """Write the reading held back by the minimum interval."""
+        self._write_pending = None
+        self._async_write_now()
+
+    @callback
+    def _async_write_now(self) -> None:
+        """Write the state, including any reading held back by the write policy."""
+        if self._write_pending is not None:
+            self._write_pending()
+            self._write_pending = None
+        self._last_write = time.monotonic()
+        self._written_value = self._attr_native_value
         self.async_write_ha_state()
 
     @callback
@@ -824,14 +1041,15 @@ class UtilityMeterSensor(RestoreSensor):
         self._change_status(new_state.state)
 
     def _change_status(self, tariff: str) -> None:
+        # Drop any previous subscription first, a tariff entity update that
+        # keeps the same tariff must not subscribe this sensor twice
+        if self._collecting:
+            self._collecting()
+        self._collecting = None
         if self._tariff == tariff:
-            self._collecting = async_track_state_change_event(
-                self.hass, [self._sensor_source_id], self.async_reading
+            self._collecting = self._source_dispatcher.async_add_listener(
+                self.async_reading
             )
-        else:
-            if self._collecting:
-                self._collecting()
-            self._collecting = None
 
         # Reset the last_valid_state during state change because if
         # the last state before the tariff change was invalid,
@@ -847,7 +1065,7 @@ class UtilityMeterSensor(RestoreSensor):
             self._sensor_source_id,
         )
 
-        self.async_write_ha_state()
+        self._async_write_now()
 
     async def _program_reset(self):
         """Program the reset of the utility meter."""
@@ -862,7 +1080,7 @@ class UtilityMeterSensor(RestoreSensor):
                     self._next_reset,
                 )
             )
-            self.async_write_ha_state()
+            self._async_write_now()
 
     async def _async_reset_meter(self, event):
         """Reset the utility meter status."""
@@ -893,13 +1111,13 @@ class UtilityMeterSensor(RestoreSensor):
             self._attr_calculated_last_value = self._attr_calculated_current_value
         self._attr_calculated_current_value = Decimal(self._calibrate_calc_value)
         self._attr_native_value = Decimal(self._calibrate_value)
-        self.async_write_ha_state()
+        self._async_write_now()
 
     async def async_calibrate(self, value):
         """Calibrate the Utility Meter with a given value."""
         _LOGGER.debug("Calibrate %s = %s type(%s)", self.name, value, type(value))
         self._attr_native_value = Decimal(str(value))
-        self.async_write_ha_state()
+        self._async_write_now()
 
     async def async_added_to_hass(self) -> None:
         """Handle entity which will be added."""
@@ -974,8 +1192,8 @@ class UtilityMeterSensor(RestoreSensor):
                 self.native_unit_of_measurement,
                 self._sensor_source_id,
             )
-            self._collecting = async_track_state_change_event(
-                self.hass, [self._sensor_source_id], self.async_reading
+            self._collecting = self._source_dispatcher.async_add_listener(
+                self.async_reading
             )
 
         self.async_on_remove(async_at_started(self.hass, async_source_tracking))
@@ -998,6 +1216,9 @@ class UtilityMeterSensor(RestoreSensor):
         if self._collecting:
             self._collecting()
         self._collecting = None
+        if self._write_pending is not None:
+            self._write_pending()
+            self._write_pending = None
 
     @property
     def device_class(self):
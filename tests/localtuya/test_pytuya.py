@@ -0,0 +1,147 @@
+import asyncio
+import time
+
+from custom_components.localtuya.pytuya import (
+    CONTROL,
+    HEART_BEAT,
+    EmptyListener,
+    MessageDispatcher,
+    TuyaMessage,
+    TuyaProtocol,
+    pack_message,
+    session_keys,
+)
+
+LOCAL_KEY = "0123456789abcdef"
+SESSION_KEY = b"fedcba9876543210"
+
+
+def frame(seqno: int, cmd: int, payload: bytes = b"") -> bytes:
+    # device responses start with a 4 bytes return code
+    msg = TuyaMessage(seqno, cmd, 0, b"\x00\x00\x00\x00" + payload, 0, True)
+    return pack_message(msg)
+
+
+def test_heartbeats_interleaved_with_set_dps_burst():
+    async def run():
+        status = []
+        dispatcher = MessageDispatcher(
+            "dev", status.append, 3.3, LOCAL_KEY.encode(), False
+        )
+
+        heartbeats = [
+            asyncio.create_task(
+                dispatcher.wait_for(MessageDispatcher.HEARTBEAT_SEQNO, HEART_BEAT)
+            )
+            for _ in range(2)
+        ]
+        controls = {
+            seqno: asyncio.create_task(dispatcher.wait_for(seqno, CONTROL))
+            for seqno in range(10, 15)
+        }
+        await asyncio.sleep(0)
+        assert dispatcher.pending == 7
+
+        # heartbeat responses come with seqno 0 between the control responses
+        data = b"".join(
+            [
+                frame(12, CONTROL, b"12"),
+                frame(0, HEART_BEAT),
+                frame(10, CONTROL, b"10"),
+                frame(14, CONTROL, b"14"),
+                frame(0, HEART_BEAT),
+                frame(11, CONTROL, b"11"),
+                frame(13, CONTROL, b"13"),
+            ]
+        )
+        # and are split across TCP reads at random places
+        for i in range(0, len(data), 7):
+            dispatcher.add_data(data[i : i + 7])
+
+        for seqno, task in controls.items():
+            msg = await task
+            assert msg.seqno == seqno
+            assert msg.payload.endswith(str(seqno).encode())
+        for task in heartbeats:
+            assert (await task).cmd == HEART_BEAT
+
+        assert dispatcher.pending == 0
+        assert dispatcher.buffer == b""
+        assert status == []
+
+    asyncio.run(run())
+
+
+def test_concurrent_exchanges_negotiate_session_key_once():
+    async def run():
+        listener = EmptyListener()
+        protocol = TuyaProtocol("dev", LOCAL_KEY, 3.4, False, None, listener)
+        negotiations = []
+
+        async def negotiate_session_key():
+            negotiations.append(protocol.local_key)
+            await asyncio.sleep(0.01)
+            protocol.local_key = protocol.dispatcher.local_key = SESSION_KEY
+            return True
+
+        async def exchange(command, dps=None, resumed=False):
+            return protocol.local_key
+
+        protocol._negotiate_session_key = negotiate_session_key
+        protocol._exchange = exchange
+
+        keys = await asyncio.gather(
+            protocol.exchange(HEART_BEAT),
+            protocol.exchange(CONTROL, {"1": True}),
+            protocol.exchange(CONTROL, {"2": False}),
+        )
+
+        assert negotiations == [LOCAL_KEY.encode()]
+        assert keys == [SESSION_KEY] * 3
+
+    asyncio.run(run())
+
+
+class FakeTransport:
+    def __init__(self):
+        self.written = []
+        self.closing = False
+
+    def write(self, data):
+        self.written.append(data)
+
+    def is_closing(self):
+        return self.closing
+
+
+def test_aborted_resumed_exchange_does_not_renegotiate():
+    async def run():
+        listener = EmptyListener()
+        protocol = TuyaProtocol(
+            "dev", LOCAL_KEY, 3.4, False, None, listener, session_resume=True
+        )
+        protocol.transport = transport = FakeTransport()
+        session_keys["dev"] = (LOCAL_KEY.encode(), SESSION_KEY, time.monotonic())
+        negotiations = []
+
+        async def negotiate_session_key():
+            negotiations.append(protocol.local_key)
+            return False
+
+        protocol._negotiate_session_key = negotiate_session_key
+
+        task = asyncio.create_task(protocol.exchange(HEART_BEAT))
+        await asyncio.sleep(0.01)
+        assert protocol.session_resumed
+        assert len(transport.written) == 1
+
+        # connection drops while waiting for the answer to the resumed key
+        transport.closing = True
+        protocol.connection_lost(None)
+
+        assert await asyncio.wait_for(task, 1) is None
+        assert negotiations == []
+        assert len(transport.written) == 1
+        assert "dev" not in session_keys
+
+    asyncio.run(run())
@@ -0,0 +1,65 @@
+import asyncio
+
+from custom_components.sonoff.core.ewelink.local import XRegistryLocal
+
+
+class FakeResponse:
+    headers = {}
+
+    async def json(self):
+        return {"error": 0}
+
+
+class FakeSession:
+    """Device that answers only after the test releases the current POST."""
+
+    def __init__(self):
+        self.posts = []
+        self.release = asyncio.Event()
+
+    async def post(self, url, json, headers=None, timeout=None):
+        self.posts.append(json["data"])
+        await self.release.wait()
+        self.release.clear()
+        return FakeResponse()
+
+
+def switch(outlet: int, state: str) -> dict:
+    return {"switches": [{"outlet": outlet, "switch": state}]}
+
+
+def test_command_during_post_is_sent_separately():
+    async def run():
+        session = FakeSession()
+        registry = XRegistryLocal(session)
+        device = {"deviceid": "1000000001", "host": "127.0.0.1"}
+
+        first = asyncio.create_task(registry.send(device, switch(0, "on")))
+        await asyncio.sleep(0.01)
+        assert session.posts == [switch(0, "on")]
+
+        # first POST is in flight, these must not be merged into it
+        second = asyncio.create_task(registry.send(device, switch(1, "on")))
+        third = asyncio.create_task(registry.send(device, switch(2, "off")))
+        await asyncio.sleep(0.01)
+
+        session.release.set()
+        assert await first == "online"
+        await asyncio.sleep(0.01)
+
+        # waiting commands are merged into the next POST
+        session.release.set()
+        assert await second == "online"
+        assert await third == "online"
+
+        assert session.posts == [
+            switch(0, "on"),
+            {
+                "switches": [
+                    {"outlet": 1, "switch": "on"},
+                    {"outlet": 2, "switch": "off"},
+                ]
+            },
+        ]
+
+    asyncio.run(run())